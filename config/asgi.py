@@ -11,6 +11,14 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from config.warmup import warm_worker
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Async requests don't stay on one thread, so persistent per-thread MySQL
+# connections aren't reused; pool them instead (see config.dbpool).
+os.environ.setdefault("DATABASE_POOL_SIZE", "4")
+# Served e.g. with `uvicorn config.asgi:application --workers 2`. The sync
+# read views are used unless ASYNC_VIEWS is set (see config/settings.py).
 
 application = get_asgi_application()
+warm_worker()
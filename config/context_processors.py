@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def assets(request):
+    """Whether templates/assets.html links the self-hosted build or the CDNs."""
+    return {'self_hosted_assets': settings.SELF_HOSTED_ASSETS}
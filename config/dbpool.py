@@ -0,0 +1,108 @@
+"""
+A small thread-safe pool of DB-API connections, shared by every thread of a
+worker process. It works the same under WSGI and ASGI: Django takes a
+connection from it when a request first needs the database and gives it back
+when the request finishes. config.mysql_pool plugs it into the MySQL backend.
+"""
+import os
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """No connection came free within the pool's timeout."""
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:  # Already broken; nothing more to release
+        pass
+
+
+class ConnectionPool:
+    """
+    At most ``max_size`` connections made by ``connect()``, handed out most
+    recently used first. ``getconn()`` waits up to ``timeout`` seconds for one
+    to come free. Connections idle for over ``max_idle`` seconds are closed
+    rather than reused, ahead of the server's wait_timeout. With ``check``,
+    each idle connection is passed to it (a ping, say) before being handed
+    out, and dropped if it raises.
+    """
+
+    def __init__(self, connect, max_size=4, timeout=10.0, max_idle=240.0, check=None):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check = check
+        self.stats = {'connects': 0, 'reuses': 0, 'discards': 0}
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle = []  # (connection, returned at), most recent last
+        self._pid = os.getpid()
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f'No database connection came free within {self.timeout}s '
+                              f'({self.max_size} in use)')
+        try:
+            while (connection := self._take_idle()) is not None:
+                try:
+                    if self.check:
+                        self.check(connection)
+                except Exception:
+                    self._discard(connection)
+                    continue
+                self.stats['reuses'] += 1
+                return connection
+            connection = self.connect()
+            self.stats['connects'] += 1
+            return connection
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection, discard=False):
+        """Give ``connection`` back, ending any open transaction, or close it if ``discard``."""
+        try:
+            if not discard:
+                try:
+                    connection.rollback()
+                except Exception:
+                    discard = True
+            if discard:
+                self._discard(connection)
+            else:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Close the idle connections; ones in use are closed when given back."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            close_quietly(connection)
+
+    def _take_idle(self):
+        """The most recently returned connection, or None when there's none fresh."""
+        with self._lock:
+            if os.getpid() != self._pid:
+                # Forked since: the parent's sockets aren't ours to use or close
+                self._idle, self._pid = [], os.getpid()
+            if not self._idle:
+                return None
+            connection, returned_at = self._idle.pop()
+            if time.monotonic() - returned_at <= self.max_idle:
+                return connection
+            # The rest were returned earlier still, so they're stale too
+            stale, self._idle = [connection, *(idle for idle, _ in self._idle)], []
+        for connection in stale:
+            self._discard(connection)
+        return None
+
+    def _discard(self, connection):
+        self.stats['discards'] += 1
+        close_quietly(connection)
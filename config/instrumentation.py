@@ -0,0 +1,166 @@
+"""
+Optional per-request timing, switched on with the REQUEST_TIMING setting.
+
+RequestTimingMiddleware counts and times the SQL each request runs, and
+TimedDjangoTemplates times template rendering. SQL run while a template
+renders (a queryset evaluated by the template, say) is counted as db time
+only, so db, tpl and app add up to the total. Every response gets a
+Server-Timing header and a log line, and requests slower than
+REQUEST_TIMING_SLOW_MS are logged along with their slowest SQL. The slowest
+requests seen by the process are kept in slowest_requests().
+
+When REQUEST_TIMING is off, settings.py leaves both classes out of the
+configuration, so nothing here runs.
+"""
+import heapq
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+
+logger = logging.getLogger(__name__)
+
+# Slowest requests kept per process, and SQL statements kept per request
+SLOW_REQUESTS_KEPT = 20
+STATEMENTS_KEPT = 20
+
+_current_timer = ContextVar('request_timer', default=None)
+_slowest = []  # Min-heap of (total seconds, sequence, summary)
+_slowest_lock = threading.Lock()
+_sequence = 0
+
+
+class RequestTimer:
+    """Time accumulated by one request, and the execute_wrapper that counts its SQL."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_db_time = 0.0  # Part of db_time spent while rendering
+        self.rendering = False
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += duration
+            if self.rendering:
+                self.template_db_time += duration
+            self.statements.append((duration, sql))
+
+    @property
+    def render_time(self):
+        """Time spent rendering templates, without the SQL they ran."""
+        return max(self.template_time - self.template_db_time, 0)
+
+    def server_timing(self, total):
+        app_time = max(total - self.db_time - self.render_time, 0)
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.render_time * 1000:.1f}',
+            f'app;dur={app_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+    def slowest_statements(self):
+        return [{'ms': round(duration * 1000, 2), 'sql': sql} for duration, sql
+                in heapq.nlargest(STATEMENTS_KEPT, self.statements, key=lambda item: item[0])]
+
+
+class RequestTimingMiddleware:
+    """Add Server-Timing headers and a timing log line to every response."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = getattr(settings, 'REQUEST_TIMING_SLOW_MS', 500) / 1000
+
+    def __call__(self, request):
+        timer = RequestTimer()
+        token = _current_timer.set(timer)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+
+        # Streaming responses are timed up to the point the body starts
+        total = time.perf_counter() - timer.started
+        response['Server-Timing'] = timer.server_timing(total)
+        summary = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'db_ms': round(timer.db_time * 1000, 1),
+            'queries': timer.queries,
+            'template_ms': round(timer.render_time * 1000, 1),
+        }
+        logger.info(' '.join(f'{key}={value}' for key, value in summary.items()),
+                    extra={'timing': summary})
+
+        if total >= self.slow_seconds:
+            summary['statements'] = timer.slowest_statements()
+            logger.warning('Slow request %s %s took %.1f ms; slowest SQL: %s', request.method,
+                           request.path, total * 1000, summary['statements'],
+                           extra={'timing': summary})
+            record_slow_request(total, summary)
+        return response
+
+
+def record_slow_request(total, summary):
+    global _sequence
+    with _slowest_lock:
+        _sequence += 1
+        entry = (total, _sequence, summary)
+        if len(_slowest) < SLOW_REQUESTS_KEPT:
+            heapq.heappush(_slowest, entry)
+        else:
+            heapq.heappushpop(_slowest, entry)
+
+
+def slowest_requests():
+    """Timings and SQL of the slowest requests this process has served, slowest first."""
+    with _slowest_lock:
+        return [summary for _, _, summary in sorted(_slowest, reverse=True)]
+
+
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        timer = _current_timer.get()
+        if timer is None or timer.rendering:  # Templates rendered inside one count once
+            return super().render(context, request)
+        timer.rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timer.template_time += time.perf_counter() - started
+            timer.rendering = False
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with rendering time added to the request's timer."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
@@ -0,0 +1,77 @@
+"""
+Django's MySQL backend, drawing its connections from a config.dbpool pool
+per process. Configured like the PostgreSQL backend's pool: OPTIONS['pool']
+is True or a dict of ConnectionPool arguments (max_size, timeout,
+max_idle), CONN_HEALTH_CHECKS pings connections as they're handed out, and
+CONN_MAX_AGE must be 0, since connections go back to the pool at the end of
+each request.
+"""
+from functools import partial
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.mysql import base as mysql
+
+from config.dbpool import ConnectionPool, PoolTimeout
+
+
+def ping(connection):
+    connection.ping()
+
+
+class DatabaseWrapper(mysql.DatabaseWrapper):
+    # Pools by (alias, database name), so the test database gets its own
+    _connection_pools = {}
+
+    @property
+    def pool(self):
+        pool_options = self.settings_dict['OPTIONS'].get('pool')
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+
+        key = (self.alias, self.settings_dict['NAME'])
+        if key not in self._connection_pools:
+            if self.settings_dict.get('CONN_MAX_AGE', 0) != 0:
+                raise ImproperlyConfigured("Pooling doesn't support persistent connections.")
+            pool = ConnectionPool(
+                partial(mysql.Database.connect, **self.get_connection_params()),
+                check=ping if self.settings_dict['CONN_HEALTH_CHECKS'] else None,
+                **({} if pool_options is True else pool_options),
+            )
+            # Threads racing to create the pool all end up using the first one
+            self._connection_pools.setdefault(key, pool)
+        return self._connection_pools[key]
+
+    def close_pool(self):
+        if self.pool:
+            self.pool.close()
+            del self._connection_pools[(self.alias, self.settings_dict['NAME'])]
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        if self.pool:
+            try:
+                return self.pool.getconn()
+            except PoolTimeout as error:
+                raise OperationalError(str(error)) from error
+        return super().get_new_connection(conn_params)
+
+    def _close(self):
+        if self.connection is None or not self.pool:
+            return super()._close()
+        with self.wrap_database_errors:
+            # After errors the connection only goes back if it still works
+            self.pool.putconn(self.connection,
+                              discard=self.errors_occurred and not self.is_usable())
+            self.connection = None
+
+    def close_if_health_check_failed(self):
+        if self.pool:
+            # The pool only hands out connections that pass the check
+            return
+        return super().close_if_health_check_failed()
@@ -0,0 +1,51 @@
+"""
+Static files storage that, besides the hashed names and manifest of
+ManifestStaticFilesStorage, writes gzip and (when the optional ``brotli``
+package is installed) Brotli copies of each text file at collectstatic time.
+config.static serves them to browsers that accept them.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip copies are made without it
+    brotli = None
+
+# Files worth compressing; images and fonts are compressed already
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.json', '.svg', '.txt', '.html', '.xml')
+# Compressed copies not this much smaller than the original aren't kept
+MIN_SAVING = 0.05
+
+
+def compressed_variants(content):
+    """(suffix, bytes) of each compression of ``content`` that's worth keeping."""
+    variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(content)))
+    return [(suffix, data) for suffix, data in variants
+            if len(data) < len(content) * (1 - MIN_SAVING)]
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Both the original and hashed names are served, so compress both
+        names = {*paths, *self.hashed_files.values()}
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                yield self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        for suffix, data in compressed_variants(content):
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(data))
+        return name, name, True
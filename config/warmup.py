@@ -0,0 +1,91 @@
+"""
+Worker warmup: compile every project template, and the form widget
+templates, into the cached template loaders when a worker starts, and import
+the URLconf (and so the views), so its first requests don't pay for them.
+The WSGI and ASGI entry points run warm_worker(), which warms when
+WARM_TEMPLATES is on, so management commands and tests don't; ``manage.py
+warm_templates`` runs it on demand and reports the effect on a fresh
+worker's first request.
+"""
+import logging
+import time
+from pathlib import Path
+
+import django.forms
+from django.conf import settings
+from django.forms.renderers import get_default_renderer
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Template files compiled by the warmup
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+FORM_TEMPLATES_DIR = Path(django.forms.__file__).resolve().parent / 'templates'
+
+
+def template_names(directory):
+    """Template names (paths relative to ``directory``) of the files under it."""
+    directory = Path(directory)
+    return sorted(path.relative_to(directory).as_posix() for path in directory.rglob('*')
+                  if path.suffix in TEMPLATE_SUFFIXES and path.is_file())
+
+
+def template_targets():
+    """(loader object, template names) pairs: each engine's DIRS, then the form renderer."""
+    targets = [(engine, [name for directory in engine.dirs for name in template_names(directory)])
+               for engine in engines.all()]
+    renderer = get_default_renderer()
+    if hasattr(renderer, 'get_template'):
+        targets.append((renderer, template_names(FORM_TEMPLATES_DIR)))
+    return targets
+
+
+def reset_template_caches():
+    """Empty the cached loaders, as in a freshly started worker."""
+    template_engines = [engine.engine for engine in engines.all() if hasattr(engine, 'engine')]
+    renderer = get_default_renderer()
+    if hasattr(getattr(renderer, 'engine', None), 'engine'):
+        template_engines.append(renderer.engine.engine)
+    for engine in template_engines:
+        for loader in engine.template_loaders:
+            if hasattr(loader, 'reset'):
+                loader.reset()
+
+
+def warm_templates():
+    """
+    Load every template through the cached loaders. Returns ({name: ms},
+    {name: error}); templates that don't compile are logged and skipped.
+    """
+    timings, errors = {}, {}
+    for source, names in template_targets():
+        for name in names:
+            start = time.perf_counter()
+            try:
+                source.get_template(name)
+            except (TemplateSyntaxError, TemplateDoesNotExist) as error:
+                errors[name] = error
+                logger.warning('Template %s not warmed: %s', name, error)
+                continue
+            timings[name] = (time.perf_counter() - start) * 1000
+    return timings, errors
+
+
+def warm_urlconf():
+    """Import the URLconf and build its reverse lookups. Returns the time taken in ms."""
+    start = time.perf_counter()
+    resolver = get_resolver()
+    resolver.url_patterns
+    resolver.reverse_dict
+    return (time.perf_counter() - start) * 1000
+
+
+def warm_worker():
+    """Warm the URLconf and the templates of a starting web worker, if WARM_TEMPLATES is on."""
+    if not getattr(settings, 'WARM_TEMPLATES', False):
+        return
+    urlconf_ms = warm_urlconf()
+    timings, _ = warm_templates()
+    logger.info('Warmed the URLconf and %d templates in %.1f ms', len(timings),
+                urlconf_ms + sum(timings.values()))
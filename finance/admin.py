@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import MonthBal, MonthInc, TaxReturn, MetricConstants
+from .models import MonthBal, MonthInc, TaxReturn, MetricConstants, MonthlySummary
 
 
 @admin.register(MonthBal)
@@ -8,6 +8,10 @@ class MonthBalAdmin(admin.ModelAdmin):
     list_filter = ('date',)
     ordering = ('-date',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_totals(
+            'networth', 'total_assets', 'total_liabilities')
+
 
 @admin.register(MonthInc)
 class MonthIncAdmin(admin.ModelAdmin):
@@ -15,6 +19,10 @@ class MonthIncAdmin(admin.ModelAdmin):
     list_filter = ('date',)
     ordering = ('-date',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_totals(
+            'total_income', 'total_expenses', 'total_surplus')
+
 
 @admin.register(TaxReturn)
 class TaxReturnAdmin(admin.ModelAdmin):
@@ -26,3 +34,21 @@ class TaxReturnAdmin(admin.ModelAdmin):
 class MetricConstantsAdmin(admin.ModelAdmin):
     list_display = ('date', 'value')
     ordering = ('-date',)
+
+
+@admin.register(MonthlySummary)
+class MonthlySummaryAdmin(admin.ModelAdmin):
+    """View only: the signals rewrite a summary whenever its records are saved."""
+
+    list_display = ('date', 'networth', 'total_income', 'total_expenses', 'total_surplus',
+                    'updated_at')
+    ordering = ('-date',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
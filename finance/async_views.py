@@ -0,0 +1,161 @@
+"""
+Async versions of the read views, served instead of those in finance.views
+when ASYNC_VIEWS is on. Lookups that don't depend on each other are started
+together with asyncio.gather(), and the pages are built by the same helpers
+as the sync views.
+
+Django's async ORM still runs each query in the one thread it keeps for
+sync code, so the queries of a request follow each other as before. In
+manage.py load_test these views served fewer requests, more slowly, than
+the sync views under WSGI (see the ASYNC_VIEWS setting), so they are off
+unless turned on.
+"""
+import asyncio
+from datetime import date
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Max, Min, Sum
+from django.shortcuts import aget_object_or_404, render
+from django.views.decorators.cache import cache_control
+
+from .cache import aget_dashboard_context
+from .models import MonthBal, MonthInc, MonthlySummary, TaxReturn, money_avg
+from .pagination import apage_totals, apaginate_by_date
+from .registry import BALANCE, INCOME
+from .reporting import aget_quarters_data
+from .views import (BALANCE_COLUMNS, DASHBOARD_BALANCE_FIELDS, DASHBOARD_INCOME_FIELDS,
+                    INCOME_COLUMNS, dashboard_context, get_int_param, previous_quarter,
+                    report_periods, reports_context, years_between)
+from .watermarks import async_condition, watermark_etag
+
+
+async def alist(queryset):
+    return [row async for row in queryset]
+
+
+async def available_years(model):
+    return years_between(await model.objects.aaggregate(first=Min('date'), last=Max('date')))
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@async_condition(watermark_etag(MonthBal, MonthInc))
+async def home(request):
+    async def build_context():
+        # Totals come precomputed from the summary table, read as rows of
+        # just the fields shown
+        return dashboard_context(*await asyncio.gather(
+            MonthlySummary.objects.filter(balance__isnull=False)
+            .rows(*DASHBOARD_BALANCE_FIELDS).afirst(),
+            MonthlySummary.objects.filter(income__isnull=False)
+            .rows(*DASHBOARD_INCOME_FIELDS).afirst(),
+        ))
+
+    # Cached until a balance or income record changes
+    context = await aget_dashboard_context(await request.auser(), build_context)
+
+    return render(request, 'finance/home.html', context)
+
+
+async def summary_list(request, data_type, page_name, aggregate, columns):
+    """
+    Context of the balance or income list: a page of summary rows with the
+    ``columns`` shown, their totals and the years.
+    """
+    summaries = MonthlySummary.objects.filter(**{f'{data_type}__isnull': False})
+
+    # Get filter parameters
+    year = request.GET.get('year')
+    month = request.GET.get('month')
+
+    summaries = summaries.for_period(get_int_param(year, 1, 9998),
+                                     get_int_param(month, 1, 12))
+    page, years = await asyncio.gather(
+        apaginate_by_date(summaries.rows('date', f'{data_type}_id', *columns),
+                          request.GET.get('cursor')),
+        available_years(MonthBal if data_type == 'balance' else MonthInc),
+    )
+
+    return {
+        page_name: page,
+        'page_totals': await apage_totals(summaries, page,
+                                          **{name: aggregate(name) for name in columns}),
+        'available_years': years,
+        'selected_year': year,
+        'selected_month': month,
+    }
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@async_condition(watermark_etag(MonthBal))
+async def balance_list(request):
+    context = await summary_list(request, 'balance', 'balances', money_avg, BALANCE_COLUMNS)
+    return render(request, 'finance/balance_list.html', context)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@async_condition(watermark_etag(MonthInc))
+async def income_list(request):
+    context = await summary_list(request, 'income', 'incomes', Sum, INCOME_COLUMNS)
+    return render(request, 'finance/income_list.html', context)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@async_condition(watermark_etag(TaxReturn))
+async def tax_list(request):
+    context = {
+        'taxes': await alist(TaxReturn.objects.all()),
+    }
+
+    return render(request, 'finance/tax_list.html', context)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@async_condition(watermark_etag(MonthBal, MonthInc))
+async def reports(request):
+    available_years = await alist(MonthInc.objects.dates('date', 'year', order='DESC'))
+
+    # Default to the most recent complete quarter, when there's data
+    selected_quarter = request.GET.get('quarter')
+    if not selected_quarter and available_years:
+        selected_quarter = previous_quarter(date.today())
+
+    periods = report_periods(selected_quarter)
+    data = await aget_quarters_data(periods) if periods else {}
+
+    return render(request, 'finance/reports.html',
+                  reports_context(selected_quarter, periods, data, available_years))
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@async_condition(watermark_etag(MonthBal))
+async def balance_detail(request, pk):
+    # The group totals come from the database with the record
+    balance = await aget_object_or_404(MonthBal.objects.with_totals(), pk=pk)
+
+    context = {
+        'balance': balance,
+        'field_groups': BALANCE.detail_groups(balance),
+    }
+
+    return render(request, 'finance/balance_detail.html', context)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@async_condition(watermark_etag(MonthInc))
+async def income_detail(request, pk):
+    # The group totals come from the database with the record
+    income = await aget_object_or_404(MonthInc.objects.with_totals(), pk=pk)
+
+    context = {
+        'income': income,
+        'field_groups': INCOME.detail_groups(income),
+    }
+
+    return render(request, 'finance/income_detail.html', context)
@@ -0,0 +1,172 @@
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from io import StringIO
+
+import django
+from django.contrib.auth import get_user_model, user_logged_in
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import urls
+from .models import MonthBal, MonthInc, TaxReturn
+
+
+# Months of history seeded for each benchmark run
+BENCHMARK_SIZES = (24, 1000, 50000)
+
+# Records whose primary key fills in the <pk> of detail and edit URLs
+URL_RECORDS = {
+    'balance': MonthBal,
+    'income': MonthInc,
+    'tax': TaxReturn,
+}
+
+# A view is slower than its baseline when it takes this many times as long,
+# plus a few milliseconds of slack so fast views don't fail on timer noise
+TIME_THRESHOLD = 1.5
+TIME_SLACK_MS = 5
+
+BENCHMARK_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                'LOCATION': 'finance-benchmarks'}}
+
+
+def benchmark_urls():
+    """Map every view in finance/urls.py to a URL for it, using the latest records."""
+    view_urls = {}
+    for pattern in urls.urlpatterns:
+        name = f'{urls.app_name}:{pattern.name}'
+        kwargs = {}
+        if 'pk' in pattern.pattern.converters:
+            record = URL_RECORDS[pattern.name.split('_')[0]].objects.first()
+            kwargs['pk'] = record.pk
+        view_urls[name] = reverse(name, kwargs=kwargs)
+    return view_urls
+
+
+def measure(client, url, memory=False):
+    """
+    Request ``url`` with an empty cache and return its status, query count and
+    wall time in milliseconds, or the peak traced memory in KiB when ``memory``
+    is set (tracing slows everything down, so the two are measured separately).
+    """
+    cache.clear()
+    if memory:
+        tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        elapsed = (time.perf_counter() - started) * 1000
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {'peak_kib': round(peak / 1024, 1)}
+    return {'status': response.status_code, 'queries': len(queries), 'time_ms': elapsed}
+
+
+@override_settings(CACHES=BENCHMARK_CACHES)
+def run_benchmarks(sizes=BENCHMARK_SIZES, repeat=3, memory=True, log=None):
+    """
+    Seed each dataset size in turn and request every finance view with the
+    test client. This replaces all Finance data, so only run it against a
+    test database.
+
+    Returns a report of the form ``{'views': {name: {size: result}}, ...}``,
+    where the result holds the status, query count, median wall time and
+    (with ``memory``) peak memory of the request.
+    """
+    user, _ = get_user_model().objects.get_or_create(
+        username='benchmark', defaults={'is_staff': True, 'is_superuser': True})
+    client = Client()
+    client.force_login(user)
+
+    report = {
+        'sizes': list(sizes),
+        'database': connection.vendor,
+        'django': django.get_version(),
+        'python': platform.python_version(),
+        'views': {},
+    }
+    for size in sizes:
+        if log:
+            log(f'Seeding {size} months...')
+        call_command('load_test_data', months=size, stdout=StringIO())
+
+        for name, url in benchmark_urls().items():
+            measure(client, url)  # Warm up imports and template loading
+            runs = [measure(client, url) for _ in range(repeat)]
+            result = {
+                'url': url,
+                'status': runs[-1]['status'],
+                'queries': runs[-1]['queries'],
+                'time_ms': round(statistics.median(run['time_ms'] for run in runs), 2),
+            }
+            if memory:
+                result.update(measure(client, url, memory=True))
+            report['views'].setdefault(name, {})[str(size)] = result
+            if log:
+                log(f"  {name:<24} {result['queries']:>3} queries {result['time_ms']:>9.2f} ms")
+    return report
+
+
+@contextmanager
+def cookie_login():
+    """
+    Yield a Cookie header logging in as the first active (super)user, for
+    requests made inside the block straight to a handler. Sessions are kept in
+    signed cookies and last_login isn't updated, so nothing is written to the
+    database.
+    """
+    user_logged_in.disconnect(update_last_login, dispatch_uid='update_last_login')
+    try:
+        with override_settings(ALLOWED_HOSTS=['localhost'],
+                               SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'):
+            client = Client()
+            user = get_user_model().objects.filter(is_active=True).order_by(
+                '-is_superuser', 'pk').first()
+            if user:
+                client.force_login(user)
+            yield '; '.join(f'{name}={morsel.value}' for name, morsel in client.cookies.items())
+    finally:
+        user_logged_in.connect(update_last_login, dispatch_uid='update_last_login')
+
+
+def check_report(report, baseline=None, threshold=TIME_THRESHOLD):
+    """
+    Return a list of problems in ``report``: failed requests, query counts
+    that grow with the dataset size, and (given a ``baseline`` report) views
+    that now run more queries or take more than ``threshold`` times as long.
+    """
+    problems = []
+    for name, results in report['views'].items():
+        for size, result in results.items():
+            if result['status'] != 200:
+                problems.append(f"{name} returned {result['status']} at {size} months")
+
+        counts = {size: result['queries'] for size, result in results.items()}
+        if len(set(counts.values())) > 1:
+            problems.append(f'{name} query count grows with the data: ' + ', '.join(
+                f'{count} at {size} months' for size, count in counts.items()))
+
+        if baseline is None:
+            continue
+        for size, result in results.items():
+            before = baseline['views'].get(name, {}).get(size)
+            if before is None:
+                continue
+            if result['queries'] > before['queries']:
+                problems.append(f"{name} runs {result['queries']} queries at {size} months, "
+                                f"up from {before['queries']}")
+            if result['time_ms'] > before['time_ms'] * threshold + TIME_SLACK_MS:
+                problems.append(f"{name} takes {result['time_ms']:.2f} ms at {size} months, "
+                                f"up from {before['time_ms']:.2f} ms")
+    return problems
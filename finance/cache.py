@@ -0,0 +1,97 @@
+import hashlib
+
+from django.core.cache import cache
+
+from .models import Watermark
+
+DASHBOARD_KEY = 'finance:dashboard:{token}:{user_id}'
+# Entries made stale by a new data token are never read again; let them go
+DASHBOARD_TIMEOUT = 60 * 60 * 24
+HITS_KEY = 'finance:dashboard:hits'
+MISSES_KEY = 'finance:dashboard:misses'
+
+
+def dashboard_key(token, user_id):
+    return DASHBOARD_KEY.format(token=token, user_id=user_id)
+
+
+def get_dashboard_context(user, build):
+    """
+    Return the cached dashboard context for ``user``, calling ``build()`` to
+    create it on a miss. Entries are keyed by the data token, so every user's
+    dashboard is invalidated at once, in every process, when the underlying
+    data changes.
+    """
+    key = dashboard_key(data_token(), user.pk)
+    context = cache.get(key)
+    if context is not None:
+        _count(HITS_KEY)
+        return context
+
+    _count(MISSES_KEY)
+    context = build()
+    cache.set(key, context, timeout=DASHBOARD_TIMEOUT)
+    return context
+
+
+async def aget_dashboard_context(user, build):
+    """get_dashboard_context() for async views, where ``build()`` is a coroutine."""
+    key = dashboard_key(await adata_token(), user.pk)
+    context = await cache.aget(key)
+    if context is not None:
+        await _acount(HITS_KEY)
+        return context
+
+    await _acount(MISSES_KEY)
+    context = await build()
+    await cache.aset(key, context, timeout=DASHBOARD_TIMEOUT)
+    return context
+
+
+def data_token():
+    """
+    Token that changes whenever the Finance data does, for the caches keyed by
+    it (the dashboards, the column store and the stats) to check they're still
+    current. It is read from the watermarks in the database rather than kept
+    in a cache, so every worker process sees a write as soon as it's committed,
+    whether or not they share a cache.
+    """
+    return _token(Watermark.objects.values_list('model', 'changed_at'))
+
+
+async def adata_token():
+    """data_token() for async views."""
+    return _token([mark async for mark in Watermark.objects.values_list('model', 'changed_at')])
+
+
+def _token(marks):
+    key = repr(sorted((label, changed.isoformat()) for label, changed in marks))
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def dashboard_cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 4) if lookups else None,
+    }
+
+
+def _count(key):
+    # add() is a no-op when the counter exists, so concurrent first hits don't reset it
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:  # Evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+
+
+async def _acount(key):
+    await cache.aadd(key, 0, timeout=None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, timeout=None)
@@ -0,0 +1,17 @@
+"""System checks run by ``manage.py check --deploy``."""
+from django.conf import settings
+from django.core import checks
+
+
+@checks.register(checks.Tags.staticfiles, deploy=True)
+def check_self_hosted_assets(app_configs=None, **kwargs):
+    """The built CSS and JavaScript are in static/, rather than taken from the CDNs."""
+    if settings.SELF_HOSTED_ASSETS:
+        return []
+    missing = [name for name in settings.ASSET_FILES
+               if not (settings.BASE_DIR / 'static' / name).is_file()]
+    return [checks.Warning(
+        f"static/ has no {', '.join(missing)}, so the pages load Tailwind, Chart.js and "
+        f"Lucide from the CDNs.",
+        hint='Run `npm install && npm run build` before collectstatic when deploying.',
+        id='finance.W001')]
@@ -0,0 +1,134 @@
+"""
+Process-level columnar cache of the monthly series.
+
+Each balance or income field, and each rollup, is loaded on first use into a
+pair of contiguous arrays: the months (as date ordinals) and their values.
+Charts and stats then come from array slices instead of a query per series.
+Columns are dropped when the Finance data changes, in every process, as the
+store is keyed by the data token read from the database (see
+finance.cache.data_token). A value the database has no amount for, such as
+a rollup of a record without its summary row, is stored as NaN rather than
+0, and left out of the stats.
+"""
+import math
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+
+from .cache import data_token
+from .models import MonthBal, MonthInc, BALANCE_ROLLUPS, INCOME_ROLLUPS
+
+
+# Columns kept per process; the least recently used are dropped past this
+COLUMN_STORE_SIZE = 64
+COLUMN_SOURCES = {
+    'balance': (MonthBal, BALANCE_ROLLUPS),
+    'income': (MonthInc, INCOME_ROLLUPS),
+}
+
+
+class Column:
+    """One series: ``dates`` as date ordinals in ascending order, and their ``values``."""
+
+    __slots__ = ('dates', 'values')
+
+    def __init__(self, dates, values):
+        self.dates = dates
+        self.values = values
+
+    def between(self, start=None, end=None):
+        """The part of the column from ``start`` to ``end`` (dates, both inclusive)."""
+        low = bisect_left(self.dates, start.toordinal()) if start else 0
+        high = bisect_right(self.dates, end.toordinal()) if end else len(self.dates)
+        return Column(self.dates[low:high], self.values[low:high])
+
+    def present(self):
+        """The column without its missing (NaN) values."""
+        if not any(map(math.isnan, self.values)):
+            return self
+        keep = [index for index, value in enumerate(self.values) if not math.isnan(value)]
+        return Column(array('l', (self.dates[index] for index in keep)),
+                      array('d', (self.values[index] for index in keep)))
+
+    def stats(self):
+        values = self.present().values
+        if not values:
+            return None
+        return {'current': values[-1], 'highest': max(values),
+                'lowest': min(values), 'count': len(values)}
+
+    def labels(self):
+        return [date.fromordinal(ordinal).isoformat() for ordinal in self.dates]
+
+
+class ColumnStore:
+
+    def __init__(self, size=COLUMN_STORE_SIZE):
+        self.size = size
+        self._columns = OrderedDict()
+        self._token = None
+        self._lock = threading.Lock()
+
+    def column(self, data_type, name, token=None):
+        """Return the whole ``name`` series of ``data_type``, loading it if needed."""
+        return self.columns(data_type, [name], token)[name]
+
+    def columns(self, data_type, names, token=None):
+        """
+        Return {name: Column} for ``names`` of ``data_type``. Those not already
+        held are loaded together, with one query. ``token`` is the data token,
+        when the caller has already read it for this request.
+        """
+        if token is None:
+            token = data_token()
+        found = {}
+        with self._lock:
+            if token != self._token:
+                self._columns.clear()
+                self._token = token
+            for name in names:
+                column = self._columns.get((data_type, name))
+                if column is not None:
+                    self._columns.move_to_end((data_type, name))
+                    found[name] = column
+
+        missing = [name for name in dict.fromkeys(names) if name not in found]
+        if missing:
+            loaded = load_columns(data_type, missing)
+            with self._lock:
+                # Loaded after the token was read, so never older than it; a
+                # write in between only changes the token for the next call
+                if token == self._token:
+                    for name, column in loaded.items():
+                        self._columns[(data_type, name)] = column
+                    while len(self._columns) > self.size:
+                        self._columns.popitem(last=False)
+            found.update(loaded)
+        return {name: found[name] for name in names}
+
+    def clear(self):
+        with self._lock:
+            self._columns.clear()
+
+
+def load_columns(data_type, names):
+    """
+    Load the ``names`` series of ``data_type`` in a single query on its model,
+    reading rollups through the joined summary rows.
+    """
+    model, rollups = COLUMN_SOURCES[data_type]
+    lookups = [f'summary__{name}' if name in rollups else name for name in names]
+
+    dates, values = array('l'), [array('d') for _ in names]
+    for day, *row in model.objects.order_by('date').values_list('date', *lookups).iterator(
+            chunk_size=5000):
+        dates.append(day.toordinal())
+        for column, value in zip(values, row):
+            column.append(math.nan if value is None else float(value))
+    # The columns share one dates array; slices are copies, so it is never modified
+    return {name: Column(dates, column) for name, column in zip(names, values)}
+
+
+columns = ColumnStore()
@@ -0,0 +1,66 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+
+from .models import TOTAL_PREFIX
+from .money import Money
+
+
+# Rows fetched from the database per round trip while streaming
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object for csv.writer that hands each line back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def export_columns(queryset):
+    """The date and every stored amount, followed by every computed total."""
+    fields = [field.name for field in queryset.model._meta.concrete_fields
+              if field.name != 'id']
+    return fields, list(queryset.rollups)
+
+
+def iter_rows(queryset, fields, totals):
+    """Yield value tuples chunk by chunk without caching the queryset."""
+    rows = queryset.with_totals(*totals).order_by('date').values_list(
+        *fields, *(TOTAL_PREFIX + name for name in totals))
+    return rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def format_value(value):
+    if isinstance(value, Money):
+        return str(value)
+    return value.isoformat()
+
+
+def stream_csv(queryset, fields, totals):
+    writer = csv.writer(Echo())
+    yield writer.writerow([*fields, *totals])
+    for row in iter_rows(queryset, fields, totals):
+        yield writer.writerow([format_value(value) for value in row])
+
+
+def stream_jsonl(queryset, fields, totals):
+    columns = [*fields, *totals]
+    for row in iter_rows(queryset, fields, totals):
+        yield json.dumps(dict(zip(columns, map(format_value, row)))) + '\n'
+
+
+def export_response(queryset, name, export_format='csv'):
+    """Stream ``queryset`` with its computed totals as CSV or JSON Lines."""
+    fields, totals = export_columns(queryset)
+    if export_format == 'jsonl':
+        content = stream_jsonl(queryset, fields, totals)
+        content_type, extension = 'application/x-ndjson', 'jsonl'
+    else:
+        content = stream_csv(queryset, fields, totals)
+        content_type, extension = 'text/csv', 'csv'
+
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{name}.{extension}"'
+    return response
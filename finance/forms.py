@@ -1,36 +1,88 @@
+import hashlib
+
 from django import forms
-from .models import MonthBal, MonthInc, TaxReturn
+from django.utils.functional import cached_property, classproperty
+
+from .models import MonthBal, MonthInc, TaxReturn, month_of
+from .registry import BALANCE, INCOME
+from .watermarks import code_version
+
+
+# Tailwind classes given to every input on the finance forms
+INPUT_CLASSES = ('w-full px-3 py-2 border border-slate-300 rounded-lg focus:outline-none '
+                 'focus:ring-2 focus:ring-blue-500')
+
+
+def styled_formfield(db_field, **kwargs):
+    """
+    formfield_callback that gives each field's widget the input classes. It runs
+    once, when the form class is created; instances get copies of these fields.
+    """
+    field = db_field.formfield(**kwargs)
+    if field is not None:
+        field.widget.attrs['class'] = INPUT_CLASSES
+    return field
+
+
+class GroupedModelForm(forms.ModelForm):
+    """
+    ModelForm laid out in the field groups of a finance.registry Registry.
+    ``layout_key`` identifies the rendered layout, for caching the blank form.
+    """
 
+    registry = None
+
+    @classproperty
+    def layout_key(cls):
+        """
+        Hash of what the blank form renders from: the groups, each field's
+        label, widget and attributes, and the code and templates. Worked out on
+        first use, since base_fields don't exist yet in __init_subclass__().
+        """
+        if '_layout_key' not in cls.__dict__:
+            fields = [(name, type(field).__name__, str(field.label), str(field.help_text),
+                       field.required, field.initial, type(field.widget).__name__,
+                       sorted(field.widget.attrs.items()))
+                      for name, field in cls.base_fields.items()]
+            layout = repr((cls.__name__, cls.registry.form_groups, fields, code_version()))
+            cls._layout_key = hashlib.md5(layout.encode(), usedforsecurity=False).hexdigest()
+        return cls._layout_key
+
+    def clean_date(self):
+        # One record per month, dated the first, as the model saves it
+        return month_of(self.cleaned_data['date'])
+
+    @cached_property
+    def groups(self):
+        """[(title, [bound field, ...]), ...] in the registry's order."""
+        return [(title, [self[name] for name in names])
+                for title, names in self.registry.form_groups.items()]
+
+
+class MonthBalForm(GroupedModelForm):
+    registry = BALANCE
 
-class MonthBalForm(forms.ModelForm):
     class Meta:
         model = MonthBal
         fields = '__all__'
+        labels = BALANCE.labels
         widgets = {
             'date': forms.DateInput(attrs={'type': 'date'}),
         }
+        formfield_callback = styled_formfield
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Add Tailwind classes to all fields
-        for field_name, field in self.fields.items():
-            field.widget.attrs[
-                'class'] = 'w-full px-3 py-2 border border-slate-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500'
 
+class MonthIncForm(GroupedModelForm):
+    registry = INCOME
 
-class MonthIncForm(forms.ModelForm):
     class Meta:
         model = MonthInc
         fields = '__all__'
+        labels = INCOME.labels
         widgets = {
             'date': forms.DateInput(attrs={'type': 'date'}),
         }
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            field.widget.attrs[
-                'class'] = 'w-full px-3 py-2 border border-slate-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500'
+        formfield_callback = styled_formfield
 
 
 class TaxReturnForm(forms.ModelForm):
@@ -40,9 +92,4 @@ class TaxReturnForm(forms.ModelForm):
         widgets = {
             'year': forms.DateInput(attrs={'type': 'date'}),
         }
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for field_name, field in self.fields.items():
-            field.widget.attrs[
-                'class'] = 'w-full px-3 py-2 border border-slate-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500'
+        formfield_callback = styled_formfield
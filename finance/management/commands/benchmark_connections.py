@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Environment of the worker process for each way of handling connections
+CONNECTION_MODES = {
+    'reconnect': {'DATABASE_CONN_MAX_AGE': '0', 'DATABASE_POOL_SIZE': '0'},
+    'persistent': {'DATABASE_CONN_MAX_AGE': '60', 'DATABASE_POOL_SIZE': '0'},
+    'pooled': {'DATABASE_POOL_SIZE': '4'},
+}
+
+
+def time_requests(path, count):
+    """
+    Request ``path`` ``count`` times through the WSGI handler, so connections
+    are opened and closed as in production, and return the timings in ms and
+    the number of database connections opened. Logs in with cookie_login().
+    """
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from finance.benchmarks import cookie_login
+
+    opened = []
+    connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+    with cookie_login() as cookies:
+        connection.close()
+        opened.clear()
+
+        handler = WSGIHandler()
+        timings, statuses = [], set()
+        for _ in range(count):
+            environ = {'PATH_INFO': path, 'HTTP_HOST': 'localhost', 'HTTP_COOKIE': cookies,
+                       'wsgi.input': BytesIO()}
+            setup_testing_defaults(environ)
+            start = time.perf_counter()
+            response = handler(environ, lambda status, headers: statuses.add(status))
+            b''.join(response)
+            response.close()  # Sends request_finished, which closes or returns the connection
+            timings.append((time.perf_counter() - start) * 1000)
+
+    pool = getattr(connection, 'pool', None)
+    return {
+        'timings': timings,
+        'statuses': sorted(statuses),
+        'connections': pool.stats['connects'] if pool else len(opened),
+        'vendor': connection.vendor,
+    }
+
+
+class Command(BaseCommand):
+    help = ('Time requests on fresh worker processes that reconnect to the database every '
+            'request, keep persistent connections, or use the connection pool')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/finance/',
+                            help='Page to request (default: %(default)s)')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Requests per mode (default: %(default)s)')
+        parser.add_argument('--modes', default=','.join(CONNECTION_MODES),
+                            help='Comma-separated modes to run (default: %(default)s)')
+        # Used by the worker processes
+        parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError('--requests must be at least 2')
+        if options['run']:
+            self.stdout.write(json.dumps(time_requests(options['path'], options['requests'])))
+            return
+
+        modes = options['modes'].split(',')
+        unknown = set(modes) - set(CONNECTION_MODES)
+        if unknown:
+            raise CommandError(f"Unknown modes: {', '.join(sorted(unknown))}")
+
+        self.stdout.write(f"{options['requests']} requests to {options['path']} per mode:")
+        self.stdout.write(f"  {'':12}{'p50':>10}{'p95':>10}{'connections':>13}")
+        for mode in modes:
+            result = self.worker(mode, options['path'], options['requests'])
+            p50, p95 = (statistics.quantiles(result['timings'], n=100)[index]
+                        for index in (49, 94))
+            self.stdout.write(f"  {mode:12}{p50:>7.2f} ms{p95:>7.2f} ms"
+                              f"{result['connections']:>13}  (HTTP "
+                              f"{', '.join(result['statuses'])})")
+        if result['vendor'] != 'mysql':
+            self.stderr.write(f"Measured against {result['vendor']}, where the modes differ "
+                              'little; set DATABASE_HOST and friends to use MySQL or MariaDB.')
+
+    def worker(self, mode, path, count):
+        command = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'),
+                   'benchmark_connections', '--run', '--path', path, '--requests', str(count)]
+        completed = subprocess.run(command, capture_output=True, text=True,
+                                   env={**os.environ, **CONNECTION_MODES[mode]})
+        if completed.returncode:
+            raise CommandError(f'Worker process failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.splitlines()[-1])
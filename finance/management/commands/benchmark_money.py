@@ -0,0 +1,136 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.apps.registry import Apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.test.utils import setup_test_environment, teardown_test_environment
+from finance.models import INCOME_ROLLUPS, NOT_ANNOTATED, TOTAL_PREFIX, MonthInc
+from finance.money import Money, MoneyField
+
+
+def decimal_total(name):
+    """
+    The ``name``() method of an income rollup as it was for DecimalFields,
+    adding up the Decimals themselves, with annotated_total()'s lookup.
+    """
+    terms = [(term.lstrip('-'), term.startswith('-'), term.lstrip('-') in INCOME_ROLLUPS)
+             for term in INCOME_ROLLUPS[name]]
+    attname = TOTAL_PREFIX + name
+
+    def method(self):
+        value = self.__dict__.get(attname, NOT_ANNOTATED)
+        if value is not NOT_ANNOTATED:
+            return value
+        total = 0
+        for term, subtract, is_rollup in terms:
+            amount = getattr(self, term)() if is_rollup else getattr(self, term)
+            total = total - amount if subtract else total + amount
+        return total
+    return method
+
+
+def decimal_model():
+    """
+    A copy of MonthInc with its amounts in DECIMAL(10, 2) columns, as they
+    were before MoneyField, and the same total_*() methods. Registered apart
+    from the project's models so it never reaches a migration.
+    """
+    attrs = {
+        '__module__': __name__,
+        'Meta': type('Meta', (), {'apps': Apps(), 'app_label': 'finance',
+                                  'db_table': 'benchmark_decimal_monthinc'}),
+        'date': models.DateField(),
+    }
+    for field in MonthInc._meta.fields:
+        if isinstance(field, MoneyField):
+            attrs[field.name] = models.DecimalField(max_digits=10, decimal_places=2,
+                                                    default=Decimal('0.00'))
+    for name in INCOME_ROLLUPS:
+        attrs[name] = decimal_total(name)
+    return type('DecimalMonthInc', (models.Model,), attrs)
+
+
+def compute_totals(rows):
+    """Call every total_*() method of every row, as the list and report pages do."""
+    for row in rows:
+        for name in INCOME_ROLLUPS:
+            getattr(row, name)()
+
+
+def best_time(function, repeat):
+    """Fastest of ``repeat`` calls to ``function``, in ms."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = ('Time loading MonthInc rows and computing their totals with amounts stored as '
+            'integer cents (MoneyField) and as DECIMAL(10, 2), in a throwaway test database')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000,
+                            help='Rows of each kind to load (default: %(default)s)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Timed runs of each step; the fastest is reported '
+                                 '(default: %(default)s)')
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError('--rows and --repeat must be at least 1')
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = self.run(options['rows'], options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{options['rows']} MonthInc rows on {connection.vendor}, "
+                          f"best of {options['repeat']}:")
+        self.stdout.write(f"  {'':10}{'load':>12}{'totals':>12}")
+        for kind, (load, totals) in results.items():
+            self.stdout.write(f'  {kind:10}{load:>9.1f} ms{totals:>9.1f} ms')
+
+    def run(self, count, repeat):
+        DecimalMonthInc = decimal_model()
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(DecimalMonthInc)
+
+        # The same amounts in both tables, up to $10,000 in whole cents
+        rng = random.Random(0)
+        names = [field.name for field in MonthInc._meta.fields if isinstance(field, MoneyField)]
+        first = date(2000, 1, 1)
+        cents_rows = [[rng.randrange(1_000_000) for _ in names] for _ in range(count)]
+        MonthInc.objects.bulk_create(
+            MonthInc(date=first + timedelta(days=index),
+                     **{name: Money(cents) for name, cents in zip(names, row)})
+            for index, row in enumerate(cents_rows))
+        DecimalMonthInc.objects.bulk_create(
+            DecimalMonthInc(date=first + timedelta(days=index),
+                            **{name: Decimal(cents).scaleb(-2)
+                               for name, cents in zip(names, row)})
+            for index, row in enumerate(cents_rows))
+        del cents_rows
+
+        results, surpluses = {}, {}
+        for kind, model in (('decimal', DecimalMonthInc), ('cents', MonthInc)):
+            queryset = model.objects.order_by('pk')
+            load = best_time(lambda: list(queryset.all()), repeat)
+            rows = list(queryset)
+            results[kind] = (load, best_time(lambda: compute_totals(rows), repeat))
+            surpluses[kind] = sum(row.total_surplus() for row in rows)
+            rows = None  # Only one kind of rows is held at a time
+
+        if surpluses['cents'].to_decimal() != surpluses['decimal']:
+            raise CommandError(f"The totals disagree: {surpluses['cents']} in cents, "
+                               f"{surpluses['decimal']} in decimals")
+        return results
@@ -0,0 +1,180 @@
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+
+# Environment of the worker process for each SQLite profile
+SQLITE_PROFILES = {
+    'default': {'SQLITE_TUNED': 'False'},
+    'tuned': {'SQLITE_TUNED': 'True'},
+}
+
+
+def worker(kind, operation, offset, deadline, results):
+    """Run ``operation`` until ``deadline``, then report its timings on ``results``."""
+    timings, failed = [], 0
+    index = offset
+    try:
+        while (start := time.monotonic()) < deadline:
+            try:
+                operation(index)
+                timings.append((time.monotonic() - start) * 1000)
+            except DatabaseError:  # database is locked
+                failed += 1
+            index += 1
+    except Exception:
+        # Anything else is a bug in the workload, for the parent to raise
+        results.put((kind, timings, failed, traceback.format_exc()))
+        return
+    finally:
+        connection.close()
+    results.put((kind, timings, failed, None))
+
+
+def run_workers(jobs, seconds):
+    """
+    Run a process for each ``(kind, operation, offset)`` job for ``seconds``,
+    and gather the timings in ms and the failures of each kind.
+    """
+    # Separate processes, like the workers of a server, so they contend for the
+    # database rather than for the GIL
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    deadline = time.monotonic() + seconds
+    processes = [context.Process(target=worker, args=(*job, deadline, results))
+                 for job in jobs]
+    for process in processes:
+        process.start()
+    counts = {kind: {'timings': [], 'failed': 0} for kind in ('reads', 'writes')}
+    try:
+        for _ in processes:
+            try:
+                # A process that died without reporting would leave this waiting forever
+                kind, timings, failed, error = results.get(timeout=seconds + 60)
+            except queue.Empty:
+                exit_codes = [process.exitcode for process in processes]
+                raise CommandError(f'Worker processes stopped reporting (exit codes '
+                                   f'{exit_codes})') from None
+            if error:
+                raise CommandError(f'A {kind} process failed:\n{error}')
+            counts[kind]['timings'] += timings
+            counts[kind]['failed'] += failed
+    finally:
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+    return counts
+
+
+def run_workload(readers, writers, seconds, months):
+    """
+    Seed a scratch SQLite database with ``months`` of test data, then run
+    ``readers`` and ``writers`` processes against it for ``seconds``. Readers
+    load a page of balance summaries with its totals, as balance_list does.
+    Writers save a balance record, as balance_add does, which also refreshes
+    its summary. Returns the timings in ms of the operations of each kind that
+    completed, and how many failed.
+    """
+    from django.core.management import call_command
+    from django.db.models import Avg
+
+    from finance.models import MonthBal, MonthlySummary
+    from finance.money import Money
+
+    directory = tempfile.TemporaryDirectory()
+    connection.close()
+    # The forked workers inherit the scratch database settings
+    connection.settings_dict['NAME'] = str(Path(directory.name) / 'benchmark.sqlite3')
+    call_command('migrate', verbosity=0)
+    call_command('load_test_data', months=months, stdout=StringIO())
+    pks = list(MonthBal.objects.values_list('pk', flat=True))
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        journal_mode = cursor.fetchone()[0]
+    connection.close()
+
+    def read(index):
+        summaries = MonthlySummary.objects.filter(balance__isnull=False)
+        list(summaries[index % 50:index % 50 + 25])
+        summaries.aggregate(Avg('networth'), Avg('total_assets'))
+
+    def write(index):
+        record = MonthBal.objects.get(pk=pks[index % len(pks)])
+        record.huntington_check += Money(100)
+        record.save()
+
+    jobs = [('reads', read, offset) for offset in range(readers)]
+    jobs += [('writes', write, offset * 7) for offset in range(writers)]
+    try:
+        counts = run_workers(jobs, seconds)
+    finally:
+        directory.cleanup()
+    return {'counts': counts, 'journal_mode': journal_mode}
+
+
+class Command(BaseCommand):
+    help = ('Run concurrent reader and writer processes against a scratch SQLite database '
+            'with the default and the tuned (SQLITE_TUNED) settings, and compare throughput')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4,
+                            help='Reader processes (default: %(default)s)')
+        parser.add_argument('--writers', type=int, default=2,
+                            help='Writer processes (default: %(default)s)')
+        parser.add_argument('--seconds', type=float, default=5,
+                            help='How long each profile runs (default: %(default)s)')
+        parser.add_argument('--months', type=int, default=120,
+                            help='Months of test data to seed (default: %(default)s)')
+        # Used by the worker processes
+        parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['readers'] < 0 or options['writers'] < 0:
+            raise CommandError('--readers and --writers must not be negative')
+        if connection.vendor != 'sqlite':
+            raise CommandError(f'The database is {connection.vendor}, not SQLite')
+        if options['run']:
+            self.stdout.write(json.dumps(run_workload(
+                options['readers'], options['writers'], options['seconds'],
+                options['months'])))
+            return
+
+        self.stdout.write(f"{options['readers']} readers and {options['writers']} writers "
+                          f"for {options['seconds']:g}s per profile:")
+        self.stdout.write(f"  {'':10}{'journal':>8}{'reads/s':>9}{'p95':>10}"
+                          f"{'writes/s':>10}{'p95':>10}{'failed':>8}")
+        for profile in SQLITE_PROFILES:
+            result = self.worker(profile, options)
+            line = f"  {profile:10}{result['journal_mode']:>8}"
+            for kind in ('reads', 'writes'):
+                timings = result['counts'][kind]['timings']
+                p95 = (statistics.quantiles(timings, n=20)[-1] if len(timings) > 1
+                       else float('nan'))
+                line += f"{len(timings) / options['seconds']:>9.1f}{p95:>7.1f} ms"
+            failed = sum(result['counts'][kind]['failed'] for kind in ('reads', 'writes'))
+            self.stdout.write(f'{line}{failed:>8}')
+
+    def worker(self, profile, options):
+        command = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'),
+                   'benchmark_sqlite', '--run', *(f'--{name}={options[name]}' for name in
+                                                  ('readers', 'writers', 'seconds', 'months'))]
+        completed = subprocess.run(command, capture_output=True, text=True,
+                                   env={**os.environ, **SQLITE_PROFILES[profile]})
+        if completed.returncode:
+            raise CommandError(f'Worker process failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.splitlines()[-1])
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from finance.benchmarks import BENCHMARK_SIZES, TIME_THRESHOLD, check_report, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = ('Benchmark every Finance view at several dataset sizes, in a throwaway '
+            'test database')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default=','.join(map(str, BENCHMARK_SIZES)),
+                            help='Comma-separated months of data to seed (default: %(default)s)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Timed requests per view; the median is reported (default: 3)')
+        parser.add_argument('--no-memory', action='store_true',
+                            help='Skip the traced peak-memory request for each view')
+        parser.add_argument('--output', default='benchmark-report.json',
+                            help='Where to write the JSON report (default: %(default)s)')
+        parser.add_argument('--baseline',
+                            help='Earlier report to compare against')
+        parser.add_argument('--threshold', type=float, default=TIME_THRESHOLD,
+                            help='Fail when a view takes this many times its baseline time '
+                                 '(default: %(default)s)')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated numbers of months')
+        baseline = None
+        if options['baseline']:
+            baseline = json.loads(Path(options['baseline']).read_text())
+
+        # Seeding replaces all Finance data, so never touch the real database
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            report = run_benchmarks(sizes, repeat=options['repeat'],
+                                    memory=not options['no_memory'], log=self.stdout.write)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        Path(options['output']).write_text(json.dumps(report, indent=2) + '\n')
+        self.stdout.write(f"Report written to {options['output']}")
+
+        problems = check_report(report, baseline, options['threshold'])
+        if problems:
+            raise CommandError('Benchmark check failed:\n' + '\n'.join(problems))
+        self.stdout.write(self.style.SUCCESS('All views within limits'))
@@ -0,0 +1,132 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.forms import modelform_factory
+from finance.forms import MonthBalForm, MonthIncForm, TaxReturnForm
+from finance.models import MetricConstants, upsert
+from finance.summaries import refresh_summaries
+from finance.watermarks import touch_watermarks
+
+
+# Import targets: form used to clean each row, and the unique field to upsert on
+TARGETS = {
+    'balance': (MonthBalForm, 'date'),
+    'income': (MonthIncForm, 'date'),
+    'tax': (TaxReturnForm, 'year'),
+    'metric': (modelform_factory(MetricConstants, fields='__all__'), None),
+}
+
+
+def import_form(form_class):
+    """The ModelForm minus its per-row uniqueness queries; the upsert handles conflicts."""
+    class ImportForm(form_class):
+        def validate_unique(self):
+            pass
+
+        def validate_constraints(self):
+            # The only constraints are the unique dates/years the upsert targets
+            pass
+
+    return ImportForm
+
+
+class Command(BaseCommand):
+    help = 'Bulk import Finance records from a CSV or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=TARGETS, help='Kind of record in the file')
+        parser.add_argument('path', help='CSV file with a header row, or a .jsonl file')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='File format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows validated and written per batch (default: 1000)')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'{path} does not exist')
+        file_format = options['format'] or ('jsonl' if path.suffix == '.jsonl' else 'csv')
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        form_class, unique_field = TARGETS[options['model']]
+        form_class = import_form(form_class)
+        model = form_class._meta.model
+        defaults = {field.name: field.get_default() for field in model._meta.concrete_fields
+                    if field.has_default()}
+
+        self.stdout.write(f'Importing {model._meta.verbose_name_plural} from {path}...')
+        started = time.perf_counter()
+        imported = 0
+        months = set()
+
+        with path.open(newline='') as handle, transaction.atomic():
+            rows = self.read_rows(handle, file_format)
+            while batch := list(islice(rows, batch_size)):
+                objects = self.clean_batch(form_class, defaults, batch, unique_field)
+                self.write_batch(model, objects, unique_field)
+                if unique_field == 'date':
+                    months.update(obj.date for obj in objects)
+
+                imported += len(batch)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f'  {imported} rows ({imported / elapsed:,.0f} rows/sec)')
+
+            # bulk_create skips the save signals that keep the summaries and watermarks current
+            if months:
+                refresh_summaries(months)
+            if imported:
+                touch_watermarks(model)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} rows in {elapsed:.2f}s ({imported / max(elapsed, 1e-9):,.0f} rows/sec)'
+        ))
+
+    def read_rows(self, handle, file_format):
+        """Yield (line number, row dict) pairs."""
+        if file_format == 'jsonl':
+            for number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as exc:
+                    raise CommandError(f'line {number}: {exc}') from exc
+                if not isinstance(row, dict):
+                    raise CommandError(f'line {number}: not a JSON object')
+                yield number, row
+        else:
+            yield from enumerate(csv.DictReader(handle), start=2)
+
+    def clean_batch(self, form_class, defaults, batch, unique_field):
+        """Validate a batch through the form; any invalid row aborts the import."""
+        objects = {}
+        errors = []
+        for number, row in batch:
+            form = form_class(data={**defaults, **row})
+            if not form.is_valid():
+                errors.append(f'line {number}: {form.errors.as_text()}')
+                continue
+            obj = form.instance
+            # Later rows for the same key replace earlier ones
+            objects[getattr(obj, unique_field) if unique_field else number] = obj
+
+        if errors:
+            raise CommandError('Invalid rows, nothing was imported:\n' + '\n'.join(errors[:20]))
+        return list(objects.values())
+
+    def write_batch(self, model, objects, unique_field):
+        if unique_field is None:
+            model.objects.bulk_create(objects)
+            return
+
+        update_fields = [field.name for field in model._meta.concrete_fields
+                         if not field.primary_key and field.name != unique_field]
+        upsert(model, objects, unique_fields=[unique_field], update_fields=update_fields)
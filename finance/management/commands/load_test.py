@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Environment of the worker process serving each interface
+INTERFACES = {
+    'wsgi': {'ASYNC_VIEWS': 'False'},
+    'asgi': {'ASYNC_VIEWS': 'True'},
+}
+
+
+def wsgi_load(paths, concurrency, seconds, cookies):
+    """Request ``paths`` in turn from ``concurrency`` threads, like one threaded WSGI worker."""
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    timings, statuses = [], set()
+    deadline = time.monotonic() + seconds
+
+    def client(offset):
+        index = offset
+        while (start := time.monotonic()) < deadline:
+            environ = {'PATH_INFO': paths[index % len(paths)], 'HTTP_HOST': 'localhost',
+                       'HTTP_COOKIE': cookies, 'wsgi.input': BytesIO()}
+            setup_testing_defaults(environ)
+            response = handler(environ, lambda status, headers: statuses.add(int(status[:3])))
+            b''.join(response)
+            response.close()
+            timings.append((time.monotonic() - start) * 1000)
+            index += 1
+
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return timings, statuses
+
+
+async def asgi_load(paths, concurrency, seconds, cookies):
+    """Request ``paths`` in turn from ``concurrency`` tasks, like one ASGI worker's event loop."""
+    from django.core.handlers.asgi import ASGIHandler
+
+    handler = ASGIHandler()
+    timings, statuses = [], set()
+    deadline = time.monotonic() + seconds
+
+    async def request(path):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': b'', 'root_path': '', 'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+            'headers': [(b'host', b'localhost'), (b'cookie', cookies.encode())],
+        }
+        received = False
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # The client never disconnects; Django cancels this once it has responded
+            await asyncio.Future()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.add(message['status'])
+
+        await handler(scope, receive, send)
+
+    async def client(offset):
+        index = offset
+        while (start := time.monotonic()) < deadline:
+            await request(paths[index % len(paths)])
+            timings.append((time.monotonic() - start) * 1000)
+            index += 1
+
+    await asyncio.gather(*(client(offset) for offset in range(concurrency)))
+    return timings, statuses
+
+
+class Command(BaseCommand):
+    help = ('Load test the read views on one worker process served over WSGI (sync views '
+            'on threads) and over ASGI (async views on an event loop) at the same concurrency')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['/finance/', '/finance/balance/',
+                                                         '/finance/reports/'],
+                            help='Pages to request in turn (default: %(default)s)')
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Requests in flight at once (default: %(default)s)')
+        parser.add_argument('--seconds', type=float, default=5,
+                            help='How long each interface is loaded (default: %(default)s)')
+        # Used by the worker processes
+        parser.add_argument('--run', choices=INTERFACES, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1')
+        if options['run']:
+            self.stdout.write(json.dumps(self.load(options['run'], options)))
+            return
+
+        self.stdout.write(f"{options['concurrency']} concurrent requests to "
+                          f"{', '.join(options['paths'])} for {options['seconds']:g}s:")
+        self.stdout.write(f"  {'':6}{'req/s':>8}{'p50':>10}{'p95':>10}")
+        for interface in INTERFACES:
+            result = self.worker(interface, options)
+            timings = result['timings']
+            if len(timings) < 2:
+                raise CommandError(f'Only {len(timings)} requests completed over {interface}')
+            p50, p95 = (statistics.quantiles(timings, n=20)[index] for index in (9, 18))
+            self.stdout.write(f"  {interface:6}{len(timings) / options['seconds']:>8.1f}"
+                              f"{p50:>7.1f} ms{p95:>7.1f} ms  (HTTP "
+                              f"{', '.join(map(str, result['statuses']))})")
+
+    def load(self, interface, options):
+        from finance.benchmarks import cookie_login
+
+        with cookie_login() as cookies:
+            arguments = (options['paths'], options['concurrency'], options['seconds'], cookies)
+            if interface == 'asgi':
+                timings, statuses = asyncio.run(asgi_load(*arguments))
+            else:
+                timings, statuses = wsgi_load(*arguments)
+        return {'timings': timings, 'statuses': sorted(statuses)}
+
+    def worker(self, interface, options):
+        command = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'), 'load_test',
+                   *options['paths'], '--run', interface,
+                   f"--concurrency={options['concurrency']}", f"--seconds={options['seconds']}"]
+        completed = subprocess.run(command, capture_output=True, text=True,
+                                   env={**os.environ, **INTERFACES[interface]})
+        if completed.returncode:
+            raise CommandError(f'Worker process failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.splitlines()[-1])
@@ -1,179 +1,263 @@
-from django.core.management.base import BaseCommand
-from finance.models import MonthBal, MonthInc, TaxReturn
-from decimal import Decimal
+import math
+import random
+import time
 from datetime import date
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from finance.models import (MonthBal, MonthInc, MonthlySummary, TaxReturn, BALANCE_ROLLUPS,
+                            INCOME_ROLLUPS)
+from finance.signals import summaries_suspended
+from finance.summaries import refresh_summaries
+
+
+CENT = Decimal('0.01')
+
+# Pull each walk back towards its trend by this share of the gap every month
+REVERSION = 0.2
+# No amount walks past this multiple of its opening value, nor past this
+# absolute ceiling, so long histories stay plausible
+GROWTH_LIMIT = 100
+CEILING = 10_000_000
+
+# Opening balance of every account
+BALANCE_START = {
+    'huntington_check': 3000, 'fifththird_check': 1500,
+    'huntington_save': 4500, 'fifththird_save': 3000, 'capone_save': 7500, 'amex_save': 4500,
+    'robinhood_invest': 12000, 'deacon_invest': 7500, 'buckeye_invest': 4500,
+    'opers_retire': 22500, 'four57_retire': 15000, 'four01_retire': 18000, 'roth_retire': 12000,
+    'main_home': 350000, 'justin_car': 25000, 'kat_car': 20000,
+    'capone_credit': 1500, 'amex_credit': 2000, 'discover_credit': 500,
+    'car_loan': 15000, 'pubstudent_loan': 10000, 'privstudent_loan': 5000,
+    'main_mortgage': 280000,
+}
+
+# Opening monthly amount of every income and expense line
+INCOME_START = {
+    'huntington_interest': 5.25, 'fifththird_interest': 3.10, 'capone_interest': 45,
+    'amex_interest': 35, 'schwab_interest': 12.50, 'schwab_dividends': 150,
+    'expense_checks': 50, 'miscellaneous_income': 75, 'refund_rebate_repayment': 40,
+    'gift_income': 60, 'supremecourt_salary': 4500, 'cdm_salary': 5500,
+    'opers_retirement': 450, 'four57b_retirement': 400, 'four01k_retirement': 500,
+    'roth_retirement': 250, 'robinhood_investments': 200, 'schwab_investments': 300,
+    'amex_savings': 200, 'fifththird_savings': 100, 'capone_savings': 150, 'five29_college': 100,
+    'huntington_savings': 100, 'federal_tax': 1200, 'social_security': 620, 'medicare': 145,
+    'ohio_tax': 350, 'columbus_tax': 200, 'health_insurance': 450,
+    'supplementallife_insurance': 25, 'flex_spending': 100, 'cdm_std': 15,
+    'cdmsupplemental_ltd': 12, 'parking': 60, 'parking_admin': 5, 'main_mortgage': 1850,
+    'hoa_fees': 150, 'auto_insurance': 180, 'aep_electric': 120, 'rumpke_trash': 35,
+    'delaware_sewer': 45, 'delco_water': 55, 'suburban_gas': 85, 'verizon_kat': 85,
+    'sprint_justin': 75, 'directtv_cable': 120, 'timewarner_internet': 70,
+    'caponeauto_loan': 350, 'public_loan': 150, 'private_loan': 120, 'capone_creditcard': 500,
+    'amex_creditcard': 750, 'discover_creditcard': 200,
+    'kohls_vicsec_macy_eddiebauer_creditcards': 60, 'katwork_creditcard': 90,
+    'cashorcheck_purchases': 300, 'daycare': 900, 'taxdeductible_giving': 150,
+}
+
+# Monthly (drift, volatility) of the log amount, by the rollup a field belongs to
+WALKS = {
+    'total_check': (0.002, 0.10),
+    'total_save': (0.004, 0.03),
+    'total_invest': (0.007, 0.05),
+    'total_retire': (0.007, 0.04),
+    'total_property': (0.003, 0.01),
+    'total_credit': (0.0, 0.30),
+    'total_loan': (-0.006, 0.002),
+    'total_interest': (0.001, 0.15),
+    'total_income': (0.004, 0.10),
+    'total_other_income': (0.0, 0.50),
+    'total_salary': (0.0025, 0.01),
+    'total_retirement_contributions': (0.002, 0.05),
+    'total_investment_contributions': (0.002, 0.05),
+    'total_savings_contributions': (0.002, 0.05),
+    'total_taxes': (0.0025, 0.02),
+    'total_utilities': (0.002, 0.12),
+    'total_loans': (0.0, 0.02),
+    'total_personal_creditcards': (0.002, 0.30),
+    'total_housing': (0.001, 0.005),
+    'total_benefits': (0.002, 0.02),
+    'total_expenses': (0.002, 0.20),
+}
+
+# Cars lose value rather than following the other property
+FIELD_WALKS = {
+    'justin_car': (-0.012, 0.005),
+    'kat_car': (-0.012, 0.005),
+}
+
+# Income fields summed per year to fill in the tax returns
+TAX_FIELDS = [
+    'supremecourt_salary', 'cdm_salary', 'opers_retirement', 'four57b_retirement',
+    'four01k_retirement', 'flex_spending', 'huntington_interest', 'fifththird_interest',
+    'capone_interest', 'amex_interest', 'schwab_interest', 'schwab_dividends',
+    'taxdeductible_giving', 'ohio_tax', 'columbus_tax', 'main_mortgage', 'federal_tax',
+]
+
+
+def field_walks(rollups):
+    """Map each model field to the (drift, volatility) of its rollup."""
+    walks = {}
+    for name, terms in rollups.items():
+        for term in terms:
+            term = term.lstrip('-')
+            if term not in rollups:
+                walks[term] = FIELD_WALKS.get(term, WALKS[name])
+    return walks
+
+
+def random_walk(rng, start, drift, volatility):
+    """
+    Yield amounts for successive months. The log of the amount wanders around a
+    trend that moves by ``drift`` each month, and is capped so that very long
+    runs stay in range.
+    """
+    trend = level = math.log(start)
+    limit = math.log(min(start * GROWTH_LIMIT, CEILING))
+    while True:
+        yield Decimal(math.exp(level)).quantize(CENT)
+        trend = min(trend + drift, limit)
+        level = min(level + REVERSION * (trend - level) + rng.gauss(0, volatility), limit)
+
+
+def add_months(day, months):
+    year, month = divmod(day.month - 1 + months, 12)
+    return date(day.year + year, month + 1, 1)
 
 
 class Command(BaseCommand):
-    help = 'Load test data for Finance app'
+    help = 'Replace the Finance data with a reproducible synthetic history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=24,
+                            help='Months of balances and income to create (default: 24)')
+        parser.add_argument('--start', default='2023-01',
+                            help='First month, as YYYY-MM (default: 2023-01)')
+        parser.add_argument('--seed', type=int, default=1,
+                            help='Random seed; the same seed gives the same data (default: 1)')
+        parser.add_argument('--users', type=int, default=0,
+                            help='Also create this many login users, loadtest1, loadtest2, ...')
+        parser.add_argument('--password', default='password',
+                            help='Password for the created users (default: password)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows per INSERT (default: 1000)')
 
     def handle(self, *args, **options):
-        self.stdout.write('Loading test data...')
-
-        # Clear existing data
-        MonthBal.objects.all().delete()
-        MonthInc.objects.all().delete()
-        TaxReturn.objects.all().delete()
-
-        # Create MonthBal records for 2023 and 2024
-        balance_data = [
-            # 2023
-            {'date': date(2023, 1, 1), 'base_networth': 150000},
-            {'date': date(2023, 2, 1), 'base_networth': 152000},
-            {'date': date(2023, 3, 1), 'base_networth': 155000},
-            {'date': date(2023, 4, 1), 'base_networth': 158000},
-            {'date': date(2023, 5, 1), 'base_networth': 160000},
-            {'date': date(2023, 6, 1), 'base_networth': 163000},
-            {'date': date(2023, 7, 1), 'base_networth': 165000},
-            {'date': date(2023, 8, 1), 'base_networth': 168000},
-            {'date': date(2023, 9, 1), 'base_networth': 170000},
-            {'date': date(2023, 10, 1), 'base_networth': 173000},
-            {'date': date(2023, 11, 1), 'base_networth': 175000},
-            {'date': date(2023, 12, 1), 'base_networth': 178000},
-            # 2024
-            {'date': date(2024, 1, 1), 'base_networth': 180000},
-            {'date': date(2024, 2, 1), 'base_networth': 183000},
-            {'date': date(2024, 3, 1), 'base_networth': 186000},
-            {'date': date(2024, 4, 1), 'base_networth': 189000},
-            {'date': date(2024, 5, 1), 'base_networth': 192000},
-            {'date': date(2024, 6, 1), 'base_networth': 195000},
-            {'date': date(2024, 7, 1), 'base_networth': 198000},
-            {'date': date(2024, 8, 1), 'base_networth': 201000},
-            {'date': date(2024, 9, 1), 'base_networth': 204000},
-            {'date': date(2024, 10, 1), 'base_networth': 207000},
-            {'date': date(2024, 11, 1), 'base_networth': 210000},
-            {'date': date(2024, 12, 1), 'base_networth': 213000},
-        ]
-
-        for data in balance_data:
-            base = data['base_networth']
-            MonthBal.objects.create(
-                date=data['date'],
-                huntington_check=Decimal(base * 0.02),
-                fifththird_check=Decimal(base * 0.01),
-                huntington_save=Decimal(base * 0.03),
-                fifththird_save=Decimal(base * 0.02),
-                capone_save=Decimal(base * 0.05),
-                amex_save=Decimal(base * 0.03),
-                robinhood_invest=Decimal(base * 0.08),
-                deacon_invest=Decimal(base * 0.05),
-                buckeye_invest=Decimal(base * 0.03),
-                opers_retire=Decimal(base * 0.15),
-                four57_retire=Decimal(base * 0.10),
-                four01_retire=Decimal(base * 0.12),
-                roth_retire=Decimal(base * 0.08),
-                main_home=Decimal(350000),
-                justin_car=Decimal(25000),
-                kat_car=Decimal(20000),
-                capone_credit=Decimal(1500),
-                amex_credit=Decimal(2000),
-                discover_credit=Decimal(500),
-                car_loan=Decimal(15000),
-                pubstudent_loan=Decimal(10000),
-                privstudent_loan=Decimal(5000),
-                main_mortgage=Decimal(280000),
-            )
+        months = options['months']
+        batch_size = options['batch_size']
+        if months < 1 or batch_size < 1:
+            raise CommandError('--months and --batch-size must be at least 1')
+        try:
+            start = date.fromisoformat(options['start'] + '-01')
+            end = add_months(start, months - 1)
+        except ValueError:
+            raise CommandError(f"Can't create {months} months from {options['start']}; "
+                               'dates must be YYYY-MM and end by 9999-12')
 
-        self.stdout.write(f'Created {len(balance_data)} MonthBal records')
-
-        # Create MonthInc records
-        income_data = [
-            # 2023
-            {'date': date(2023, 1, 1)},
-            {'date': date(2023, 2, 1)},
-            {'date': date(2023, 3, 1)},
-            {'date': date(2023, 4, 1)},
-            {'date': date(2023, 5, 1)},
-            {'date': date(2023, 6, 1)},
-            {'date': date(2023, 7, 1)},
-            {'date': date(2023, 8, 1)},
-            {'date': date(2023, 9, 1)},
-            {'date': date(2023, 10, 1)},
-            {'date': date(2023, 11, 1)},
-            {'date': date(2023, 12, 1)},
-            # 2024
-            {'date': date(2024, 1, 1)},
-            {'date': date(2024, 2, 1)},
-            {'date': date(2024, 3, 1)},
-            {'date': date(2024, 4, 1)},
-            {'date': date(2024, 5, 1)},
-            {'date': date(2024, 6, 1)},
-            {'date': date(2024, 7, 1)},
-            {'date': date(2024, 8, 1)},
-            {'date': date(2024, 9, 1)},
-            {'date': date(2024, 10, 1)},
-            {'date': date(2024, 11, 1)},
-            {'date': date(2024, 12, 1)},
-        ]
-
-        for data in income_data:
-            MonthInc.objects.create(
-                date=data['date'],
-                huntington_interest=Decimal('5.25'),
-                fifththird_interest=Decimal('3.10'),
-                capone_interest=Decimal('45.00'),
-                amex_interest=Decimal('35.00'),
-                schwab_interest=Decimal('12.50'),
-                schwab_dividends=Decimal('150.00'),
-                supremecourt_salary=Decimal('4500.00'),
-                cdm_salary=Decimal('5500.00'),
-                opers_retirement=Decimal('450.00'),
-                four57b_retirement=Decimal('400.00'),
-                four01k_retirement=Decimal('500.00'),
-                roth_retirement=Decimal('250.00'),
-                robinhood_investments=Decimal('200.00'),
-                schwab_investments=Decimal('300.00'),
-                amex_savings=Decimal('200.00'),
-                fifththird_savings=Decimal('100.00'),
-                capone_savings=Decimal('150.00'),
-                huntington_savings=Decimal('100.00'),
-                federal_tax=Decimal('1200.00'),
-                social_security=Decimal('620.00'),
-                medicare=Decimal('145.00'),
-                ohio_tax=Decimal('350.00'),
-                columbus_tax=Decimal('200.00'),
-                health_insurance=Decimal('450.00'),
-                supplementallife_insurance=Decimal('25.00'),
-                flex_spending=Decimal('100.00'),
-                main_mortgage=Decimal('1850.00'),
-                hoa_fees=Decimal('150.00'),
-                auto_insurance=Decimal('180.00'),
-                aep_electric=Decimal('120.00'),
-                rumpke_trash=Decimal('35.00'),
-                delaware_sewer=Decimal('45.00'),
-                delco_water=Decimal('55.00'),
-                suburban_gas=Decimal('85.00'),
-                verizon_kat=Decimal('85.00'),
-                sprint_justin=Decimal('75.00'),
-                directtv_cable=Decimal('120.00'),
-                timewarner_internet=Decimal('70.00'),
-                capone_creditcard=Decimal('500.00'),
-                amex_creditcard=Decimal('750.00'),
-                discover_creditcard=Decimal('200.00'),
-                cashorcheck_purchases=Decimal('300.00'),
-            )
+        self.stdout.write(f'Loading {months} months of test data from {start:%B %Y} '
+                          f"(seed {options['seed']})...")
+        started = time.perf_counter()
+        rng = random.Random(options['seed'])
+
+        with summaries_suspended(), transaction.atomic():
+            # Clear existing data; the summaries are rebuilt at the end
+            MonthlySummary.objects.all().delete()
+            MonthBal.objects.all().delete()
+            MonthInc.objects.all().delete()
+            TaxReturn.objects.all().delete()
+
+            balances = self.generate(rng, MonthBal, BALANCE_START, BALANCE_ROLLUPS, start,
+                                     months)
+            self.insert(MonthBal, balances, batch_size)
+
+            yearly = {}
+            incomes = self.generate(rng, MonthInc, INCOME_START, INCOME_ROLLUPS, start, months)
+            self.insert(MonthInc, self.tally(incomes, yearly), batch_size)
+            self.insert(TaxReturn, self.tax_returns(rng, yearly), batch_size)
 
-        self.stdout.write(f'Created {len(income_data)} MonthInc records')
+            summaries = refresh_summaries()
 
-        # Create TaxReturn records
-        tax_years = [2021, 2022, 2023]
+        self.stdout.write(f'Rebuilt {summaries} monthly summaries')
+        if options['users']:
+            self.create_users(options['users'], options['password'])
 
-        for year in tax_years:
-            TaxReturn.objects.create(
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Test data through {end:%B %Y} loaded in {elapsed:.2f}s'))
+
+    def generate(self, rng, model, starts, rollups, start, months):
+        """Yield one unsaved record per month, every field following its own walk."""
+        walks = {field: random_walk(rng, starts[field], *walk)
+                 for field, walk in field_walks(rollups).items()}
+        for offset in range(months):
+            yield model(date=add_months(start, offset),
+                        **{field: next(walk) for field, walk in walks.items()})
+
+    def tally(self, incomes, yearly):
+        """Pass records through, adding each month's amounts into its year's totals."""
+        for income in incomes:
+            totals = yearly.setdefault(income.date.year, {'months': 0})
+            totals['months'] += 1
+            for field in TAX_FIELDS:
+                totals[field] = totals.get(field, 0) + getattr(income, field)
+            yield income
+
+    def tax_returns(self, rng, yearly):
+        """Yield a return for every complete year, worked out from that year's income."""
+        for year, totals in yearly.items():
+            if totals['months'] < 12:
+                continue
+
+            def total(*fields):
+                return sum(totals[field] for field in fields)
+
+            wages = total('supremecourt_salary', 'cdm_salary')
+            federal_wages = wages - total('opers_retirement', 'four57b_retirement',
+                                          'four01k_retirement', 'flex_spending')
+            income = federal_wages + total('huntington_interest', 'fifththird_interest',
+                                           'capone_interest', 'amex_interest',
+                                           'schwab_interest', 'schwab_dividends')
+            deductions = total('taxdeductible_giving', 'ohio_tax', 'columbus_tax') + (
+                total('main_mortgage') * Decimal('0.3')).quantize(CENT)
+            federal_paid = total('federal_tax')
+            state_paid = total('ohio_tax')
+
+            yield TaxReturn(
                 year=date(year, 1, 1),
-                total_job_wages=Decimal('120000.00'),
-                total_federal_wages=Decimal('115000.00'),
-                total_income=Decimal('125000.00'),
-                adjusted_gross_income=Decimal('110000.00'),
-                itemized_deduction_total=Decimal('25000.00'),
-                federal_taxable_income=Decimal('85000.00'),
-                total_federal_tax_owed=Decimal('14000.00'),
-                total_federal_payments=Decimal('15500.00'),
-                state_taxable_income=Decimal('105000.00'),
-                total_state_tax_owed=Decimal('4200.00'),
-                total_state_payments=Decimal('4500.00'),
+                total_job_wages=wages,
+                total_federal_wages=federal_wages,
+                total_income=income,
+                adjusted_gross_income=income,
+                itemized_deduction_total=deductions,
+                federal_taxable_income=max(income - deductions, Decimal('0.00')),
+                total_federal_tax_owed=self.vary(rng, federal_paid),
+                total_federal_payments=federal_paid,
+                state_taxable_income=income,
+                total_state_tax_owed=self.vary(rng, state_paid),
+                total_state_payments=state_paid,
             )
 
-        self.stdout.write(f'Created {len(tax_years)} TaxReturn records')
+    def vary(self, rng, amount):
+        """Owe within 10% either side of what was withheld."""
+        return (amount * Decimal(rng.uniform(0.9, 1.1))).quantize(CENT)
+
+    def insert(self, model, objects, batch_size):
+        created = 0
+        while batch := list(islice(objects, batch_size)):
+            model.objects.bulk_create(batch)
+            created += len(batch)
+        self.stdout.write(f'Created {created} {model.__name__} records')
 
-        self.stdout.write(self.style.SUCCESS('Test data loaded successfully!'))
+    def create_users(self, count, password):
+        """Create loadtest1..N, skipping any that already exist."""
+        User = get_user_model()
+        password = make_password(password)  # Hashing once keeps large counts fast
+        User.objects.bulk_create(
+            [User(username=f'loadtest{number}', password=password)
+             for number in range(1, count + 1)],
+            ignore_conflicts=True,
+        )
+        self.stdout.write(f'Created users loadtest1 to loadtest{count}')
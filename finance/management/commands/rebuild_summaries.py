@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from finance.summaries import refresh_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the MonthlySummary table from MonthBal and MonthInc'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding monthly summaries...')
+
+        count = refresh_summaries()
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} MonthlySummary records'))
@@ -0,0 +1,94 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from config.warmup import reset_template_caches, warm_templates, warm_urlconf
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def first_request(path, warm=True):
+    """
+    Time the first two requests to ``path`` in this process, warming it first
+    if ``warm``. Logs in as the first active (super)user using cookie
+    sessions, so nothing is written to the database.
+    """
+    from django.contrib.auth import get_user_model, user_logged_in
+    from django.contrib.auth.models import update_last_login
+    from django.test import Client, override_settings
+
+    result = {'warmup_ms': 0.0}
+    if warm:
+        urlconf_ms = warm_urlconf()
+        timings, _ = warm_templates()
+        result['warmup_ms'] = round(urlconf_ms + sum(timings.values()), 1)
+
+    user_logged_in.disconnect(update_last_login, dispatch_uid='update_last_login')
+    with override_settings(ALLOWED_HOSTS=['localhost'],
+                           SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'):
+        client = Client(HTTP_HOST='localhost')
+        # A WSGI worker loads its middleware at startup, before any request
+        client.handler.load_middleware()
+        user = get_user_model().objects.filter(is_active=True).order_by(
+            '-is_superuser', 'pk').first()
+        if user:
+            client.force_login(user)
+        for key in ('first_request_ms', 'second_request_ms'):
+            start = time.perf_counter()
+            response = client.get(path)
+            result[key] = round((time.perf_counter() - start) * 1000, 1)
+    result['status'] = response.status_code
+    return result
+
+
+class Command(BaseCommand):
+    help = ('Compile every project and form widget template into the cached loaders and '
+            'report how long each took')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--report', metavar='PATH',
+                            help='Also time the first request to PATH on fresh worker '
+                                 'processes, with and without the warmup')
+        # Used by --report in its worker processes
+        parser.add_argument('--first-request', metavar='PATH', help=argparse.SUPPRESS)
+        parser.add_argument('--cold', action='store_true', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['first_request']:
+            self.stdout.write(json.dumps(first_request(options['first_request'],
+                                                       warm=not options['cold'])))
+            return
+
+        reset_template_caches()
+        timings, errors = warm_templates()
+        self.stdout.write(f'Compiled {len(timings)} templates in '
+                          f'{sum(timings.values()):.1f} ms; slowest:')
+        for name, elapsed in sorted(timings.items(), key=lambda item: -item[1])[:5]:
+            self.stdout.write(f'  {elapsed:7.1f} ms  {name}')
+
+        if options['report']:
+            self.report(options['report'])
+        if errors:
+            raise CommandError('Templates failed to compile:\n' + '\n'.join(
+                f'  {name}: {error}' for name, error in errors.items()))
+
+    def report(self, path):
+        self.stdout.write(f'\nFirst requests to {path} on a fresh worker:')
+        self.stdout.write(f"  {'':8}{'warmup':>10}{'1st request':>14}{'2nd request':>14}")
+        for label, cold in (('cold', True), ('warmed', False)):
+            result = self.fresh_worker(path, cold)
+            self.stdout.write(f"  {label:8}{result['warmup_ms']:>7.1f} ms"
+                              f"{result['first_request_ms']:>11.1f} ms"
+                              f"{result['second_request_ms']:>11.1f} ms"
+                              f"  (HTTP {result['status']})")
+
+    def fresh_worker(self, path, cold):
+        command = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'), 'warm_templates',
+                   '--first-request', path, *(['--cold'] if cold else [])]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(f'Worker process failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.splitlines()[-1])
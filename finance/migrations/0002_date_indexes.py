@@ -0,0 +1,59 @@
+# Generated by Django 6.0.9 on 2026-10-18 08:12
+
+from django.core.management.base import CommandError
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_unique_dates(apps, schema_editor):
+    """
+    Stop with the dates that are used more than once, which the unique
+    constraints below would otherwise reject with a bare IntegrityError.
+    """
+    duplicates = []
+    for model_name, field in (('MonthBal', 'date'), ('MonthInc', 'date'), ('TaxReturn', 'year')):
+        model = apps.get_model('finance', model_name)
+        dates = (model.objects.values(field).annotate(count=Count('pk'))
+                 .filter(count__gt=1).order_by(field).values_list(field, flat=True))
+        duplicates += [f'{model._meta.verbose_name} {day:%Y-%m-%d}' for day in dates]
+    if duplicates:
+        raise CommandError('These dates have more than one record; merge or delete the '
+                           'extra records and migrate again: ' + ', '.join(duplicates))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_unique_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="taxreturn",
+            name="year",
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name="metricconstants",
+            index=models.Index(fields=["date"], name="finance_metric_date_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="monthbal",
+            constraint=models.UniqueConstraint(
+                fields=("date",), name="finance_monthbal_unique_date"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="monthinc",
+            constraint=models.UniqueConstraint(
+                fields=("date",), name="finance_monthinc_unique_date"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="taxreturn",
+            constraint=models.UniqueConstraint(
+                fields=("year",), name="finance_taxreturn_unique_year"
+            ),
+        ),
+    ]
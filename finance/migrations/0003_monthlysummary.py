@@ -0,0 +1,292 @@
+# Generated by Django 6.0.9 on 2026-10-18 08:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# The rollups as they were when this migration was written, so later changes
+# to finance.registry don't change what it does. A leading '-' subtracts.
+BALANCE_ROLLUPS = {
+    'total_check': ['huntington_check', 'fifththird_check'],
+    'total_save': ['huntington_save', 'fifththird_save', 'capone_save', 'amex_save'],
+    'total_invest': ['robinhood_invest', 'deacon_invest', 'buckeye_invest'],
+    'total_retire': ['opers_retire', 'four57_retire', 'four01_retire', 'roth_retire'],
+    'total_property': ['main_home', 'justin_car', 'kat_car'],
+    'total_assets': ['total_check', 'total_save', 'total_invest', 'total_retire',
+                     'total_property'],
+    'total_credit': ['capone_credit', 'amex_credit', 'discover_credit'],
+    'total_loan': ['car_loan', 'pubstudent_loan', 'privstudent_loan', 'main_mortgage'],
+    'total_liabilities': ['total_credit', 'total_loan'],
+    'networth': ['total_assets', '-total_liabilities'],
+}
+INCOME_ROLLUPS = {
+    'total_interest': ['huntington_interest', 'fifththird_interest', 'capone_interest',
+                       'amex_interest', 'schwab_interest'],
+    'total_salary': ['supremecourt_salary', 'cdm_salary'],
+    'total_other_income': ['expense_checks', 'miscellaneous_income',
+                           'refund_rebate_repayment', 'gift_income'],
+    'total_income': ['total_interest', 'schwab_dividends', 'total_other_income',
+                     'total_salary'],
+    'total_retirement_contributions': ['opers_retirement', 'four57b_retirement',
+                                       'four01k_retirement', 'roth_retirement'],
+    'total_investment_contributions': ['robinhood_investments', 'schwab_investments'],
+    'total_savings_contributions': ['amex_savings', 'fifththird_savings', 'capone_savings',
+                                    'five29_college', 'huntington_savings'],
+    'total_allsavings': ['total_retirement_contributions', 'total_investment_contributions',
+                         'total_savings_contributions'],
+    'total_taxes': ['federal_tax', 'social_security', 'medicare', 'ohio_tax', 'columbus_tax'],
+    'total_utilities': ['aep_electric', 'rumpke_trash', 'delaware_sewer', 'delco_water',
+                        'suburban_gas', 'verizon_kat', 'sprint_justin', 'directtv_cable',
+                        'timewarner_internet'],
+    'total_loans': ['caponeauto_loan', 'public_loan', 'private_loan'],
+    'total_personal_creditcards': ['capone_creditcard', 'amex_creditcard',
+                                   'discover_creditcard',
+                                   'kohls_vicsec_macy_eddiebauer_creditcards',
+                                   'katwork_creditcard'],
+    'total_housing': ['main_mortgage', 'hoa_fees'],
+    'total_benefits': ['health_insurance', 'supplementallife_insurance', 'flex_spending',
+                       'cdm_std', 'cdmsupplemental_ltd', 'parking', 'parking_admin'],
+    'total_expenses': ['total_taxes', 'total_utilities', 'total_loans',
+                       'total_personal_creditcards', 'total_housing', 'total_benefits',
+                       'auto_insurance', 'cashorcheck_purchases', 'daycare',
+                       'taxdeductible_giving'],
+    'total_surplus': ['total_income', '-total_expenses', '-total_allsavings'],
+}
+
+
+def rollup_total(rollups, name, record):
+    """The ``name`` rollup of ``record``, a dict of its (Decimal) amounts."""
+    total = 0
+    for term in rollups[name]:
+        field = term.lstrip('-')
+        amount = rollup_total(rollups, field, record) if field in rollups else record[field]
+        total = total - amount if term.startswith('-') else total + amount
+    return total
+
+
+def fill_summaries(apps, schema_editor):
+    """
+    Summarize the records already there, as rebuild_summaries does, using only
+    the historical models and the rollups above.
+    """
+    summaries = {}
+    for model_name, key, rollups in (('MonthBal', 'balance', BALANCE_ROLLUPS),
+                                     ('MonthInc', 'income', INCOME_ROLLUPS)):
+        model = apps.get_model('finance', model_name)
+        for record in model.objects.order_by('date').values():  # The month's latest wins
+            summary = summaries.setdefault(record['date'].replace(day=1), {})
+            summary[key + '_id'] = record['id']
+            summary.update({name: rollup_total(rollups, name, record) for name in rollups})
+
+    MonthlySummary = apps.get_model('finance', 'MonthlySummary')
+    MonthlySummary.objects.bulk_create(
+        [MonthlySummary(date=month, **values) for month, values in summaries.items()],
+        batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0002_date_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlySummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True)),
+                (
+                    "total_check",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_save",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_invest",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_retire",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_property",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_assets",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_credit",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_loan",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_liabilities",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "networth",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_interest",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_salary",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_other_income",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_income",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_retirement_contributions",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_investment_contributions",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_savings_contributions",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_allsavings",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_taxes",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_utilities",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_loans",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_personal_creditcards",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_housing",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_benefits",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_expenses",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "total_surplus",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "balance",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="summary",
+                        to="finance.monthbal",
+                    ),
+                ),
+                (
+                    "income",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="summary",
+                        to="finance.monthinc",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Monthly Summary",
+                "verbose_name_plural": "Monthly Summaries",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.9 on 2026-10-18 08:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_monthlysummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Watermark',
+            fields=[
+                ('model', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('changed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
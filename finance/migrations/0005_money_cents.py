@@ -0,0 +1,112 @@
+"""
+Store every amount as a whole number of cents in a BIGINT column
+(finance.money.MoneyField) instead of a DECIMAL(10, 2) or, for the
+summaries, DECIMAL(14, 2).
+
+The columns are first widened so the amounts still fit once multiplied by
+100, then each table is converted with one UPDATE, and finally the columns
+become BIGINT, which holds the now whole numbers exactly. Reversing runs the
+same steps backwards.
+"""
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Round
+
+import finance.money
+
+
+# Wide enough for the largest amount in cents, and for the BIGINT range
+WIDE_DIGITS = 20
+
+AMOUNTS = {
+    'monthbal': [
+        'huntington_check', 'fifththird_check', 'huntington_save', 'fifththird_save',
+        'capone_save', 'amex_save', 'robinhood_invest', 'deacon_invest', 'buckeye_invest',
+        'opers_retire', 'four57_retire', 'four01_retire', 'roth_retire', 'main_home',
+        'justin_car', 'kat_car', 'capone_credit', 'amex_credit', 'discover_credit',
+        'car_loan', 'pubstudent_loan', 'privstudent_loan', 'main_mortgage',
+    ],
+    'monthinc': [
+        'huntington_interest', 'fifththird_interest', 'capone_interest', 'amex_interest',
+        'schwab_interest', 'schwab_dividends', 'expense_checks', 'miscellaneous_income',
+        'refund_rebate_repayment', 'gift_income', 'supremecourt_salary', 'cdm_salary',
+        'opers_retirement', 'four57b_retirement', 'four01k_retirement', 'roth_retirement',
+        'robinhood_investments', 'schwab_investments', 'amex_savings', 'fifththird_savings',
+        'capone_savings', 'five29_college', 'huntington_savings', 'federal_tax',
+        'social_security', 'medicare', 'ohio_tax', 'columbus_tax', 'health_insurance',
+        'supplementallife_insurance', 'flex_spending', 'cdm_std', 'cdmsupplemental_ltd',
+        'parking', 'parking_admin', 'main_mortgage', 'hoa_fees', 'auto_insurance',
+        'aep_electric', 'rumpke_trash', 'delaware_sewer', 'delco_water', 'suburban_gas',
+        'verizon_kat', 'sprint_justin', 'directtv_cable', 'timewarner_internet',
+        'caponeauto_loan', 'public_loan', 'private_loan', 'capone_creditcard',
+        'amex_creditcard', 'discover_creditcard',
+        'kohls_vicsec_macy_eddiebauer_creditcards', 'katwork_creditcard',
+        'cashorcheck_purchases', 'daycare', 'taxdeductible_giving',
+    ],
+    'taxreturn': [
+        'total_job_wages', 'total_federal_wages', 'total_income', 'adjusted_gross_income',
+        'itemized_deduction_total', 'federal_taxable_income', 'total_federal_tax_owed',
+        'total_federal_payments', 'state_taxable_income', 'total_state_tax_owed',
+        'total_state_payments',
+    ],
+    'monthlysummary': [
+        'total_check', 'total_save', 'total_invest', 'total_retire', 'total_property',
+        'total_assets', 'total_credit', 'total_loan', 'total_liabilities', 'networth',
+        'total_interest', 'total_salary', 'total_other_income', 'total_income',
+        'total_retirement_contributions', 'total_investment_contributions',
+        'total_savings_contributions', 'total_allsavings', 'total_taxes', 'total_utilities',
+        'total_loans', 'total_personal_creditcards', 'total_housing', 'total_benefits',
+        'total_expenses', 'total_surplus',
+    ],
+}
+
+# The summary totals are optional; the amounts of the records default to zero
+OPTIONAL = {'monthlysummary'}
+
+
+def decimal_field(model_name, max_digits):
+    if model_name in OPTIONAL:
+        return models.DecimalField(max_digits=max_digits, decimal_places=2, null=True,
+                                   blank=True)
+    return models.DecimalField(max_digits=max_digits, decimal_places=2,
+                               default=Decimal('0.00'))
+
+
+def money_field(model_name):
+    if model_name in OPTIONAL:
+        return finance.money.MoneyField(null=True, blank=True)
+    return finance.money.MoneyField(default=0)
+
+
+def alter_amounts(field):
+    return [migrations.AlterField(model_name=model_name, name=name, field=field(model_name))
+            for model_name, names in AMOUNTS.items() for name in names]
+
+
+def to_cents(apps, schema_editor):
+    # Rounded, since SQLite keeps decimals as floating point
+    for model_name, names in AMOUNTS.items():
+        apps.get_model('finance', model_name).objects.update(
+            **{name: Round(F(name) * 100) for name in names})
+
+
+def to_dollars(apps, schema_editor):
+    # 100.0, since SQLite divides integers by an integer in whole numbers
+    for model_name, names in AMOUNTS.items():
+        apps.get_model('finance', model_name).objects.update(
+            **{name: Round(F(name) / 100.0, 2) for name in names})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_watermark'),
+    ]
+
+    operations = [
+        *alter_amounts(lambda model_name: decimal_field(model_name, WIDE_DIGITS)),
+        migrations.RunPython(to_cents, to_dollars),
+        *alter_amounts(money_field),
+    ]
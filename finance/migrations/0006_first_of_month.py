@@ -0,0 +1,42 @@
+"""
+Date every monthly balance and income record on the first of its month, as
+the models now save them, so the unique constraint on ``date`` allows one
+record a month. Months that already have more than one record stop the
+migration, before anything is changed, instead of being merged here.
+"""
+from django.core.management.base import CommandError
+from django.db import migrations
+
+
+def move_to_first_of_month(apps, schema_editor):
+    moves = {}
+    clashes = []
+    for model_name in ('MonthBal', 'MonthInc'):
+        model = apps.get_model('finance', model_name)
+        months = {}
+        for pk, day in model.objects.order_by('date').values_list('pk', 'date'):
+            months.setdefault(day.replace(day=1), []).append((pk, day))
+        for month, records in months.items():
+            if len(records) > 1:
+                days = ', '.join(f'{day:%Y-%m-%d}' for _, day in records)
+                clashes.append(f'{model._meta.verbose_name} {month:%Y-%m} ({days})')
+        moves[model] = [(pk, month) for month, records in months.items()
+                        for pk, day in records if day != month]
+    if clashes:
+        raise CommandError('These months have more than one record; merge or delete the '
+                           'extra records and migrate again: ' + '; '.join(clashes))
+
+    for model, records in moves.items():
+        for pk, month in records:
+            model.objects.filter(pk=pk).update(date=month)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0005_money_cents"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_to_first_of_month, migrations.RunPython.noop),
+    ]
@@ -1,318 +1,417 @@
-from django.db import models
+from django.db import connection, models
+from django.db.models import Avg, ExpressionWrapper, F
+from django.db.models.functions import Round
+from datetime import date
 from decimal import Decimal
+from functools import wraps
+
+from .money import Money, MoneyField
+from .registry import BALANCE, INCOME
+
+
+# Prefix for the annotations added by with_totals(), e.g. ``db_networth``
+TOTAL_PREFIX = 'db_'
+
+# Output field for database-side totals, so they come back as Money
+MONEY_TOTAL_FIELD = MoneyField()
+
+# Rollup definitions used to build the database-side totals, generated from
+# the field groups in finance.registry. Each rollup is a list of model fields
+# or other rollups; a leading '-' subtracts the term.
+BALANCE_ROLLUPS = BALANCE.rollups
+INCOME_ROLLUPS = INCOME.rollups
+
+
+def _balanced_sum(expressions):
+    """Add expressions as a balanced tree; SQLite rejects deeply nested parentheses."""
+    if len(expressions) == 1:
+        return expressions[0]
+    middle = len(expressions) // 2
+    return _balanced_sum(expressions[:middle]) + _balanced_sum(expressions[middle:])
+
+
+def rollup_expression(rollups, name):
+    """Build the F() expression for a rollup, expanded down to model fields."""
+    added, subtracted = [], []
+
+    def collect(term_name, sign):
+        for term in rollups[term_name]:
+            term_sign = -sign if term.startswith('-') else sign
+            term = term.lstrip('-')
+            if term in rollups:
+                collect(term, term_sign)
+            else:
+                (added if term_sign > 0 else subtracted).append(F(term))
+
+    collect(name, 1)
+    expression = _balanced_sum(added)
+    if subtracted:
+        expression = expression - _balanced_sum(subtracted)
+    # Sums of cents are exact on every backend, so there's nothing to round
+    return ExpressionWrapper(expression, output_field=MONEY_TOTAL_FIELD)
+
+
+def money_avg(expression):
+    """
+    Avg() of an amount, rounded to the cent by the database. An average of
+    cents is fractional, and an integer output would truncate it instead.
+    """
+    return Round(Avg(expression), output_field=MONEY_TOTAL_FIELD)
+
+
+def upsert(model, objs, unique_fields, update_fields, batch_size=None):
+    """
+    Insert ``objs``, updating ``update_fields`` of the rows that already have
+    their ``unique_fields``, in one bulk_create(). Works on historical models
+    too, for migrations.
+    """
+    return model.objects.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        update_fields=update_fields,
+        # MySQL upserts on any unique key and does not accept a conflict target
+        unique_fields=(unique_fields if connection.features.supports_update_conflicts_with_target
+                       else None),
+    )
+
+
+# Marks a total that with_totals() didn't annotate
+NOT_ANNOTATED = object()
+
+
+def annotated_total(method):
+    """
+    Use the value annotated by with_totals() when present, else compute it.
+    """
+    attname = TOTAL_PREFIX + method.__name__
+
+    @wraps(method)
+    def wrapper(self):
+        # get() rather than catching KeyError, which is slow to raise on every
+        # record loaded without the annotations
+        value = self.__dict__.get(attname, NOT_ANNOTATED)
+        if value is NOT_ANNOTATED:
+            return method(self)
+        return value
+    return wrapper
+
+
+def rollup_fields(rollups, name, subtract=False):
+    """The fields a rollup adds up, through the rollups it includes, with their signs."""
+    for term in rollups[name]:
+        term_subtracts = term.startswith('-') != subtract
+        term = term.lstrip('-')
+        if term in rollups:
+            yield from rollup_fields(rollups, term, term_subtracts)
+        else:
+            yield term, term_subtracts
+
+
+def rollup_method(rollups, name):
+    """The ``name``() method of a rollup, adding up its fields and other rollups."""
+    # Flattened to fields, so the sum is one pass over the cents that makes
+    # Money once, instead of Money arithmetic through every included rollup
+    fields = list(rollup_fields(rollups, name))
+    added = [field for field, subtract in fields if not subtract]
+    subtracted = [field for field, subtract in fields if subtract]
+
+    def method(self):
+        total = 0
+        for field in added:
+            total += getattr(self, field).cents
+        for field in subtracted:
+            total -= getattr(self, field).cents
+        return Money(total)
+
+    method.__name__ = method.__qualname__ = name
+    return annotated_total(method)
+
+
+def rollup_methods(rollups):
+    """
+    Class decorator adding a method for every rollup (total_check(),
+    networth(), ...), so the models total their records exactly as
+    with_totals() does from the same definitions.
+    """
+    def decorate(model):
+        for name in rollups:
+            setattr(model, name, rollup_method(rollups, name))
+        return model
+    return decorate
+
+
+def month_of(day):
+    """First day of the month of ``day``."""
+    return day.replace(day=1)
+
+
+def next_month(day):
+    """First day of the month after ``day``."""
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
+
+
+class MonthQuerySet(models.QuerySet):
+    """QuerySet for models holding one record per month in ``date``."""
+
+    def for_period(self, year=None, month=None):
+        """
+        Filter to a year and/or month using plain date ranges so the date index
+        is used. A month without a year still needs the (unindexed) extract.
+        """
+        if year and month:
+            start = date(year, month, 1)
+            return self.filter(date__gte=start, date__lt=next_month(start))
+        if year:
+            return self.filter(date__gte=date(year, 1, 1), date__lt=date(year + 1, 1, 1))
+        if month:
+            return self.filter(date__month=month)
+        return self
+
+    def rows(self, *fields):
+        """
+        Read-only rows of just ``fields``, as named tuples straight from
+        values_list(), for pages that only display records. Each row has the
+        fields' names, so templates read them like the model's attributes,
+        without building a model instance per row.
+        """
+        return self.values_list(*fields, named=True)
+
+
+class MonthRecord:
+    """
+    Mixin for the models holding one record per month: ``date`` is moved to
+    the first of its month when the record is cleaned or saved, so the unique
+    constraint on it allows a single record a month.
+    """
+
+    def clean(self):
+        super().clean()
+        # The date is left as it was given if it didn't validate
+        if isinstance(self.date, date):
+            self.date = month_of(self.date)
+
+    def save(self, *args, **kwargs):
+        if self.date is not None:
+            self.date = month_of(self._meta.get_field('date').to_python(self.date))
+        super().save(*args, **kwargs)
+
+
+class RollupQuerySet(MonthQuerySet):
+    """QuerySet that can have the database compute the model's rollup totals."""
+
+    rollups = {}
+
+    def with_totals(self, *names):
+        """Annotate each rollup (all of them by default) as ``db_<name>``."""
+        return self.annotate(**{
+            TOTAL_PREFIX + name: rollup_expression(self.rollups, name)
+            for name in (names or self.rollups)
+        })
+
+
+class MonthBalQuerySet(RollupQuerySet):
+    rollups = BALANCE_ROLLUPS
+
+
+class MonthIncQuerySet(RollupQuerySet):
+    rollups = INCOME_ROLLUPS
 
 
-class MonthBal(models.Model):
+@rollup_methods(BALANCE_ROLLUPS)
+class MonthBal(MonthRecord, models.Model):
     """Monthly balance sheet snapshot - tracks assets and liabilities."""
 
     date = models.DateField()
 
     # Checking accounts
-    huntington_check = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    fifththird_check = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    huntington_check = MoneyField(default=0)
+    fifththird_check = MoneyField(default=0)
 
     # Savings accounts
-    huntington_save = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    fifththird_save = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    capone_save = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    amex_save = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    huntington_save = MoneyField(default=0)
+    fifththird_save = MoneyField(default=0)
+    capone_save = MoneyField(default=0)
+    amex_save = MoneyField(default=0)
 
     # Investment accounts
-    robinhood_invest = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    deacon_invest = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    buckeye_invest = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    robinhood_invest = MoneyField(default=0)
+    deacon_invest = MoneyField(default=0)
+    buckeye_invest = MoneyField(default=0)
 
     # Retirement accounts
-    opers_retire = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    four57_retire = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    four01_retire = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    roth_retire = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    opers_retire = MoneyField(default=0)
+    four57_retire = MoneyField(default=0)
+    four01_retire = MoneyField(default=0)
+    roth_retire = MoneyField(default=0)
 
     # Property
-    main_home = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    justin_car = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    kat_car = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    main_home = MoneyField(default=0)
+    justin_car = MoneyField(default=0)
+    kat_car = MoneyField(default=0)
 
     # Credit cards (liabilities)
-    capone_credit = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    amex_credit = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    discover_credit = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    capone_credit = MoneyField(default=0)
+    amex_credit = MoneyField(default=0)
+    discover_credit = MoneyField(default=0)
 
     # Loans (liabilities)
-    car_loan = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    pubstudent_loan = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    privstudent_loan = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    main_mortgage = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    car_loan = MoneyField(default=0)
+    pubstudent_loan = MoneyField(default=0)
+    privstudent_loan = MoneyField(default=0)
+    main_mortgage = MoneyField(default=0)
+
+    objects = MonthBalQuerySet.as_manager()
 
     class Meta:
         ordering = ['-date']
         verbose_name = 'Monthly Balance'
         verbose_name_plural = 'Monthly Balances'
         db_table = 'Finance_monthbal'  # Match existing table name
+        constraints = [
+            # One snapshot per month; the unique index also serves date filters and ordering
+            models.UniqueConstraint(fields=['date'], name='finance_monthbal_unique_date'),
+        ]
 
     def __str__(self):
         return f"Balance {self.date.strftime('%B %Y')}"
 
-    # Asset calculations
-    def total_check(self):
-        return self.huntington_check + self.fifththird_check
-
-    def total_save(self):
-        return (self.huntington_save + self.fifththird_save +
-                self.capone_save + self.amex_save)
-
-    def total_invest(self):
-        return self.robinhood_invest + self.deacon_invest + self.buckeye_invest
-
-    def total_retire(self):
-        return (self.opers_retire + self.four57_retire +
-                self.four01_retire + self.roth_retire)
-
-    def total_property(self):
-        return self.main_home + self.justin_car + self.kat_car
-
-    def total_assets(self):
-        return (self.total_check() + self.total_save() +
-                self.total_invest() + self.total_retire() +
-                self.total_property())
-
-    # Liability calculations
-    def total_credit(self):
-        return self.capone_credit + self.amex_credit + self.discover_credit
-
-    def total_loan(self):
-        return (self.car_loan + self.pubstudent_loan +
-                self.privstudent_loan + self.main_mortgage)
-
-    def total_liabilities(self):
-        return self.total_credit() + self.total_loan()
-
-    def networth(self):
-        return self.total_assets() - self.total_liabilities()
 
-
-class MonthInc(models.Model):
+@rollup_methods(INCOME_ROLLUPS)
+class MonthInc(MonthRecord, models.Model):
     """Monthly income and expense tracking."""
 
     date = models.DateField()
 
     # Interest income
-    huntington_interest = models.DecimalField(max_digits=10, decimal_places=2,
-                                              default=Decimal('0.00'))
-    fifththird_interest = models.DecimalField(max_digits=10, decimal_places=2,
-                                              default=Decimal('0.00'))
-    capone_interest = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    amex_interest = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    schwab_interest = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    huntington_interest = MoneyField(default=0)
+    fifththird_interest = MoneyField(default=0)
+    capone_interest = MoneyField(default=0)
+    amex_interest = MoneyField(default=0)
+    schwab_interest = MoneyField(default=0)
 
     # Investment income
-    schwab_dividends = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    schwab_dividends = MoneyField(default=0)
 
     # Other income
-    expense_checks = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    miscellaneous_income = models.DecimalField(max_digits=10, decimal_places=2,
-                                               default=Decimal('0.00'))
-    refund_rebate_repayment = models.DecimalField(max_digits=10, decimal_places=2,
-                                                  default=Decimal('0.00'))
-    gift_income = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    expense_checks = MoneyField(default=0)
+    miscellaneous_income = MoneyField(default=0)
+    refund_rebate_repayment = MoneyField(default=0)
+    gift_income = MoneyField(default=0)
 
     # Salary income
-    supremecourt_salary = models.DecimalField(max_digits=10, decimal_places=2,
-                                              default=Decimal('0.00'))
-    cdm_salary = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    supremecourt_salary = MoneyField(default=0)
+    cdm_salary = MoneyField(default=0)
 
     # Retirement contributions
-    opers_retirement = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    four57b_retirement = models.DecimalField(max_digits=10, decimal_places=2,
-                                             default=Decimal('0.00'))
-    four01k_retirement = models.DecimalField(max_digits=10, decimal_places=2,
-                                             default=Decimal('0.00'))
-    roth_retirement = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    opers_retirement = MoneyField(default=0)
+    four57b_retirement = MoneyField(default=0)
+    four01k_retirement = MoneyField(default=0)
+    roth_retirement = MoneyField(default=0)
 
     # Investment contributions
-    robinhood_investments = models.DecimalField(max_digits=10, decimal_places=2,
-                                                default=Decimal('0.00'))
-    schwab_investments = models.DecimalField(max_digits=10, decimal_places=2,
-                                             default=Decimal('0.00'))
+    robinhood_investments = MoneyField(default=0)
+    schwab_investments = MoneyField(default=0)
 
     # Savings contributions
-    amex_savings = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    fifththird_savings = models.DecimalField(max_digits=10, decimal_places=2,
-                                             default=Decimal('0.00'))
-    capone_savings = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    five29_college = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    huntington_savings = models.DecimalField(max_digits=10, decimal_places=2,
-                                             default=Decimal('0.00'))
+    amex_savings = MoneyField(default=0)
+    fifththird_savings = MoneyField(default=0)
+    capone_savings = MoneyField(default=0)
+    five29_college = MoneyField(default=0)
+    huntington_savings = MoneyField(default=0)
 
     # Taxes
-    federal_tax = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    social_security = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    medicare = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    ohio_tax = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    columbus_tax = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    federal_tax = MoneyField(default=0)
+    social_security = MoneyField(default=0)
+    medicare = MoneyField(default=0)
+    ohio_tax = MoneyField(default=0)
+    columbus_tax = MoneyField(default=0)
 
     # Benefits/deductions
-    health_insurance = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    supplementallife_insurance = models.DecimalField(max_digits=10, decimal_places=2,
-                                                     default=Decimal('0.00'))
-    flex_spending = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    cdm_std = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    cdmsupplemental_ltd = models.DecimalField(max_digits=10, decimal_places=2,
-                                              default=Decimal('0.00'))
-    parking = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    parking_admin = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    health_insurance = MoneyField(default=0)
+    supplementallife_insurance = MoneyField(default=0)
+    flex_spending = MoneyField(default=0)
+    cdm_std = MoneyField(default=0)
+    cdmsupplemental_ltd = MoneyField(default=0)
+    parking = MoneyField(default=0)
+    parking_admin = MoneyField(default=0)
 
     # Housing expenses
-    main_mortgage = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    hoa_fees = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    main_mortgage = MoneyField(default=0)
+    hoa_fees = MoneyField(default=0)
 
     # Insurance
-    auto_insurance = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    auto_insurance = MoneyField(default=0)
 
     # Utilities
-    aep_electric = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    rumpke_trash = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    delaware_sewer = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    delco_water = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    suburban_gas = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    verizon_kat = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    sprint_justin = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    directtv_cable = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    timewarner_internet = models.DecimalField(max_digits=10, decimal_places=2,
-                                              default=Decimal('0.00'))
+    aep_electric = MoneyField(default=0)
+    rumpke_trash = MoneyField(default=0)
+    delaware_sewer = MoneyField(default=0)
+    delco_water = MoneyField(default=0)
+    suburban_gas = MoneyField(default=0)
+    verizon_kat = MoneyField(default=0)
+    sprint_justin = MoneyField(default=0)
+    directtv_cable = MoneyField(default=0)
+    timewarner_internet = MoneyField(default=0)
 
     # Loan payments
-    caponeauto_loan = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    public_loan = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    private_loan = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    caponeauto_loan = MoneyField(default=0)
+    public_loan = MoneyField(default=0)
+    private_loan = MoneyField(default=0)
 
     # Credit card payments
-    capone_creditcard = models.DecimalField(max_digits=10, decimal_places=2,
-                                            default=Decimal('0.00'))
-    amex_creditcard = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    discover_creditcard = models.DecimalField(max_digits=10, decimal_places=2,
-                                              default=Decimal('0.00'))
-    kohls_vicsec_macy_eddiebauer_creditcards = models.DecimalField(max_digits=10, decimal_places=2,
-                                                                   default=Decimal('0.00'))
-    katwork_creditcard = models.DecimalField(max_digits=10, decimal_places=2,
-                                             default=Decimal('0.00'))
+    capone_creditcard = MoneyField(default=0)
+    amex_creditcard = MoneyField(default=0)
+    discover_creditcard = MoneyField(default=0)
+    kohls_vicsec_macy_eddiebauer_creditcards = MoneyField(default=0)
+    katwork_creditcard = MoneyField(default=0)
 
     # Other expenses
-    cashorcheck_purchases = models.DecimalField(max_digits=10, decimal_places=2,
-                                                default=Decimal('0.00'))
-    daycare = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    taxdeductible_giving = models.DecimalField(max_digits=10, decimal_places=2,
-                                               default=Decimal('0.00'))
+    cashorcheck_purchases = MoneyField(default=0)
+    daycare = MoneyField(default=0)
+    taxdeductible_giving = MoneyField(default=0)
+
+    objects = MonthIncQuerySet.as_manager()
 
     class Meta:
         ordering = ['-date']
         verbose_name = 'Monthly Income'
         verbose_name_plural = 'Monthly Income'
         db_table = 'Finance_monthinc'  # Match existing table name
+        constraints = [
+            models.UniqueConstraint(fields=['date'], name='finance_monthinc_unique_date'),
+        ]
 
     def __str__(self):
         return f"Income {self.date.strftime('%B %Y')}"
 
-    # Income calculations
-    def total_interest(self):
-        return (self.huntington_interest + self.fifththird_interest +
-                self.capone_interest + self.amex_interest + self.schwab_interest)
-
-    def total_salary(self):
-        return self.supremecourt_salary + self.cdm_salary
-
-    def total_other_income(self):
-        return (self.expense_checks + self.miscellaneous_income +
-                self.refund_rebate_repayment + self.gift_income)
-
-    def total_income(self):
-        return (self.total_interest() + self.schwab_dividends +
-                self.total_other_income() + self.total_salary())
-
-    # Savings/investment calculations
-    def total_retirement_contributions(self):
-        return (self.opers_retirement + self.four57b_retirement +
-                self.four01k_retirement + self.roth_retirement)
-
-    def total_investment_contributions(self):
-        return self.robinhood_investments + self.schwab_investments
-
-    def total_savings_contributions(self):
-        return (self.amex_savings + self.fifththird_savings +
-                self.capone_savings + self.five29_college + self.huntington_savings)
-
-    def total_allsavings(self):
-        return (self.total_retirement_contributions() +
-                self.total_investment_contributions() +
-                self.total_savings_contributions())
-
-    # Tax calculations
-    def total_taxes(self):
-        return (self.federal_tax + self.social_security + self.medicare +
-                self.ohio_tax + self.columbus_tax)
-
-    # Expense calculations
-    def total_utilities(self):
-        return (self.aep_electric + self.rumpke_trash + self.delaware_sewer +
-                self.delco_water + self.suburban_gas + self.verizon_kat +
-                self.sprint_justin + self.directtv_cable + self.timewarner_internet)
-
-    def total_loans(self):
-        return self.caponeauto_loan + self.public_loan + self.private_loan
-
-    def total_personal_creditcards(self):
-        return (self.capone_creditcard + self.amex_creditcard +
-                self.discover_creditcard + self.kohls_vicsec_macy_eddiebauer_creditcards +
-                self.katwork_creditcard)
-
-    def total_housing(self):
-        return self.main_mortgage + self.hoa_fees
-
-    def total_benefits(self):
-        return (self.health_insurance + self.supplementallife_insurance +
-                self.flex_spending + self.cdm_std + self.cdmsupplemental_ltd +
-                self.parking + self.parking_admin)
-
-    def total_expenses(self):
-        return (self.total_taxes() + self.total_utilities() + self.total_loans() +
-                self.total_personal_creditcards() + self.total_housing() +
-                self.total_benefits() + self.auto_insurance +
-                self.cashorcheck_purchases + self.daycare + self.taxdeductible_giving)
-
-    def total_surplus(self):
-        return self.total_income() - self.total_expenses() - self.total_allsavings()
-
 
 class TaxReturn(models.Model):
     """Annual tax return summary."""
 
     year = models.DateField()
-    total_job_wages = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    total_federal_wages = models.DecimalField(max_digits=10, decimal_places=2,
-                                              default=Decimal('0.00'))
-    total_income = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    adjusted_gross_income = models.DecimalField(max_digits=10, decimal_places=2,
-                                                default=Decimal('0.00'))
-    itemized_deduction_total = models.DecimalField(max_digits=10, decimal_places=2,
-                                                   default=Decimal('0.00'))
-    federal_taxable_income = models.DecimalField(max_digits=10, decimal_places=2,
-                                                 default=Decimal('0.00'))
-    total_federal_tax_owed = models.DecimalField(max_digits=10, decimal_places=2,
-                                                 default=Decimal('0.00'))
-    total_federal_payments = models.DecimalField(max_digits=10, decimal_places=2,
-                                                 default=Decimal('0.00'))
-    state_taxable_income = models.DecimalField(max_digits=10, decimal_places=2,
-                                               default=Decimal('0.00'))
-    total_state_tax_owed = models.DecimalField(max_digits=10, decimal_places=2,
-                                               default=Decimal('0.00'))
-    total_state_payments = models.DecimalField(max_digits=10, decimal_places=2,
-                                               default=Decimal('0.00'))
+    total_job_wages = MoneyField(default=0)
+    total_federal_wages = MoneyField(default=0)
+    total_income = MoneyField(default=0)
+    adjusted_gross_income = MoneyField(default=0)
+    itemized_deduction_total = MoneyField(default=0)
+    federal_taxable_income = MoneyField(default=0)
+    total_federal_tax_owed = MoneyField(default=0)
+    total_federal_payments = MoneyField(default=0)
+    state_taxable_income = MoneyField(default=0)
+    total_state_tax_owed = MoneyField(default=0)
+    total_state_payments = MoneyField(default=0)
 
     class Meta:
         ordering = ['-year']
         verbose_name = 'Tax Return'
         verbose_name_plural = 'Tax Returns'
         db_table = 'Finance_taxreturn'  # Match existing table name
+        constraints = [
+            models.UniqueConstraint(fields=['year'], name='finance_taxreturn_unique_year'),
+        ]
 
     def __str__(self):
         return f"Tax Return {self.year}"
@@ -337,6 +436,78 @@ class MetricConstants(models.Model):
         verbose_name = 'Metric Constant'
         verbose_name_plural = 'Metric Constants'
         db_table = 'Finance_metricconstants'  # Match existing table name
+        indexes = [
+            models.Index(fields=['date'], name='finance_metric_date_idx'),
+        ]
 
     def __str__(self):
         return f"Metric {self.date}: {self.value}"
+
+
+class MonthlySummary(models.Model):
+    """
+    Precomputed monthly totals from MonthBal and MonthInc, kept in sync by the
+    signals in finance.signals. Rebuild with ``manage.py rebuild_summaries``.
+    """
+
+    date = models.DateField(unique=True)  # First day of the month
+    balance = models.OneToOneField(MonthBal, null=True, blank=True, on_delete=models.SET_NULL,
+                                   related_name='summary')
+    income = models.OneToOneField(MonthInc, null=True, blank=True, on_delete=models.SET_NULL,
+                                  related_name='summary')
+
+    # Balance sheet totals (empty when the month has no balance record)
+    total_check = MoneyField(null=True, blank=True)
+    total_save = MoneyField(null=True, blank=True)
+    total_invest = MoneyField(null=True, blank=True)
+    total_retire = MoneyField(null=True, blank=True)
+    total_property = MoneyField(null=True, blank=True)
+    total_assets = MoneyField(null=True, blank=True)
+    total_credit = MoneyField(null=True, blank=True)
+    total_loan = MoneyField(null=True, blank=True)
+    total_liabilities = MoneyField(null=True, blank=True)
+    networth = MoneyField(null=True, blank=True)
+
+    # Income statement totals (empty when the month has no income record)
+    total_interest = MoneyField(null=True, blank=True)
+    total_salary = MoneyField(null=True, blank=True)
+    total_other_income = MoneyField(null=True, blank=True)
+    total_income = MoneyField(null=True, blank=True)
+    total_retirement_contributions = MoneyField(null=True, blank=True)
+    total_investment_contributions = MoneyField(null=True, blank=True)
+    total_savings_contributions = MoneyField(null=True, blank=True)
+    total_allsavings = MoneyField(null=True, blank=True)
+    total_taxes = MoneyField(null=True, blank=True)
+    total_utilities = MoneyField(null=True, blank=True)
+    total_loans = MoneyField(null=True, blank=True)
+    total_personal_creditcards = MoneyField(null=True, blank=True)
+    total_housing = MoneyField(null=True, blank=True)
+    total_benefits = MoneyField(null=True, blank=True)
+    total_expenses = MoneyField(null=True, blank=True)
+    total_surplus = MoneyField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = MonthQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name = 'Monthly Summary'
+        verbose_name_plural = 'Monthly Summaries'
+
+    def __str__(self):
+        return f"Summary {self.date.strftime('%B %Y')}"
+
+
+class Watermark(models.Model):
+    """
+    When each Finance model's data last changed, kept by the signals in
+    finance.signals. The read views build their ETags from it (see
+    finance.watermarks), so an unchanged page costs one lookup of this table.
+    """
+
+    model = models.CharField(max_length=100, primary_key=True)  # e.g. finance.monthbal
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.model} changed {self.changed_at:%Y-%m-%d %H:%M:%S}"
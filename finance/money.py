@@ -0,0 +1,192 @@
+"""
+Money amounts stored as whole cents.
+
+MoneyField keeps amounts in a BIGINT column, so rows are read as plain ints
+instead of being parsed into Decimals, and the database adds them exactly on
+every backend. Values come back as Money, which holds the cents and prints,
+formats, compares and converts to float as dollars, so templates and charts
+see the same amounts as before.
+
+Money isn't an int, so its cents can't be mistaken for dollars: adding or
+subtracting Money gives Money, plain numbers compare with it as dollars, and
+json.dumps() refuses it rather than writing the cents. Every plain number
+assigned to a MoneyField, int included, is an amount in dollars, as it was for
+the DecimalFields these replace. As with other fields, an assigned value is
+only converted when the record is cleaned or saved.
+"""
+import operator
+from decimal import Decimal, InvalidOperation
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import connection, models
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+
+class Money:
+    """An amount in cents, e.g. ``Money(123456)`` is $1,234.56."""
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents=0):
+        if type(cents) is not int:
+            raise TypeError(f'Money() takes a whole number of cents, not {cents!r}')
+        self.cents = cents
+
+    def __repr__(self):
+        return f'Money({self.cents})'
+
+    def __str__(self):
+        dollars, cents = divmod(abs(self.cents), 100)
+        return f"{'-' if self.cents < 0 else ''}{dollars}.{cents:02d}"
+
+    def __format__(self, format_spec):
+        return format(self.to_decimal(), format_spec)
+
+    def __float__(self):
+        return self.cents / 100
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __hash__(self):
+        # Equal to the same amount as a plain number, so hashed like one
+        return hash(self.to_decimal())
+
+    def to_decimal(self):
+        return Decimal(self.cents).scaleb(-2)
+
+    def __add__(self, other):
+        if type(other) is Money:
+            return Money(self.cents + other.cents)
+        # 0 is what sum() starts from
+        if type(other) is int and other == 0:
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if type(other) is Money:
+            return Money(self.cents - other.cents)
+        if type(other) is int and other == 0:
+            return self
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if type(other) is int and other == 0:
+            return -self
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def _compare(self, other, op):
+        if type(other) is Money:
+            return op(self.cents, other.cents)
+        if isinstance(other, (int, float, Decimal)) and not isinstance(other, bool):
+            return op(self.to_decimal(), other)
+        return NotImplemented
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+
+class MoneyFormField(forms.DecimalField):
+    """Dollars and cents in forms; the model field turns them back into Money."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('decimal_places', 2)
+        super().__init__(**kwargs)
+
+    def prepare_value(self, value):
+        if isinstance(value, Money):
+            return value.to_decimal()
+        return super().prepare_value(value)
+
+
+class MoneyField(models.BigIntegerField):
+    """An amount of money, stored as a number of cents and read as Money."""
+
+    description = _('Amount of money in cents')
+    default_error_messages = {
+        'invalid': _('“%(value)s” value must be an amount of money.'),
+        'fractional_cents': _('“%(value)s” value must be a whole number of cents.'),
+    }
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        # MySQL returns sums of BIGINTs as Decimals
+        return Money(round(value))
+
+    def to_python(self, value):
+        if value is None or type(value) is Money:
+            return value
+        if isinstance(value, bool):
+            raise ValidationError(self.error_messages['invalid'], code='invalid',
+                                  params={'value': value})
+        try:
+            cents = Decimal(str(value) if isinstance(value, float) else value).scaleb(2)
+        except (InvalidOperation, TypeError, ValueError):
+            cents = None
+        if cents is None or not cents.is_finite():
+            raise ValidationError(self.error_messages['invalid'], code='invalid',
+                                  params={'value': value})
+        if cents != cents.to_integral_value():
+            raise ValidationError(self.error_messages['fractional_cents'],
+                                  code='fractional_cents', params={'value': value})
+        return Money(int(cents))
+
+    @cached_property
+    def validators(self):
+        # The BIGINT range applies to the cents, and Money compares with
+        # plain numbers as dollars, so the limits are Money too
+        validators = list(self._validators)
+        min_value, max_value = connection.ops.integer_field_range(self.get_internal_type())
+        if min_value is not None:
+            validators.append(MinValueValidator(Money(min_value)))
+        if max_value is not None:
+            validators.append(MaxValueValidator(Money(max_value)))
+        return validators
+
+    def pre_save(self, model_instance, add):
+        # Converting on every assignment would slow down loading rows, so
+        # amounts set as dollars become Money when the record is saved
+        value = self.to_python(getattr(model_instance, self.attname))
+        setattr(model_instance, self.attname, value)
+        return value
+
+    def get_prep_value(self, value):
+        value = self.to_python(value)
+        return value if value is None else value.cents
+
+    def get_default(self):
+        return self.to_python(super().get_default())
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return value if value is None else str(value)
+
+    def formfield(self, **kwargs):
+        # The BIGINT range is checked on the cents by the model field's validators
+        return super().formfield(**{
+            'form_class': MoneyFormField,
+            'min_value': None,
+            'max_value': None,
+            **kwargs,
+        })
@@ -0,0 +1,111 @@
+from datetime import date
+
+from django.conf import settings
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+DEFAULT_PAGE_SIZE = 24
+
+# Cursor directions: rows older than the cursor date, or newer than it
+OLDER, NEWER = 'o', 'n'
+
+
+def encode_cursor(direction, day):
+    return urlsafe_base64_encode(f'{direction}{day.isoformat()}'.encode())
+
+
+def decode_cursor(token):
+    """Return the (direction, date) in a cursor token, or None if it isn't one."""
+    try:
+        value = urlsafe_base64_decode(token).decode()
+        direction, day = value[0], date.fromisoformat(value[1:])
+    except (TypeError, ValueError, IndexError, UnicodeDecodeError):
+        return None
+    return (direction, day) if direction in (OLDER, NEWER) else None
+
+
+class DatePage:
+    """One page of records, newest first, with cursor tokens for the pages either side."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def has_other_pages(self):
+        return bool(self.next_cursor or self.previous_cursor)
+
+
+def paginate_by_date(queryset, cursor=None, page_size=None):
+    """
+    Return the page of ``queryset`` (newest first) that ``cursor`` points at,
+    or the first page. Pages are found by seeking on the date index rather
+    than with OFFSET, so every page costs the same however deep it is.
+    """
+    rows, direction, page_size = seek_page(queryset, cursor, page_size)
+    return date_page(list(rows), direction, page_size)
+
+
+async def apaginate_by_date(queryset, cursor=None, page_size=None):
+    """paginate_by_date() for async views."""
+    rows, direction, page_size = seek_page(queryset, cursor, page_size)
+    return date_page([row async for row in rows], direction, page_size)
+
+
+def seek_page(queryset, cursor, page_size):
+    """(unevaluated rows, direction, page size) of the page ``cursor`` points at."""
+    page_size = page_size or getattr(settings, 'FINANCE_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    direction, day = (cursor and decode_cursor(cursor)) or (None, None)
+
+    # One row more than the page, to tell whether there's another page beyond it
+    if direction == NEWER:
+        return queryset.filter(date__gt=day).order_by('date')[:page_size + 1], direction, page_size
+    if direction == OLDER:
+        queryset = queryset.filter(date__lt=day)
+    return queryset.order_by('-date')[:page_size + 1], direction, page_size
+
+
+def date_page(rows, direction, page_size):
+    """The DatePage of the rows fetched by seek_page()."""
+    if direction == NEWER:
+        has_newer, has_older = len(rows) > page_size, True
+        rows = rows[:page_size][::-1]
+    else:
+        has_newer, has_older = direction == OLDER, len(rows) > page_size
+        rows = rows[:page_size]
+
+    if not rows:
+        return DatePage(rows)
+    return DatePage(
+        rows,
+        next_cursor=encode_cursor(OLDER, rows[-1].date) if has_older else None,
+        previous_cursor=encode_cursor(NEWER, rows[0].date) if has_newer else None,
+    )
+
+
+def page_totals(queryset, page, **aggregates):
+    """Aggregate the rows on ``page`` in the database, e.g. ``total_income=Sum(...)``."""
+    if not page:
+        return {}
+    return page_rows(queryset, page).aggregate(**aggregates)
+
+
+async def apage_totals(queryset, page, **aggregates):
+    """page_totals() for async views."""
+    if not page:
+        return {}
+    return await page_rows(queryset, page).aaggregate(**aggregates)
+
+
+def page_rows(queryset, page):
+    return queryset.filter(date__gte=page[-1].date, date__lte=page[0].date)
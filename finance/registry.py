@@ -0,0 +1,249 @@
+"""
+The field groups of the balance sheet and income statement, declared once.
+
+Each group lists its fields with their labels, and usually names the rollup
+that totals them. Rollups of rollups (net worth, total income, ...) are
+declared after the groups. From these come the model rollups (and so the
+database-side totals), the form and detail page layouts, and the analysis
+category lists. This module doesn't import the models, so models.py can
+build its rollups from it; a system check compares it with the model fields.
+"""
+from django.core import checks
+
+from .money import MoneyField
+
+
+class Group:
+    """
+    Fields shown together on the forms and detail pages. ``total`` is the rollup
+    summing them (only ``members`` of them, if given) and ``total_label`` its label.
+    """
+
+    __slots__ = ('title', 'fields', 'total', 'total_label', 'members')
+
+    def __init__(self, title, fields, total=None, total_label=None, members=None):
+        self.title = title
+        self.fields = dict(fields)
+        self.total = total
+        self.total_label = total_label
+        self.members = list(members or self.fields) if total else []
+
+
+class Registry:
+    """
+    Everything derived from one record type's groups and totals. ``totals``
+    maps each rollup of rollups to its label and terms; a leading '-' on a
+    term subtracts it. ``summary`` lists the rollups offered first in analysis.
+    """
+
+    def __init__(self, model_name, groups, totals, summary):
+        self.model_name = model_name
+        self.groups = groups
+        self.fields = [name for group in groups for name in group.fields]
+
+        self.rollups = {group.total: group.members for group in groups if group.total}
+        self.rollups.update({name: terms for name, (_, terms) in totals.items()})
+
+        self.labels = {name: label for group in groups for name, label in group.fields.items()}
+        self.labels.update({group.total: group.total_label for group in groups if group.total})
+        self.labels.update({name: label for name, (label, _) in totals.items()})
+
+        # Field names per heading, for the add and edit forms
+        self.form_groups = {group.title: list(group.fields) for group in groups}
+        # {label: name} choices for the analysis page
+        self.summary_choices = {self.labels[name]: name for name in summary}
+        self.detail_choices = {self.labels[name]: name for name in self.fields}
+
+    def detail_groups(self, record):
+        """{title: [(label, value), ...]} of ``record``, each group followed by its total."""
+        return {
+            group.title: [
+                *((label, getattr(record, name)) for name, label in group.fields.items()),
+                *([(group.total_label, getattr(record, group.total)())] if group.total else []),
+            ]
+            for group in self.groups
+        }
+
+
+BALANCE = Registry('MonthBal', [
+    Group('Checking Accounts', [
+        ('huntington_check', 'Huntington Checking'),
+        ('fifththird_check', 'Fifth Third Checking'),
+    ], 'total_check', 'Total Checking'),
+    Group('Savings Accounts', [
+        ('huntington_save', 'Huntington Savings'),
+        ('fifththird_save', 'Fifth Third Savings'),
+        ('capone_save', 'Capital One Savings'),
+        ('amex_save', 'Amex Savings'),
+    ], 'total_save', 'Total Savings'),
+    Group('Investments', [
+        ('robinhood_invest', 'Robinhood'),
+        ('deacon_invest', 'Deacon'),
+        ('buckeye_invest', 'Buckeye'),
+    ], 'total_invest', 'Total Investments'),
+    Group('Retirement', [
+        ('opers_retire', 'OPERS'),
+        ('four57_retire', '457 Retirement'),
+        ('four01_retire', '401k'),
+        ('roth_retire', 'Roth IRA'),
+    ], 'total_retire', 'Total Retirement'),
+    Group('Property', [
+        ('main_home', 'Main Home'),
+        ('justin_car', 'Justin Car'),
+        ('kat_car', 'Kat Car'),
+    ], 'total_property', 'Total Property'),
+    Group('Credit Cards', [
+        ('capone_credit', 'Capital One Credit'),
+        ('amex_credit', 'Amex Credit'),
+        ('discover_credit', 'Discover Credit'),
+    ], 'total_credit', 'Total Credit Cards'),
+    Group('Loans', [
+        ('car_loan', 'Car Loan'),
+        ('pubstudent_loan', 'Public Student Loan'),
+        ('privstudent_loan', 'Private Student Loan'),
+        ('main_mortgage', 'Mortgage'),
+    ], 'total_loan', 'Total Loans'),
+], totals={
+    'total_assets': ('Total Assets', ['total_check', 'total_save', 'total_invest',
+                                      'total_retire', 'total_property']),
+    'total_liabilities': ('Total Liabilities', ['total_credit', 'total_loan']),
+    'networth': ('Net Worth', ['total_assets', '-total_liabilities']),
+}, summary=[
+    'networth', 'total_assets', 'total_liabilities', 'total_check', 'total_save',
+    'total_invest', 'total_retire', 'total_property', 'total_credit', 'total_loan',
+])
+
+INCOME = Registry('MonthInc', [
+    Group('Interest Income', [
+        ('huntington_interest', 'Huntington Interest'),
+        ('fifththird_interest', 'Fifth Third Interest'),
+        ('capone_interest', 'Capital One Interest'),
+        ('amex_interest', 'Amex Interest'),
+        ('schwab_interest', 'Schwab Interest'),
+    ], 'total_interest', 'Total Interest'),
+    # Dividends count towards total income, not salary
+    Group('Salary & Dividends', [
+        ('supremecourt_salary', 'Supreme Court Salary'),
+        ('cdm_salary', 'CDM Salary'),
+        ('schwab_dividends', 'Schwab Dividends'),
+    ], 'total_salary', 'Total Salary', members=['supremecourt_salary', 'cdm_salary']),
+    Group('Other Income', [
+        ('expense_checks', 'Expense Checks'),
+        ('miscellaneous_income', 'Miscellaneous Income'),
+        ('refund_rebate_repayment', 'Refunds/Rebates'),
+        ('gift_income', 'Gifts'),
+    ], 'total_other_income', 'Total Other Income'),
+    Group('Retirement Contributions', [
+        ('opers_retirement', 'OPERS'),
+        ('four57b_retirement', '457b'),
+        ('four01k_retirement', '401k'),
+        ('roth_retirement', 'Roth'),
+    ], 'total_retirement_contributions', 'Total Retirement Contributions'),
+    Group('Investment Contributions', [
+        ('robinhood_investments', 'Robinhood'),
+        ('schwab_investments', 'Schwab'),
+    ], 'total_investment_contributions', 'Total Investment Contributions'),
+    Group('Savings Contributions', [
+        ('amex_savings', 'Amex Savings'),
+        ('fifththird_savings', 'Fifth Third Savings'),
+        ('capone_savings', 'Capital One Savings'),
+        ('five29_college', '529 College'),
+        ('huntington_savings', 'Huntington Savings'),
+    ], 'total_savings_contributions', 'Total Savings Contributions'),
+    Group('Taxes', [
+        ('federal_tax', 'Federal Tax'),
+        ('social_security', 'Social Security'),
+        ('medicare', 'Medicare'),
+        ('ohio_tax', 'Ohio Tax'),
+        ('columbus_tax', 'Columbus Tax'),
+    ], 'total_taxes', 'Total Taxes'),
+    Group('Benefits', [
+        ('health_insurance', 'Health Insurance'),
+        ('supplementallife_insurance', 'Supplemental Life'),
+        ('flex_spending', 'Flex Spending'),
+        ('cdm_std', 'CDM STD'),
+        ('cdmsupplemental_ltd', 'CDM Supplemental LTD'),
+        ('parking', 'Parking'),
+        ('parking_admin', 'Parking Admin'),
+    ], 'total_benefits', 'Total Benefits'),
+    Group('Housing', [
+        ('main_mortgage', 'Mortgage Payment'),
+        ('hoa_fees', 'HOA Fees'),
+    ], 'total_housing', 'Total Housing'),
+    Group('Utilities', [
+        ('aep_electric', 'AEP Electric'),
+        ('rumpke_trash', 'Rumpke Trash'),
+        ('delaware_sewer', 'Delaware Sewer'),
+        ('delco_water', 'Delco Water'),
+        ('suburban_gas', 'Suburban Gas'),
+        ('verizon_kat', 'Verizon (Kat)'),
+        ('sprint_justin', 'Sprint (Justin)'),
+        ('directtv_cable', 'DirecTV'),
+        ('timewarner_internet', 'Internet'),
+    ], 'total_utilities', 'Total Utilities'),
+    Group('Loan Payments', [
+        ('caponeauto_loan', 'Auto Loan'),
+        ('public_loan', 'Public Student Loan'),
+        ('private_loan', 'Private Student Loan'),
+    ], 'total_loans', 'Total Loans'),
+    Group('Credit Card Payments', [
+        ('capone_creditcard', 'Capital One CC'),
+        ('amex_creditcard', 'Amex CC'),
+        ('discover_creditcard', 'Discover CC'),
+        ('kohls_vicsec_macy_eddiebauer_creditcards', 'Kohls/VS/Macy/EB'),
+        ('katwork_creditcard', 'Kat Work Card'),
+    ], 'total_personal_creditcards', 'Total Credit Cards'),
+    Group('Other Expenses', [
+        ('auto_insurance', 'Auto Insurance'),
+        ('cashorcheck_purchases', 'Cash/Check'),
+        ('daycare', 'Daycare'),
+        ('taxdeductible_giving', 'Tax Deductible Giving'),
+    ]),
+], totals={
+    'total_income': ('Total Income', ['total_interest', 'schwab_dividends',
+                                      'total_other_income', 'total_salary']),
+    'total_allsavings': ('Total Savings', ['total_retirement_contributions',
+                                           'total_investment_contributions',
+                                           'total_savings_contributions']),
+    'total_expenses': ('Total Expenses', ['total_taxes', 'total_utilities', 'total_loans',
+                                          'total_personal_creditcards', 'total_housing',
+                                          'total_benefits', 'auto_insurance',
+                                          'cashorcheck_purchases', 'daycare',
+                                          'taxdeductible_giving']),
+    'total_surplus': ('Total Surplus', ['total_income', '-total_expenses', '-total_allsavings']),
+}, summary=[
+    'total_income', 'total_salary', 'total_expenses', 'total_surplus', 'total_taxes',
+    'total_allsavings', 'total_utilities', 'total_housing',
+])
+
+REGISTRIES = {'balance': BALANCE, 'income': INCOME}
+
+# Labels of every category by its type-qualified name, e.g. 'income:total_income'
+CATEGORY_LABELS = {f'{data_type}:{name}': label for data_type, registry in REGISTRIES.items()
+                   for name, label in registry.labels.items()}
+
+
+@checks.register(checks.Tags.models)
+def check_registries(app_configs=None, **kwargs):
+    """Every amount field of the models is in exactly one group, and nothing else is."""
+    from django.apps import apps
+
+    errors = []
+    for registry in REGISTRIES.values():
+        model = apps.get_model('finance', registry.model_name)
+        amounts = {field.name for field in model._meta.concrete_fields
+                   if isinstance(field, MoneyField)}
+        grouped = registry.fields
+        for name in sorted(set(grouped) - amounts):
+            errors.append(checks.Error(
+                f'{name!r} is in a field group but is not an amount field of {model.__name__}.',
+                obj=model, id='finance.E001'))
+        for name in sorted(amounts - set(grouped)):
+            errors.append(checks.Error(
+                f'{model.__name__}.{name} is not in any field group.',
+                obj=model, id='finance.E002'))
+        for name in sorted({name for name in grouped if grouped.count(name) > 1}):
+            errors.append(checks.Error(
+                f'{model.__name__}.{name} is in more than one field group.',
+                obj=model, id='finance.E003'))
+    return errors
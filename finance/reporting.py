@@ -0,0 +1,124 @@
+import asyncio
+from datetime import date
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q, Sum
+from django.db.models.functions import ExtractQuarter, ExtractYear
+
+from .models import MonthlySummary
+from .money import Money
+
+
+# Report keys mapped to the MonthInc rollup summed over the quarter
+INCOME_TOTALS = {
+    'income': 'total_income',
+    'expenses': 'total_expenses',
+    'savings': 'total_allsavings',
+    'surplus': 'total_surplus',
+    'taxes': 'total_taxes',
+    'utilities': 'total_utilities',
+    'housing': 'total_housing',
+    'credit_cards': 'total_personal_creditcards',
+}
+
+# Report keys mapped to the MonthBal rollup read from the end-of-quarter balance
+BALANCE_TOTALS = {
+    'networth': 'networth',
+    'assets': 'total_assets',
+    'liabilities': 'total_liabilities',
+    'loan_balance': 'total_loan',
+    'savings_balance': 'total_save',
+}
+
+
+def quarter_start(quarter, year):
+    return date(year, (quarter - 1) * 3 + 1, 1)
+
+
+def quarter_end(quarter, year):
+    """First day of the following quarter (exclusive end of the quarter)."""
+    if quarter == 4:
+        return date(year + 1, 1, 1)
+    return quarter_start(quarter + 1, year)
+
+
+def get_quarters_data(periods=None):
+    """
+    Get income and balance totals for several quarters in two queries.
+
+    ``periods`` is an iterable of ``(quarter, year)`` tuples; when omitted every
+    quarter with income records is reported. Returns a dict keyed by
+    ``(quarter, year)`` with the same totals get_quarter_data() returns.
+    """
+    if periods is not None:
+        periods = list(dict.fromkeys(periods))
+        if not periods:
+            return {}
+
+    income_rows = list(quarter_income_rows(periods))
+    if periods is None:
+        periods = sorted({(row['quarter'], row['year']) for row in income_rows},
+                         key=lambda period: (period[1], period[0]))
+        if not periods:
+            return {}
+    return quarter_totals(periods, income_rows, quarter_balance_rows(periods))
+
+
+async def aget_quarters_data(periods):
+    """get_quarters_data() of ``periods`` for async views; the two queries run together."""
+    periods = list(dict.fromkeys(periods))
+    if not periods:
+        return {}
+
+    async def fetch(rows):
+        return [row async for row in rows]
+    income_rows, balance_rows = await asyncio.gather(fetch(quarter_income_rows(periods)),
+                                                     fetch(quarter_balance_rows(periods)))
+    return quarter_totals(periods, income_rows, balance_rows)
+
+
+def quarter_income_rows(periods=None):
+    """One grouped aggregate of the income totals of every quarter in ``periods``, or of all."""
+    income_rows = MonthlySummary.objects.filter(income__isnull=False)
+    if periods is not None:
+        income_rows = income_rows.filter(reduce(or_, (
+            Q(date__gte=quarter_start(q, y), date__lt=quarter_end(q, y)) for q, y in periods
+        )))
+
+    return income_rows.annotate(
+        year=ExtractYear('date'),
+        quarter=ExtractQuarter('date'),
+    ).values('year', 'quarter').annotate(**{
+        key: Sum(name) for key, name in INCOME_TOTALS.items()
+    }).order_by()
+
+
+def quarter_balance_rows(periods):
+    """The end-of-quarter balances, which are those of the first month of the next quarter."""
+    return MonthlySummary.objects.filter(
+        date__in=[quarter_end(q, y) for q, y in periods], balance__isnull=False,
+    ).values('date', *BALANCE_TOTALS.values())
+
+
+def quarter_totals(periods, income_rows, balance_rows):
+    """Combine the rows of quarter_income_rows() and quarter_balance_rows() by quarter."""
+    income_totals = {(row['quarter'], row['year']): row for row in income_rows}
+    results = {}
+    for period in periods:
+        row = income_totals.get(period, {})
+        results[period] = {key: row.get(key) or Money(0) for key in INCOME_TOTALS}
+        results[period].update(dict.fromkeys(BALANCE_TOTALS))
+
+    balance_months = {quarter_end(q, y): (q, y) for q, y in periods}
+    for balance in balance_rows:
+        results[balance_months[balance['date']]].update({
+            key: balance[name] for key, name in BALANCE_TOTALS.items()
+        })
+
+    return results
+
+
+def get_quarter_data(quarter, year):
+    """Get income and balance data for a specific quarter."""
+    return get_quarters_data([(quarter, year)])[(quarter, year)]
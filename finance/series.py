@@ -0,0 +1,188 @@
+import math
+from datetime import date
+
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncMonth, TruncQuarter, TruncYear
+
+from .columns import columns
+from .models import (MonthBal, MonthInc, MonthlySummary, BALANCE_ROLLUPS, INCOME_ROLLUPS,
+                     money_avg)
+from .money import MoneyField
+
+
+# Charts get at most this many points; longer series are downsampled
+SERIES_MAX_POINTS = 500
+# A bucket's balance is its average; income and expenses are summed
+SERIES_SOURCES = {
+    'balance': (MonthBal, BALANCE_ROLLUPS, money_avg),
+    'income': (MonthInc, INCOME_ROLLUPS, Sum),
+}
+BUCKETS = {
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+    'year': TruncYear,
+}
+
+
+def series_categories(data_type):
+    """Every field and rollup of ``data_type`` that can be charted."""
+    model, rollups, _ = SERIES_SOURCES[data_type]
+    fields = [field.name for field in model._meta.concrete_fields
+              if isinstance(field, MoneyField)]
+    return [*rollups, *fields]
+
+
+def split_category(data_type, category):
+    """
+    The (type, name) a series category refers to. Categories of the other type
+    are prefixed with it, e.g. ``income:total_income`` on a balance chart.
+    """
+    prefix, _, name = category.rpartition(':')
+    return prefix or data_type, name
+
+
+def data_version():
+    """When the summaries last changed and how many there are, for ETags."""
+    return MonthlySummary.objects.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+
+
+def get_series(data_type, categories, start=None, end=None, bucket='month',
+               max_points=SERIES_MAX_POINTS, token=None):
+    """
+    Return ``categories`` of ``data_type`` grouped into month, quarter or year
+    buckets, as parallel lists of bucket dates and values. Categories may name
+    series of either type (see split_category()); they are joined on date, with
+    None where a series has no value.
+
+    Monthly series are sliced from the in-memory column store. Quarters and
+    years are grouped by the database. Either way each type costs at most one
+    query, however many of its series are asked for. Series longer than
+    ``max_points`` are downsampled with lttb(); ``stats`` are taken before
+    downsampling. ``token`` is passed on to the column store.
+    """
+    by_type = {}
+    for category in categories:
+        source, name = split_category(data_type, category)
+        by_type.setdefault(source, {})[category] = name
+
+    parts, stats = [], {}
+    for source, names in by_type.items():
+        if bucket == 'month':
+            dates, series, part_stats = monthly_series(source, list(names.values()), start,
+                                                       end, token)
+        else:
+            dates, series, part_stats = grouped_series(
+                source, list(names.values()), start, end, bucket)
+        parts.append((dates, {category: series[name] for category, name in names.items()}))
+        stats.update({category: part_stats[name] for category, name in names.items()})
+    dates, series = join_series(parts)
+    series = {category: series[category] for category in categories}
+
+    downsampled = len(dates) > max_points
+    if downsampled:
+        keep = lttb(dates, series[categories[0]], max_points)
+        dates = [dates[index] for index in keep]
+        series = {name: [points[index] for index in keep] for name, points in series.items()}
+
+    return {
+        'type': data_type,
+        'bucket': bucket,
+        'labels': [date.fromordinal(ordinal).isoformat() for ordinal in dates],
+        'series': series,
+        'stats': {category: stats[category] for category in categories},
+        'downsampled': downsampled,
+    }
+
+
+def join_series(parts):
+    """
+    Join (date ordinals, {name: values}) parts on their dates. Parts over the
+    same dates are simply merged; otherwise missing values are None.
+    """
+    dates = parts[0][0]
+    if all(part_dates == dates for part_dates, _ in parts):
+        return list(dates), {name: list(values) for _, series in parts
+                             for name, values in series.items()}
+
+    values = {}
+    for part_dates, series in parts:
+        for name, points in series.items():
+            for ordinal, value in zip(part_dates, points):
+                values.setdefault(ordinal, {})[name] = value
+    dates = sorted(values)
+    names = [name for _, series in parts for name in series]
+    return dates, {name: [values[ordinal].get(name) for ordinal in dates] for name in names}
+
+
+def monthly_series(data_type, categories, start, end, token=None):
+    """(date ordinals, {category: values}, {category: stats}) from the column store."""
+    slices = {name: column.between(start, end)
+              for name, column in columns.columns(data_type, categories, token).items()}
+    # Missing values are NaN in the store and None in the charts
+    dates, series = join_series([
+        (column.dates, {name: [None if math.isnan(value) else value for value in column.values]})
+        for name, column in slices.items()])
+    return dates, series, {name: column.stats() for name, column in slices.items()}
+
+
+def grouped_series(data_type, categories, start, end, bucket):
+    """
+    (date ordinals, {category: values}, {category: stats}) grouped by the
+    database in one query, reading rollups through the joined summary rows.
+    """
+    model, rollups, aggregate = SERIES_SOURCES[data_type]
+    queryset = model.objects.all()
+    if start:
+        queryset = queryset.filter(date__gte=start)
+    if end:
+        queryset = queryset.filter(date__lte=end)
+    rows = queryset.annotate(bucket=BUCKETS[bucket]('date')).values('bucket').annotate(**{
+        name: aggregate(f'summary__{name}' if name in rollups else name) for name in categories
+    }).order_by('bucket')
+
+    dates, series = [], {name: [] for name in categories}
+    for row in rows:
+        dates.append(row['bucket'].toordinal())
+        for name in categories:
+            value = row[name]
+            series[name].append(None if value is None else round(float(value), 2))
+    stats = {name: summarize(points) for name, points in series.items()}
+    return dates, series, stats
+
+
+def summarize(points):
+    points = [point for point in points if point is not None]
+    if not points:
+        return None
+    return {'current': points[-1], 'highest': max(points), 'lowest': min(points),
+            'count': len(points)}
+
+
+def lttb(xs, ys, threshold):
+    """
+    Largest-Triangle-Three-Buckets: choose ``threshold`` indexes of the points
+    (xs, ys) that keep the visual shape of the line. The first and last points
+    are always kept; from each bucket in between, the point forming the largest
+    triangle with the previous pick and the next bucket's average is kept.
+    """
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    ys = [y or 0 for y in ys]
+
+    picked = [0]
+    size = (count - 2) / (threshold - 2)
+    for bucket in range(threshold - 2):
+        start = int(bucket * size) + 1
+        end = int((bucket + 1) * size) + 1
+        next_end = min(int((bucket + 2) * size) + 1, count)
+
+        # Average of the next bucket (just the last point for the final bucket)
+        next_xs, next_ys = xs[end:next_end] or xs[-1:], ys[end:next_end] or ys[-1:]
+        avg_x, avg_y = sum(next_xs) / len(next_xs), sum(next_ys) / len(next_ys)
+
+        ax, ay = xs[picked[-1]], ys[picked[-1]]
+        picked.append(max(range(start, end), key=lambda index: abs(
+            (ax - avg_x) * (ys[index] - ay) - (ax - xs[index]) * (avg_y - ay))))
+    picked.append(count - 1)
+    return picked
@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import MonthBal, MonthInc, TaxReturn
+from .summaries import refresh_summaries
+from .watermarks import touch_watermarks
+
+
+@receiver(pre_save, sender=MonthBal)
+@receiver(pre_save, sender=MonthInc)
+def remember_previous_date(sender, instance, **kwargs):
+    """Note the stored date so a record moved to another month updates both months."""
+    instance._previous_date = None
+    if instance.pk:
+        instance._previous_date = sender.objects.filter(pk=instance.pk).values_list(
+            'date', flat=True).first()
+
+
+@receiver(post_save, sender=MonthBal)
+@receiver(post_save, sender=MonthInc)
+def update_summary_on_save(sender, instance, **kwargs):
+    months = [instance.date]
+    if getattr(instance, '_previous_date', None):
+        months.append(instance._previous_date)
+    refresh_summaries(months)
+
+
+@receiver(post_delete, sender=MonthBal)
+@receiver(post_delete, sender=MonthInc)
+def update_summary_on_delete(sender, instance, **kwargs):
+    refresh_summaries([instance.date])
+
+
+@receiver(post_save, sender=MonthBal)
+@receiver(post_save, sender=MonthInc)
+@receiver(post_save, sender=TaxReturn)
+@receiver(post_delete, sender=MonthBal)
+@receiver(post_delete, sender=MonthInc)
+@receiver(post_delete, sender=TaxReturn)
+def touch_watermark(sender, **kwargs):
+    touch_watermarks(sender)
+
+
+# (signal, receiver, senders) of the receivers bulk loads switch off
+SUSPENDED_RECEIVERS = (
+    (pre_save, remember_previous_date, (MonthBal, MonthInc)),
+    (post_save, update_summary_on_save, (MonthBal, MonthInc)),
+    (post_delete, update_summary_on_delete, (MonthBal, MonthInc)),
+    (post_save, touch_watermark, (MonthBal, MonthInc, TaxReturn)),
+    (post_delete, touch_watermark, (MonthBal, MonthInc, TaxReturn)),
+)
+
+
+@contextmanager
+def summaries_suspended():
+    """
+    Disconnect the summary and watermark receivers for bulk loads, which call
+    refresh_summaries() themselves once the data is in. Without receivers
+    Django can also delete whole querysets without fetching every row. Every
+    watermark is touched on the way out.
+    """
+    for signal, handler, senders in SUSPENDED_RECEIVERS:
+        for model in senders:
+            signal.disconnect(handler, sender=model)
+    try:
+        yield
+    finally:
+        for signal, handler, senders in SUSPENDED_RECEIVERS:
+            for model in senders:
+                signal.connect(handler, sender=model)
+        touch_watermarks(MonthBal, MonthInc, TaxReturn)
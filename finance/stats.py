@@ -0,0 +1,112 @@
+import math
+import statistics
+from bisect import bisect_left
+from datetime import date
+from itertools import accumulate
+
+from django.core.cache import cache
+
+from .cache import data_token
+from .columns import columns
+
+
+# Months averaged by the rolling means
+ROLLING_WINDOWS = (3, 6, 12)
+# Keys include the data token, so stale entries are never read; this just
+# lets the cache reclaim them
+STATS_CACHE_TIMEOUT = 60 * 60 * 24
+STATS_KEY = 'finance:stats:{token}:{data_type}:{category}:{start}:{end}'
+
+
+def month_number(ordinal):
+    day = date.fromordinal(ordinal)
+    return day.year * 12 + day.month - 1
+
+
+def change(new, old):
+    """Absolute and relative change from ``old`` to ``new``."""
+    return {
+        'amount': round(new - old, 2),
+        'percent': round((new - old) / abs(old) * 100, 2) if old else None,
+    }
+
+
+def stdev(values):
+    """Sample standard deviation; statistics.stdev() is exact but far slower on floats."""
+    if len(values) < 2:
+        return None
+    mean = math.fsum(values) / len(values)
+    return math.sqrt(math.fsum((value - mean) ** 2 for value in values) / (len(values) - 1))
+
+
+def series_stats(column):
+    """
+    Analytics for a monthly Column: rolling means, month-over-month and
+    year-over-year changes, CAGR, spread, volatility, maximum drawdown and a
+    least-squares trend line, over the months that have a value. None for a
+    column without any.
+    """
+    column = column.present()
+    values = column.values
+    count = len(values)
+    if not count:
+        return None
+    months = [month_number(ordinal) for ordinal in column.dates]
+    first, last = values[0], values[-1]
+
+    # Prefix sums give every rolling window's total without re-adding
+    totals = [0.0, *accumulate(values)]
+    rolling = {str(window): round((totals[-1] - totals[-1 - window]) / window, 2)
+               for window in ROLLING_WINDOWS if count >= window}
+
+    year_ago = bisect_left(months, months[-1] - 12)
+    has_year_ago = year_ago < count and months[year_ago] == months[-1] - 12
+
+    # Returns, drawdown and running peak in one pass
+    returns = []
+    peak = values[0]
+    drawdown = 0.0
+    for previous, value in zip(values, values[1:]):
+        if previous:
+            returns.append((value - previous) / abs(previous))
+        peak = max(peak, value)
+        if peak > 0:
+            drawdown = max(drawdown, (peak - value) / peak)
+
+    years = (months[-1] - months[0]) / 12
+    cagr = None
+    if years > 0 and first > 0 and last > 0:
+        cagr = round(((last / first) ** (1 / years) - 1) * 100, 2)
+
+    trend = None
+    if count >= 2:
+        slope, intercept = statistics.linear_regression(months, values)
+        trend = {'per_month': round(slope, 2), 'per_year': round(slope * 12, 2)}
+
+    return {
+        'rolling_mean': rolling,
+        'month_over_month': change(last, values[-2]) if count >= 2 else None,
+        'year_over_year': change(last, values[year_ago]) if has_year_ago else None,
+        'cagr_percent': cagr,
+        'mean': round(statistics.fmean(values), 2),
+        'stdev': round(stdev(values), 2) if count >= 2 else None,
+        'volatility_percent': round(stdev(returns) * 100, 2) if len(returns) >= 2 else None,
+        'max_drawdown_percent': round(drawdown * 100, 2),
+        'trend': trend,
+    }
+
+
+def get_series_stats(data_type, category, start=None, end=None, token=None):
+    """
+    series_stats() of a slice of the column store, cached until the data
+    changes. ``token`` is the data token, if already read for this request.
+    """
+    if token is None:
+        token = data_token()
+    key = STATS_KEY.format(token=token, data_type=data_type, category=category,
+                           start=start, end=end)
+    stats = cache.get(key, key)
+    if stats == key:
+        stats = series_stats(columns.column(data_type, category, token).between(start, end))
+        cache.set(key, stats, STATS_CACHE_TIMEOUT)
+    return stats
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models import Q
+
+from .models import (MonthBal, MonthInc, MonthlySummary, BALANCE_ROLLUPS, INCOME_ROLLUPS,
+                     TOTAL_PREFIX, month_of, next_month, upsert)
+from .watermarks import touch_watermarks
+
+
+# (model, summary foreign key, rollups copied into the summary)
+SUMMARY_SOURCES = (
+    (MonthBal, 'balance', BALANCE_ROLLUPS),
+    (MonthInc, 'income', INCOME_ROLLUPS),
+)
+
+SUMMARY_FIELDS = ['balance', 'income', *BALANCE_ROLLUPS, *INCOME_ROLLUPS]
+
+
+def refresh_summaries(months=None):
+    """
+    Recompute the MonthlySummary rows for the given months (any date in the
+    month will do), or for the whole history when ``months`` is None.
+
+    Totals are computed by the database with ``with_totals()``, so it costs one
+    query per source model plus the write, however many months are refreshed.
+    The summaries' watermark is touched with them, which changes the data
+    token the cached dashboards and columns are keyed by.
+    """
+    if months is not None:
+        months = {month_of(day) for day in months}
+        if not months:
+            return 0
+        # One range covering every month; an OR per month overflows SQLite's
+        # expression depth on large imports, so other months are skipped below
+        month_filter = Q(date__gte=min(months), date__lt=next_month(max(months)))
+
+    summaries = {}
+    for model, key, rollups in SUMMARY_SOURCES:
+        records = model.objects.with_totals()
+        if months is not None:
+            records = records.filter(month_filter)
+        records = records.values('pk', 'date', *(TOTAL_PREFIX + name for name in rollups))
+
+        for record in records.order_by('date'):  # The latest record in a month wins
+            month = month_of(record['date'])
+            if months is not None and month not in months:
+                continue
+            summary = summaries.setdefault(month, {})
+            summary[key + '_id'] = record['pk']
+            summary.update({name: record[TOTAL_PREFIX + name] for name in rollups})
+
+    with transaction.atomic():
+        existing = MonthlySummary.objects.all()
+        if months is not None:
+            existing = existing.filter(date__in=months)
+        existing.exclude(date__in=summaries).delete()
+        # Detach the records first, since one may have moved to another month
+        existing.update(balance=None, income=None)
+
+        upsert(MonthlySummary,
+               [MonthlySummary(date=month, **values) for month, values in summaries.items()],
+               unique_fields=['date'], update_fields=[*SUMMARY_FIELDS, 'updated_at'],
+               batch_size=500)
+        touch_watermarks(MonthlySummary)
+
+    return len(summaries)
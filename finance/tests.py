@@ -1,3 +1,1206 @@
-from django.test import TestCase
+import csv
+import gzip
+import importlib
+import json
+import math
+import os
+import runpy
+import sqlite3
+import tempfile
+import time
+from array import array
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from config import urls as config_urls
+from config.dbpool import ConnectionPool, PoolTimeout
+from config.instrumentation import RequestTimer, slowest_requests
+from config.static import StaticFilesMiddleware
+from config.warmup import reset_template_caches, warm_templates, warm_worker
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.exceptions import ValidationError
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.utils import ConnectionHandler
+from django.db.migrations.executor import MigrationExecutor
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.forms import NumberInput
+from django.http import HttpResponseNotFound
+from django.test import (RequestFactory, SimpleTestCase, TestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import clear_url_caches, resolve, reverse
+
+from . import urls as finance_urls
+from .benchmarks import check_report, run_benchmarks
+from .cache import dashboard_cache_stats
+from .checks import check_self_hosted_assets
+from .forms import INPUT_CLASSES, MonthBalForm, MonthIncForm, TaxReturnForm
+from .management.commands.benchmark_sqlite import run_workers
+from .models import TOTAL_PREFIX, MonthBal, MonthInc, MonthlySummary, TaxReturn
+from .money import Money
+from .pagination import paginate_by_date
+from .registry import BALANCE, INCOME, check_registries
+from .reporting import get_quarters_data
+from .columns import Column, columns
+from .series import lttb
+from .signals import summaries_suspended
+from .stats import get_series_stats, series_stats
+from .summaries import refresh_summaries
+from .views import BALANCE_COLUMNS
+
+try:
+    from config.mysql_pool import base as mysql_pool
+except ImproperlyConfigured:  # mysqlclient isn't installed
+    mysql_pool = None
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked on SQLite')
+class DateIndexTests(TestCase):
+    """The year/month filters and -date ordering should be served by the date index."""
+
+    def assertUsesDateIndex(self, queryset, search=True):
+        plan = queryset.explain()
+        self.assertIn('USING INDEX' if search else 'INDEX', plan)
+        self.assertIn('SEARCH' if search else 'SCAN', plan)
+        self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_year_month_filter(self):
+        self.assertUsesDateIndex(MonthBal.objects.for_period(2024, 3))
+        self.assertUsesDateIndex(MonthInc.objects.for_period(2024, 3).with_totals())
+
+    def test_year_filter(self):
+        self.assertUsesDateIndex(MonthBal.objects.for_period(2024))
+        self.assertUsesDateIndex(MonthInc.objects.for_period(2024).order_by('date'))
+
+    def test_latest_record(self):
+        self.assertUsesDateIndex(MonthBal.objects.all()[:1], search=False)
+        self.assertUsesDateIndex(MonthInc.objects.all()[:1], search=False)
+
+
+class MonthRecordTests(TestCase):
+
+    def test_records_are_dated_the_first_of_the_month(self):
+        balance = MonthBal.objects.create(date=date(2024, 3, 15))
+        self.assertEqual(balance.date, date(2024, 3, 1))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            MonthBal.objects.create(date=date(2024, 3, 20))
+
+    def test_form_allows_one_record_a_month(self):
+        MonthInc.objects.create(date=date(2024, 3, 1))
+        data = {name: '0' for name in MonthIncForm.base_fields}
+
+        form = MonthIncForm(data={**data, 'date': '2024-03-15'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('already exists', form.errors.as_text())
+
+        form = MonthIncForm(data={**data, 'date': '2024-04-15'})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.save().date, date(2024, 4, 1))
+
+
+class RegistryTests(TestCase):
+
+    def test_rollups_match_model_totals(self):
+        # Distinct amounts, so a field in the wrong rollup changes some total
+        for model, registry in ((MonthBal, BALANCE), (MonthInc, INCOME)):
+            dollars = {name: 2 ** (index % 25) for index, name in enumerate(registry.fields)}
+            record = model.objects.create(date=date(2024, 1, 1), **{
+                name: Decimal(amount) for name, amount in dollars.items()})
+            annotated = model.objects.with_totals().get(pk=record.pk)
+
+            def expected(name):
+                if name not in registry.rollups:
+                    return dollars[name]
+                return sum(-expected(term[1:]) if term.startswith('-') else expected(term)
+                           for term in registry.rollups[name])
+
+            self.assertEqual({name for name in dir(model)
+                              if name.startswith('total_') or name == 'networth'},
+                             set(registry.rollups))
+            for name in registry.rollups:
+                self.assertEqual(getattr(annotated, name)(), Money(100 * expected(name)), name)
+                self.assertEqual(getattr(record, name)(), getattr(annotated, name)(), name)
+
+    def test_registries_cover_the_models(self):
+        self.assertEqual(check_registries(), [])
+
+    def test_pages_use_registry_labels(self):
+        self.client.force_login(User.objects.create_user('tester'))
+        balance = MonthBal.objects.create(date=date(2024, 1, 1), opers_retire=Decimal(5),
+                                          roth_retire=Decimal(7))
+
+        response = self.client.get(reverse('finance:balance_detail', args=[balance.pk]))
+        self.assertEqual(response.context['field_groups']['Retirement'][-1],
+                         ('Total Retirement', Money(1200)))
+        self.assertContains(self.client.get(reverse('finance:balance_add')), 'Roth IRA')
+        response = self.client.get(reverse('finance:analysis'), {'type': 'income'})
+        self.assertEqual(response.context['category_name'], 'Total Income')
+
+
+class WithTotalsTests(TestCase):
+
+    def test_totals_come_from_the_database(self):
+        MonthBal.objects.create(date=date(2024, 1, 1), opers_retire=Decimal(5),
+                                roth_retire=Decimal(7))
+        MonthBal.objects.create(date=date(2024, 2, 1), opers_retire=Decimal(6))
+
+        with self.assertNumQueries(1):
+            records = list(MonthBal.objects.with_totals().order_by('date'))
+            networths = [record.networth() for record in records]
+        self.assertEqual(networths, [Money(1200), Money(600)])
+        self.assertIs(type(records[0].db_networth), Money)
+
+        # The annotated total is what the method returns, not recomputed
+        records[0].roth_retire = Money(0)
+        self.assertEqual(records[0].networth(), Money(1200))
+        self.assertEqual(MonthBal.objects.get(pk=records[0].pk).networth(), Money(1200))
+
+    def test_only_the_named_totals_are_annotated(self):
+        MonthBal.objects.create(date=date(2024, 1, 1), opers_retire=Decimal(5))
+
+        record = MonthBal.objects.with_totals('networth').get()
+        self.assertEqual(record.db_networth, Money(500))
+        self.assertFalse(any(name.startswith(TOTAL_PREFIX) and name != 'db_networth'
+                             for name in vars(record)))
+
+
+class MoneyTests(TestCase):
+
+    def test_addition_gives_money(self):
+        self.assertEqual(repr(Money(150) + Money(275)), 'Money(425)')
+        self.assertEqual(str(Money(150) + Money(275)), '4.25')
+        # sum() starts from 0
+        self.assertEqual(repr(sum([Money(150), Money(275)])), 'Money(425)')
+
+    def test_reverse_addition_only_takes_zero(self):
+        self.assertEqual(repr(0 + Money(150)), 'Money(150)')
+        with self.assertRaises(TypeError):
+            150 + Money(150)
+
+    def test_subtraction_gives_money(self):
+        self.assertEqual(repr(Money(150) - Money(275)), 'Money(-125)')
+        self.assertEqual(str(Money(150) - Money(275)), '-1.25')
+
+    def test_negation_gives_money(self):
+        self.assertEqual(repr(-Money(150)), 'Money(-150)')
+        self.assertEqual(str(-Money(5)), '-0.05')
+
+    def test_plain_numbers_are_dollars(self):
+        self.assertEqual(Money(150), Decimal('1.50'))
+        self.assertGreater(Money(150), 1)
+        self.assertEqual(float(Money(150)), 1.5)
+        with self.assertRaises(TypeError):
+            Money(150) + 1
+        with self.assertRaises(TypeError):
+            json.dumps(Money(150))
+
+    def test_assigned_numbers_are_dollars(self):
+        for amount in (12, Decimal('12'), 12.0, '12.00', Money(1200)):
+            with self.subTest(amount=amount):
+                balance = MonthBal.objects.create(date=date(2024, 1, 1), huntington_check=amount)
+                self.assertEqual(repr(balance.huntington_check), 'Money(1200)')
+                balance.refresh_from_db()
+                self.assertEqual(repr(balance.huntington_check), 'Money(1200)')
+                balance.delete()
+
+    def test_bad_amounts_are_rejected(self):
+        for amount in (True, Decimal('1.005'), 'twelve'):
+            with self.subTest(amount=amount):
+                with self.assertRaises(ValidationError):
+                    MonthBal(date=date(2024, 1, 1), huntington_check=amount).full_clean()
+        with self.assertRaises(TypeError):
+            Money(Decimal('1.50'))
+
+
+class FormTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester'))
+        cache.clear()
+
+    def test_widgets_are_styled_on_the_class(self):
+        for form_class in (MonthBalForm, MonthIncForm, TaxReturnForm):
+            for field in form_class.base_fields.values():
+                self.assertEqual(field.widget.attrs['class'], INPUT_CLASSES)
+
+    def test_blank_form_markup_is_cached(self):
+        key = make_template_fragment_key('finance_form', [MonthIncForm.layout_key])
+        response = self.client.get(reverse('finance:income_add'))
+        self.assertContains(response, 'Kohls/VS/Macy/EB')
+        self.assertIn('Kohls/VS/Macy/EB', cache.get(key))
+
+        # Filled-in forms are rendered afresh
+        income = MonthInc.objects.create(date=date(2024, 1, 1), daycare=Decimal('123.45'))
+        response = self.client.get(reverse('finance:income_edit', args=[income.pk]))
+        self.assertContains(response, 'value="123.45"')
+        self.assertNotIn('123.45', cache.get(key))
+
+    def test_layout_key_covers_labels_and_widgets(self):
+        def layout_key(**meta):
+            form_meta = type('Meta', (MonthIncForm.Meta,), meta)
+            return type('IncomeForm', (MonthIncForm,), {'Meta': form_meta}).layout_key
+
+        key = layout_key()
+        self.assertEqual(layout_key(), key)
+        self.assertNotEqual(layout_key(labels={**INCOME.labels, 'daycare': 'Childcare'}), key)
+        self.assertNotEqual(layout_key(widgets={**MonthIncForm.Meta.widgets,
+                                                'daycare': NumberInput(attrs={'step': '1'})}),
+                            key)
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('tester', password='secret')
+        self.client.force_login(self.user)
+        MonthBal.objects.create(date=date(2023, 12, 1), huntington_check=Decimal('10.50'))
+        MonthBal.objects.create(date=date(2024, 1, 1), huntington_check=Decimal('20.25'),
+                                car_loan=Decimal('5.00'))
+
+    def test_csv_export_streams_rows_with_totals(self):
+        response = self.client.get(reverse('finance:balance_export'))
+
+        self.assertTrue(response.streaming)
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual([row['date'] for row in rows], ['2023-12-01', '2024-01-01'])
+        self.assertEqual(rows[1]['huntington_check'], '20.25')
+        self.assertEqual(rows[1]['networth'], '15.25')
+
+    def test_jsonl_export_applies_filters(self):
+        response = self.client.get(reverse('finance:balance_export'),
+                                   {'year': '2024', 'month': '1', 'format': 'jsonl'})
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['total_check'], '20.25')
+
+
+class ImportTests(TestCase):
+
+    def import_file(self, model, content, suffix='.csv'):
+        with tempfile.NamedTemporaryFile('w', suffix=suffix) as handle:
+            handle.write(content)
+            handle.flush()
+            call_command('import_finance', model, handle.name, batch_size=2, stdout=StringIO())
+
+    def test_csv_import_upserts_and_refreshes_summaries(self):
+        MonthBal.objects.create(date=date(2024, 1, 1), huntington_check=Decimal('1.00'))
+
+        self.import_file('balance', 'date,huntington_check,car_loan\n'
+                                    '2024-01-01,20.25,5.00\n'
+                                    '2024-02-01,30.00,0\n'
+                                    '2024-03-01,40.00,0\n')
+
+        self.assertEqual(MonthBal.objects.count(), 3)
+        self.assertEqual(MonthBal.objects.get(date=date(2024, 1, 1)).huntington_check,
+                         Money(2025))
+        summary = MonthlySummary.objects.get(date=date(2024, 1, 1))
+        self.assertEqual(summary.networth, Money(1525))
+
+    def test_invalid_row_aborts_import(self):
+        content = '{"date": "2024-01-01", "huntington_interest": "1.50"}\n{"date": "not a date"}\n'
+        with self.assertRaisesMessage(CommandError, 'line 2'):
+            self.import_file('income', content, suffix='.jsonl')
+        self.assertFalse(MonthInc.objects.exists())
+
+    def test_malformed_json_line_aborts_import(self):
+        # The bad line comes after a full batch, which is rolled back too
+        content = ('{"date": "2024-01-01"}\n{"date": "2024-02-01"}\n\n'
+                   '{"date": "2024-03-01",\n')
+        with self.assertRaisesMessage(CommandError, 'line 4: Expecting'):
+            self.import_file('income', content, suffix='.jsonl')
+        with self.assertRaisesMessage(CommandError, 'line 1: not a JSON object'):
+            self.import_file('income', '["2024-01-01"]\n', suffix='.jsonl')
+        self.assertFalse(MonthInc.objects.exists())
+
+
+class LoadTestDataTests(TestCase):
+
+    def load(self, **options):
+        call_command('load_test_data', stdout=StringIO(), **options)
+        return list(MonthBal.objects.order_by('date').values_list('date', 'huntington_check'))
+
+    def test_seeded_history_is_reproducible(self):
+        first = self.load(months=30, seed=7, batch_size=8)
+        self.assertEqual(first, self.load(months=30, seed=7))
+        self.assertNotEqual(first, self.load(months=30, seed=8))
+
+        self.assertEqual(first[0][0], date(2023, 1, 1))
+        self.assertEqual(first[-1][0], date(2025, 6, 1))
+        self.assertEqual(MonthInc.objects.count(), 30)
+        self.assertEqual(TaxReturn.objects.count(), 2)
+        self.assertEqual(MonthlySummary.objects.filter(balance__isnull=False,
+                                                       income__isnull=False).count(), 30)
+
+    def test_users(self):
+        self.load(months=1, users=3)
+        self.load(months=1, users=3)
+        self.assertEqual(User.objects.filter(username__startswith='loadtest').count(), 3)
+
+    def test_months_past_9999_rejected(self):
+        with self.assertRaises(CommandError):
+            self.load(start='9999-06', months=12)
+
+
+class SummaryTests(TestCase):
+
+    def summary(self, month):
+        return MonthlySummary.objects.filter(date=date(2024, month, 1)).first()
+
+    def test_saves_and_deletes_keep_the_summary_in_sync(self):
+        balance = MonthBal.objects.create(date=date(2024, 3, 1), huntington_check=Decimal(10),
+                                          car_loan=Decimal(4))
+        income = MonthInc.objects.create(date=date(2024, 3, 1), cdm_salary=Decimal(100))
+        summary = self.summary(3)
+        self.assertEqual((summary.balance_id, summary.income_id), (balance.pk, income.pk))
+        self.assertEqual((summary.networth, summary.total_income), (Money(600), Money(10000)))
+
+        balance.huntington_check = Decimal(20)
+        balance.save()
+        self.assertEqual(self.summary(3).networth, Money(1600))
+
+        balance.delete()
+        summary = self.summary(3)
+        self.assertEqual((summary.balance_id, summary.networth), (None, None))
+        self.assertEqual(summary.total_income, Money(10000))
+        income.delete()
+        self.assertIsNone(self.summary(3))
+
+    def test_moving_a_record_to_another_month_clears_the_old_one(self):
+        balance = MonthBal.objects.create(date=date(2024, 3, 1), huntington_check=Decimal(10))
+        balance.date = date(2024, 5, 1)
+        balance.save()
+
+        self.assertIsNone(self.summary(3))
+        self.assertEqual((self.summary(5).balance_id, self.summary(5).networth),
+                         (balance.pk, Money(1000)))
+
+    def test_admin_is_read_only(self):
+        self.client.force_login(User.objects.create_superuser('admin'))
+        MonthBal.objects.create(date=date(2024, 3, 1))
+        change_url = reverse('admin:finance_monthlysummary_change', args=[self.summary(3).pk])
+
+        self.assertEqual(self.client.get(change_url).status_code, 200)
+        self.assertEqual(self.client.post(change_url, {'date': '2024-04-01'}).status_code, 403)
+        self.assertEqual(self.client.get(reverse('admin:finance_monthlysummary_add'))
+                         .status_code, 403)
+        self.assertEqual(self.summary(3).date, date(2024, 3, 1))
+
+
+class MigrationTestCase(TransactionTestCase):
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('finance', target)])
+        return executor.loader.project_state([('finance', target)]).apps
+
+
+class SummaryMigrationTests(MigrationTestCase):
+
+    def test_existing_records_are_summarized(self):
+        self.addCleanup(call_command, 'migrate', verbosity=0)
+        apps = self.migrate('0002_date_indexes')
+        apps.get_model('finance', 'MonthBal').objects.create(
+            date=date(2024, 3, 1), huntington_check=Decimal('10.25'), car_loan=Decimal(4))
+        apps.get_model('finance', 'MonthInc').objects.create(
+            date=date(2024, 4, 1), cdm_salary=Decimal('7.10'), federal_tax=Decimal(2))
+
+        # The migration keeps its own copy of the rollups
+        with mock.patch.dict(BALANCE.rollups, networth=['total_assets']):
+            apps = self.migrate('0003_monthlysummary')
+        march, april = apps.get_model('finance', 'MonthlySummary').objects.order_by('date')
+        self.assertEqual((march.date, march.networth), (date(2024, 3, 1), Decimal('6.25')))
+        self.assertIsNone(march.income_id)
+        self.assertEqual((april.date, april.total_surplus), (date(2024, 4, 1), Decimal('5.10')))
+        self.assertIsNone(april.balance_id)
+
+
+class DateMigrationTests(MigrationTestCase):
+
+    def setUp(self):
+        self.addCleanup(call_command, 'migrate', verbosity=0)
+
+    def test_duplicate_dates_stop_the_unique_constraints(self):
+        apps = self.migrate('0001_initial')
+        income_model = apps.get_model('finance', 'MonthInc')
+        income_model.objects.create(date=date(2024, 3, 1))
+        income_model.objects.create(date=date(2024, 3, 1))
+
+        with self.assertRaisesMessage(CommandError, 'Monthly Income 2024-03-01'):
+            self.migrate('0002_date_indexes')
+        income_model.objects.all().delete()
+
+    def test_records_move_to_the_first_of_the_month(self):
+        apps = self.migrate('0005_money_cents')
+        balance_model = apps.get_model('finance', 'MonthBal')
+        balance_model.objects.create(date=date(2024, 3, 15))
+        balance_model.objects.create(date=date(2024, 4, 1))
+
+        apps = self.migrate('0006_first_of_month')
+        self.assertEqual(list(apps.get_model('finance', 'MonthBal').objects.order_by(
+            'date').values_list('date', flat=True)), [date(2024, 3, 1), date(2024, 4, 1)])
+
+    def test_months_with_two_records_stop_the_migration(self):
+        apps = self.migrate('0005_money_cents')
+        balance_model = apps.get_model('finance', 'MonthBal')
+        balance_model.objects.create(date=date(2024, 3, 1))
+        balance_model.objects.create(date=date(2024, 3, 15))
+
+        with self.assertRaisesMessage(CommandError,
+                                      'Monthly Balance 2024-03 (2024-03-01, 2024-03-15)'):
+            self.migrate('0006_first_of_month')
+        self.assertEqual(balance_model.objects.filter(date=date(2024, 3, 15)).count(), 1)
+        balance_model.objects.all().delete()
+
+
+class QuarterReportTests(TestCase):
+
+    def setUp(self):
+        # All of Q1 2024 but only April of Q2, and no balance after Q2
+        for month in (1, 2, 3, 4):
+            MonthInc.objects.create(
+                date=date(2024, month, 1), cdm_salary=Decimal(1000 * month),
+                ohio_tax=Decimal(10), aep_electric=Decimal(20), main_mortgage=Decimal(30),
+                capone_creditcard=Decimal(40), huntington_savings=Decimal(100))
+        MonthBal.objects.create(date=date(2024, 3, 1), huntington_save=Decimal(9999))
+        MonthBal.objects.create(date=date(2024, 4, 1), huntington_save=Decimal(500),
+                                car_loan=Decimal(200))
+
+    def test_quarters_data(self):
+        no_balance = dict.fromkeys(
+            ['networth', 'assets', 'liabilities', 'loan_balance', 'savings_balance'])
+        expected = {
+            (1, 2024): {
+                'income': Money(600000), 'expenses': Money(30000), 'savings': Money(30000),
+                'surplus': Money(540000), 'taxes': Money(3000), 'utilities': Money(6000),
+                'housing': Money(9000), 'credit_cards': Money(12000),
+                # The balance at the start of the next quarter
+                'networth': Money(30000), 'assets': Money(50000), 'liabilities': Money(20000),
+                'loan_balance': Money(20000), 'savings_balance': Money(50000),
+            },
+            (2, 2024): {
+                'income': Money(400000), 'expenses': Money(10000), 'savings': Money(10000),
+                'surplus': Money(380000), 'taxes': Money(1000), 'utilities': Money(2000),
+                'housing': Money(3000), 'credit_cards': Money(4000), **no_balance,
+            },
+        }
+        self.assertEqual(get_quarters_data([(1, 2024), (2, 2024)]), expected)
+        # Every quarter with income by default
+        self.assertEqual(get_quarters_data(), expected)
+
+    def test_quarter_without_records(self):
+        self.assertEqual(get_quarters_data([(3, 2024)]), {(3, 2024): {
+            **dict.fromkeys(['income', 'expenses', 'savings', 'surplus', 'taxes', 'utilities',
+                             'housing', 'credit_cards'], Money(0)),
+            **dict.fromkeys(['networth', 'assets', 'liabilities', 'loan_balance',
+                             'savings_balance']),
+        }})
+
+
+class ViewBenchmarkTests(TestCase):
+    """Every view should run a fixed number of queries however much data there is."""
+
+    def test_query_counts_do_not_grow(self):
+        report = run_benchmarks(sizes=(12, 120), repeat=1, memory=False)
+
+        self.assertEqual(len(report['views']), 18)
+        self.assertEqual(check_report(report), [])
+
+    def test_check_report_flags_regressions(self):
+        result = {'url': '/', 'status': 200, 'queries': 3, 'time_ms': 10.0}
+        baseline = {'views': {'finance:home': {'12': result}}}
+        report = {'views': {'finance:home': {
+            '12': {**result, 'queries': 4, 'time_ms': 40.0},
+            '120': {**result, 'queries': 5},
+        }}}
+
+        problems = check_report(report, baseline)
+        self.assertEqual(len(problems), 3)
+        self.assertIn('grows with the data', problems[0])
+
+
+@override_settings(
+    REQUEST_TIMING=True,
+    REQUEST_TIMING_SLOW_MS=0,
+    MIDDLEWARE=['config.instrumentation.RequestTimingMiddleware', *settings.MIDDLEWARE],
+    TEMPLATES=[{**settings.TEMPLATES[0],
+                'BACKEND': 'config.instrumentation.TimedDjangoTemplates'}],
+)
+class RequestTimingTests(TestCase):
+
+    def test_server_timing_and_slow_request_sql(self):
+        self.client.force_login(User.objects.create_user('tester'))
+        with self.assertLogs('config.instrumentation', 'INFO') as logs:
+            response = self.client.get(reverse('finance:balance_list'))
+
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, ')
+        self.assertIn('path=/finance/balance/ status=200', logs.output[0])
+        slowest = slowest_requests()[0]
+        self.assertEqual(slowest['path'], '/finance/balance/')
+        self.assertEqual(len(slowest['statements']), slowest['queries'])
+
+    def test_sql_run_while_rendering_is_not_template_time(self):
+        def execute(sql, params, many, context):
+            time.sleep(0.02)
+
+        timer = RequestTimer()
+        timer.rendering = True
+        timer(execute, 'SELECT 1', None, False, {})
+        timer.rendering = False
+        timer.template_time = timer.db_time + 0.01
+        timer(execute, 'SELECT 2', None, False, {})
+
+        total = timer.db_time + 0.015
+        db, tpl, app, _ = (float(part.split('dur=')[1].split(';')[0])
+                           for part in timer.server_timing(total).split(', '))
+        self.assertEqual((round(tpl), round(app)), (10, 5))
+        self.assertAlmostEqual(db + tpl + app, total * 1000, delta=0.2)
+
+
+class WarmupTests(TestCase):
+
+    def test_every_template_compiles(self):
+        reset_template_caches()
+        # Quiet, as warm_templates reports for itself
+        with self.assertNoLogs('config.warmup', 'INFO'):
+            timings, errors = warm_templates()
+
+        self.assertEqual(errors, {})
+        self.assertIn('finance/income_form.html', timings)
+        self.assertIn('django/forms/widgets/number.html', timings)
+
+    @override_settings(WARM_TEMPLATES=True)
+    def test_web_worker_warms_and_logs_once(self):
+        reset_template_caches()
+        with self.assertLogs('config.warmup', 'INFO') as logs:
+            warm_worker()
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('Warmed the URLconf and', logs.output[0])
+
+    @override_settings(WARM_TEMPLATES=False)
+    def test_web_worker_warmup_can_be_off(self):
+        with self.assertNoLogs('config.warmup'):
+            warm_worker()
+
+
+class DashboardCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(name) for name in ('first', 'second')]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.balance = MonthBal.objects.create(date=date(2024, 3, 1),
+                                                   huntington_check=Decimal(10))
+            self.income = MonthInc.objects.create(date=date(2024, 3, 1), cdm_salary=Decimal(5))
+
+    def get_dashboards(self):
+        """Each user's dashboard context, as served."""
+        contexts = []
+        for user in self.users:
+            self.client.force_login(user)
+            contexts.append(self.client.get(reverse('finance:home')).context)
+        return contexts
+
+    def test_second_hit_is_served_from_cache(self):
+        self.client.force_login(self.users[0])
+        self.client.get(reverse('finance:home'))
+        # Session, user, the ETag's watermarks and the data token
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('finance:home'))
+        self.assertEqual(response.context['latest_balance'].networth, Money(1000))
+        self.assertEqual(dashboard_cache_stats(),
+                         {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_changes_invalidate_every_users_dashboard(self):
+        self.get_dashboards()
+        changes = [
+            lambda: MonthBal.objects.create(date=date(2024, 4, 1), huntington_check=Decimal(20)),
+            lambda: MonthInc.objects.create(date=date(2024, 4, 1), cdm_salary=Decimal(7)),
+            self.balance.delete,
+            self.income.delete,
+        ]
+        for number, change in enumerate(changes, start=1):
+            with self.subTest(change=number):
+                with self.captureOnCommitCallbacks(execute=True):
+                    change()
+                before = dashboard_cache_stats()
+                self.get_dashboards()
+                self.assertEqual(dashboard_cache_stats()['misses'], before['misses'] + 2)
+                self.get_dashboards()
+                self.assertEqual(dashboard_cache_stats()['hits'], before['hits'] + 2)
+
+    def test_a_write_in_another_process_invalidates_the_dashboards(self):
+        # Each worker process has a local memory cache of its own
+        workers = [LocMemCache(f'worker-{number}', {}) for number in range(2)]
+        self.client.force_login(self.users[0])
+        with mock.patch('finance.cache.cache', workers[0]):
+            self.client.get(reverse('finance:home'))
+            self.assertEqual(dashboard_cache_stats()['misses'], 1)
+
+        with mock.patch('finance.cache.cache', workers[1]):
+            self.client.get(reverse('finance:home'))
+            with self.captureOnCommitCallbacks(execute=True):
+                self.balance.huntington_check = Decimal(30)
+                self.balance.save()
+
+        with mock.patch('finance.cache.cache', workers[0]):
+            response = self.client.get(reverse('finance:home'))
+            self.assertEqual(dashboard_cache_stats()['misses'], 2)
+        self.assertEqual(response.context['latest_balance'].networth, Money(3000))
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.balance = MonthBal.objects.create(date=date(2024, 1, 1),
+                                                   huntington_check=Decimal(10))
+            MonthInc.objects.create(date=date(2024, 1, 1), huntington_interest=Decimal(5))
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, headers={'if-none-match': etag}).status_code
+
+    def test_unchanged_pages_are_not_modified(self):
+        urls = [reverse(name) for name in ('finance:home', 'finance:balance_list',
+                                           'finance:income_list', 'finance:tax_list',
+                                           'finance:analysis', 'finance:reports')]
+        urls.append(reverse('finance:balance_detail', args=[self.balance.pk]))
+        for url in urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                # Session, user and watermarks; none of the view's own queries
+                with self.assertNumQueries(3):
+                    self.assertEqual(self.revalidate(url, etag), 304)
+
+    def test_etags_follow_the_data_each_page_shows(self):
+        balances, taxes = reverse('finance:balance_list'), reverse('finance:tax_list')
+        balance_etag, tax_etag = self.client.get(balances)['ETag'], self.client.get(taxes)['ETag']
+        self.assertEqual(self.revalidate(balances + '?year=2024', balance_etag), 200)
+
+        TaxReturn.objects.create(year=date(2024, 1, 1))
+        self.assertEqual(self.revalidate(balances, balance_etag), 304)
+        self.assertEqual(self.revalidate(taxes, tax_etag), 200)
+
+        self.balance.delete()
+        self.assertEqual(self.revalidate(balances, balance_etag), 200)
+
+    def test_bulk_loads_touch_the_watermarks(self):
+        url = reverse('finance:income_list')
+        etag = self.client.get(url)['ETag']
+        with summaries_suspended():
+            MonthInc.objects.all().delete()
+        self.assertEqual(self.revalidate(url, etag), 200)
+
+
+class AsyncViewTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('tester')
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            for month in (3, 6, 9):
+                balance = MonthBal.objects.create(date=date(2024, month, 1),
+                                                  huntington_check=Decimal(month))
+                income = MonthInc.objects.create(date=date(2024, month, 1),
+                                                 huntington_interest=Decimal(month))
+            TaxReturn.objects.create(year=date(2024, 1, 1))
+        self.urls = [reverse('finance:home'), reverse('finance:balance_list'),
+                     reverse('finance:income_list') + '?year=2024', reverse('finance:tax_list'),
+                     reverse('finance:reports'), reverse('finance:reports') + '?quarter=3-2024',
+                     reverse('finance:balance_detail', args=[balance.pk]),
+                     reverse('finance:income_detail', args=[income.pk])]
+
+    def use_async_views(self):
+        """Route the read views to finance.async_views, as ASYNC_VIEWS does."""
+        self.addCleanup(reload_urlconf)
+        settings_override = override_settings(ASYNC_VIEWS=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        reload_urlconf()
+
+    def test_async_views_render_the_same_pages(self):
+        pages = {url: self.client.get(url) for url in self.urls}
+        self.use_async_views()
+        self.assertEqual(resolve(self.urls[0]).func.__module__, 'finance.async_views')
+        for url, page in pages.items():
+            with self.subTest(url=url):
+                cache.clear()
+                response = self.client.get(url)
+                self.assertEqual(response.content, page.content)
+                self.assertEqual(response['ETag'], page['ETag'])
+                self.assertEqual(self.client.get(url, headers={'if-none-match': page['ETag']})
+                                 .status_code, 304)
+
+    def test_reports_without_records_skip_the_quarters(self):
+        MonthBal.objects.all().delete()
+        MonthInc.objects.all().delete()
+        url = reverse('finance:reports')
+        with self.assertNumQueries(4):  # Session, user, the ETag's data version and the years
+            self.client.get(url)
+        self.use_async_views()
+        with self.assertNumQueries(5):  # The async login check loads the user on its own
+            response = self.client.get(url)
+        self.assertIsNone(response.context['quarter_data'])
+
+    async def test_served_over_asgi(self):
+        self.use_async_views()
+        await self.async_client.aforce_login(self.user)
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual((await self.async_client.get(reverse(
+            'finance:balance_detail', args=[0]))).status_code, 404)
+
+
+def reload_urlconf():
+    importlib.reload(finance_urls)
+    importlib.reload(config_urls)
+    clear_url_caches()
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def pool(self, **options):
+        pool = ConnectionPool(partial(sqlite3.connect, ':memory:', check_same_thread=False),
+                              **options)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_connections_are_reused_and_rolled_back(self):
+        pool = self.pool()
+        first = pool.getconn()
+        first.execute('CREATE TABLE t (x)')
+        first.execute('BEGIN')
+        first.execute('INSERT INTO t VALUES (1)')
+        pool.putconn(first)
+
+        again = pool.getconn()
+        self.assertIs(again, first)
+        self.assertEqual(again.execute('SELECT count(*) FROM t').fetchone(), (0,))
+        self.assertEqual(pool.stats, {'connects': 1, 'reuses': 1, 'discards': 0})
+
+    def test_waits_for_a_free_connection(self):
+        pool = self.pool(max_size=1, timeout=0.01)
+        connection = pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        pool.putconn(connection, discard=True)
+        pool.putconn(pool.getconn())
+        self.assertEqual(pool.stats['connects'], 2)
+
+    def test_stale_and_failing_connections_are_replaced(self):
+        stale = self.pool(max_idle=0)
+        connection = stale.getconn()
+        stale.putconn(connection)
+        self.assertIsNot(stale.getconn(), connection)
+
+        def check(connection):
+            raise sqlite3.OperationalError('server has gone away')
+        failing = self.pool(check=check)
+        connection = failing.getconn()
+        failing.putconn(connection)
+        self.assertIsNot(failing.getconn(), connection)
+        self.assertEqual(failing.stats, {'connects': 2, 'reuses': 0, 'discards': 1})
+
+
+class SQLiteProfileTests(SimpleTestCase):
+
+    def pragmas(self, tuned):
+        """The SQLite settings for SQLITE_TUNED=``tuned``, and what a connection gets."""
+        environ = {'SQLITE_TUNED': tuned, 'DATABASE_HOST': '', 'PYTHONANYWHERE_DOMAIN': ''}
+        with mock.patch.dict(os.environ, environ):
+            database = runpy.run_path(str(settings.BASE_DIR / 'config' / 'settings.py'))[
+                'DATABASES']['default']
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # On its own alias, apart from the test database
+        handler = ConnectionHandler({
+            'default': settings.DATABASES['default'],
+            'profile': {**database, 'NAME': Path(directory.name) / 'db.sqlite3'},
+        })
+        self.addCleanup(handler.close_all)
+        with handler['profile'].cursor() as cursor:
+            pragmas = {}
+            for name in ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store'):
+                cursor.execute(f'PRAGMA {name}')
+                pragmas[name] = cursor.fetchone()[0]
+        return handler['profile'], pragmas
+
+    def test_tuned_profile_sets_the_pragmas(self):
+        connection, pragmas = self.pragmas('True')
+        self.assertEqual(pragmas, {'journal_mode': 'wal', 'synchronous': 1,
+                                   'mmap_size': 268435456, 'cache_size': -65536,
+                                   'temp_store': 2})
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_default_profile_leaves_sqlite_alone(self):
+        connection, pragmas = self.pragmas('False')
+        self.assertEqual(connection.settings_dict['OPTIONS'], {})
+        self.assertEqual((pragmas['journal_mode'], pragmas['synchronous'], pragmas['temp_store']),
+                         ('delete', 2, 0))
+        self.assertIsNone(connection.transaction_mode)
+
+    def test_benchmark_runs_both_profiles(self):
+        stdout = StringIO()
+        call_command('benchmark_sqlite', readers=1, writers=1, seconds=0.2, months=3,
+                     stdout=stdout)
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual([line.split()[:2] for line in lines[2:]],
+                         [['default', 'delete'], ['tuned', 'wal']])
+
+    def test_benchmark_reports_a_failing_worker(self):
+        def write(index):
+            raise TypeError('unsupported operand')
+
+        with self.assertRaises(CommandError) as caught:
+            run_workers([('reads', lambda index: None, 0), ('writes', write, 0)], 0.1)
+        self.assertIn('A writes process failed', str(caught.exception))
+        self.assertIn('TypeError: unsupported operand', str(caught.exception))
+
+
+class FakeConnection:
+    """Stands in for a MySQLdb connection handed out by the pool."""
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@skipUnless(mysql_pool, 'mysqlclient is not installed')
+class MySQLPoolBackendTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(mysql_pool.mysql.Database, 'connect',
+                                    side_effect=lambda **params: FakeConnection())
+        self.connect = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def wrapper(self, pool):
+        wrapper = mysql_pool.DatabaseWrapper({
+            'ENGINE': 'config.mysql_pool', 'NAME': 'finance', 'USER': '', 'PASSWORD': '',
+            'HOST': '', 'PORT': '', 'OPTIONS': {'pool': pool}, 'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False, 'TIME_ZONE': None, 'AUTOCOMMIT': True,
+            'ATOMIC_REQUESTS': False, 'TEST': {},
+        }, alias='pooled')
+        self.addCleanup(wrapper.close_pool)
+        return wrapper
+
+    def test_connections_are_checked_out_and_returned(self):
+        wrapper = self.wrapper(True)
+        wrapper.connection = wrapper.get_new_connection({})
+        first = wrapper.connection
+        wrapper._close()
+        self.assertIsNone(wrapper.connection)
+
+        self.assertIs(wrapper.get_new_connection({}), first)
+        self.assertEqual(self.connect.call_count, 1)
+        self.assertNotIn('pool', self.connect.call_args.kwargs)
+        self.assertEqual(wrapper.pool.stats, {'connects': 1, 'reuses': 1, 'discards': 0})
+
+    def test_pool_size_is_limited(self):
+        wrapper = self.wrapper({'max_size': 1, 'timeout': 0.01})
+        wrapper.connection = wrapper.get_new_connection({})
+        with self.assertRaises(OperationalError):
+            wrapper.get_new_connection({})
+        wrapper._close()
+        self.assertIsNotNone(wrapper.get_new_connection({}))
+        self.assertEqual(self.connect.call_count, 1)
+
+
+class StaticPipelineTests(TestCase):
+
+    def setUp(self):
+        source, root = tempfile.TemporaryDirectory(), tempfile.TemporaryDirectory()
+        self.addCleanup(source.cleanup)
+        self.addCleanup(root.cleanup)
+        self.root = Path(root.name)
+        (Path(source.name) / 'css').mkdir()
+        self.css = b'.card { padding: 1rem; }\n' * 50
+        (Path(source.name) / 'css' / 'site.css').write_bytes(self.css)
+
+        settings_override = override_settings(
+            STATICFILES_DIRS=[source.name], STATIC_ROOT=root.name,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={**settings.STORAGES, 'staticfiles': {
+                'BACKEND': 'config.storage.CompressedManifestStaticFilesStorage'}})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        hashed = staticfiles_storage.stored_name('css/site.css')
+        self.assertRegex(hashed, r'^css/site\.[0-9a-f]{12}\.css$')
+        self.assertEqual(gzip.decompress((self.root / (hashed + '.gz')).read_bytes()), self.css)
+        self.assertTrue((self.root / 'css/site.css.gz').exists())
+        self.assertFalse((self.root / 'staticfiles.json.gz').exists())
+
+    def test_middleware_serves_compressed_files_with_far_future_headers(self):
+        middleware = StaticFilesMiddleware(lambda request: HttpResponseNotFound())
+        hashed = staticfiles_storage.url('css/site.css')
+        factory = RequestFactory()
+
+        response = middleware(factory.get(hashed, HTTP_ACCEPT_ENCODING='gzip, deflate'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.css)
+
+        plain = middleware(factory.get('/static/css/site.css'))
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertNotIn('immutable', plain['Cache-Control'])
+        self.assertEqual(b''.join(plain.streaming_content), self.css)
+        self.assertEqual(middleware(factory.get('/static/../manage.py')).status_code, 404)
+
+    def test_middleware_answers_conditional_gets(self):
+        middleware = StaticFilesMiddleware(lambda request: HttpResponseNotFound())
+        factory = RequestFactory()
+        response = middleware(factory.get('/static/css/site.css'))
+        gzipped = middleware(factory.get('/static/css/site.css', HTTP_ACCEPT_ENCODING='gzip'))
+        self.assertNotEqual(response['ETag'], gzipped['ETag'])
+
+        for headers in ({'If-None-Match': response['ETag']},
+                        {'If-Modified-Since': response['Last-Modified']}):
+            with self.subTest(headers=headers):
+                not_modified = middleware(factory.get('/static/css/site.css', headers=headers))
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified['ETag'], response['ETag'])
+                self.assertIn('max-age', not_modified['Cache-Control'])
+        changed = middleware(factory.get('/static/css/site.css', headers={
+            'If-None-Match': gzipped['ETag'], 'If-Modified-Since': response['Last-Modified']}))
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(b''.join(changed.streaming_content), self.css)
+
+    def test_deploy_check_warns_about_cdn_assets(self):
+        with override_settings(SELF_HOSTED_ASSETS=False, BASE_DIR=self.root):
+            warnings = check_self_hosted_assets()
+        self.assertEqual([warning.id for warning in warnings], ['finance.W001'])
+        self.assertIn('vendor/lucide.min.js', warnings[0].msg)
+        with override_settings(SELF_HOSTED_ASSETS=True):
+            self.assertEqual(check_self_hosted_assets(), [])
+
+
+class PaginationTests(TestCase):
+
+    def setUp(self):
+        for month in range(1, 8):
+            MonthBal.objects.create(date=date(2024, month, 1), huntington_check=Decimal(month))
+        self.summaries = MonthlySummary.objects.filter(balance__isnull=False)
+
+    def dates(self, page):
+        return [summary.date.month for summary in page]
+
+    def test_pages_follow_cursors_both_ways(self):
+        first = paginate_by_date(self.summaries, page_size=3)
+        self.assertEqual(self.dates(first), [7, 6, 5])
+        self.assertIsNone(first.previous_cursor)
+
+        second = paginate_by_date(self.summaries, first.next_cursor, page_size=3)
+        last = paginate_by_date(self.summaries, second.next_cursor, page_size=3)
+        self.assertEqual(self.dates(second), [4, 3, 2])
+        self.assertEqual(self.dates(last), [1])
+        self.assertIsNone(last.next_cursor)
+
+        back = paginate_by_date(self.summaries, last.previous_cursor, page_size=3)
+        self.assertEqual(self.dates(back), [4, 3, 2])
+        self.assertEqual(self.dates(paginate_by_date(self.summaries, back.previous_cursor,
+                                                     page_size=3)), [7, 6, 5])
+
+    @override_settings(FINANCE_PAGE_SIZE=2)
+    def test_list_view_keeps_filters_and_totals_the_page(self):
+        user = User.objects.create_user('tester')
+        self.client.force_login(user)
+
+        response = self.client.get(reverse('finance:balance_list'), {'year': '2024'})
+        page = response.context['balances']
+        self.assertEqual(self.dates(page), [7, 6])
+        self.assertEqual(response.context['page_totals']['total_check'], Money(650))
+
+        response = self.client.get(reverse('finance:balance_list'),
+                                   {'year': '2024', 'cursor': page.next_cursor})
+        self.assertEqual(self.dates(response.context['balances']), [5, 4])
+        self.assertContains(response, 'year=2024&amp;cursor=')
+
+        response = self.client.get(reverse('finance:balance_list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(self.dates(response.context['balances']), [7, 6])
+
+    def test_list_view_reads_rows_of_the_shown_columns(self):
+        self.client.force_login(User.objects.create_user('tester'))
+
+        response = self.client.get(reverse('finance:balance_list'))
+        row = response.context['balances'][0]
+        self.assertEqual(row._fields, ('date', 'balance_id', *BALANCE_COLUMNS))
+        self.assertEqual((row.total_check, row.networth), (Money(700), Money(700)))
+        self.assertContains(response, reverse('finance:balance_edit', args=[row.balance_id]))
+
+
+class SeriesTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester'))
+        # The writes touch the watermarks, so columns cached by other tests are dropped
+        for month in range(1, 7):
+            MonthInc.objects.create(date=date(2024, month, 1), huntington_interest=Decimal(month))
+
+    def get(self, **params):
+        return self.client.get(reverse('finance:series'), {'type': 'income', **params})
+
+    def test_quarter_buckets_are_summed(self):
+        data = self.get(category=['total_interest', 'huntington_interest'],
+                        bucket='quarter').json()
+
+        self.assertEqual(data['labels'], ['2024-01-01', '2024-04-01'])
+        self.assertEqual(data['series']['total_interest'], [6.0, 15.0])
+        self.assertEqual(data['series']['huntington_interest'], [6.0, 15.0])
+        self.assertEqual(data['stats']['total_interest']['highest'], 15.0)
+
+    def test_date_range_and_downsampling(self):
+        data = self.get(category='huntington_interest', points=3,
+                        **{'from': '2024-02', 'to': '2024-05'}).json()
+
+        self.assertTrue(data['downsampled'])
+        self.assertEqual(data['labels'][0], '2024-02-01')
+        self.assertEqual(data['labels'][-1], '2024-05-01')
+        self.assertEqual(data['stats']['huntington_interest']['count'], 4)
+
+    def test_monthly_series_come_from_the_column_store(self):
+        self.get(category=['total_interest', 'huntington_interest'])
+        # Session, user, the ETag's data version and the column store's data token
+        with self.assertNumQueries(4):
+            data = self.get(category=['total_interest', 'huntington_interest'],
+                            **{'from': '2024-05'}).json()
+        self.assertEqual(data['series'], {'total_interest': [5.0, 6.0],
+                                          'huntington_interest': [5.0, 6.0]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MonthInc.objects.filter(date=date(2024, 6, 1)).update(huntington_interest=Decimal(10))
+            refresh_summaries([date(2024, 6, 1)])
+        data = self.get(category='total_interest', **{'from': '2024-05'}).json()
+        self.assertEqual(data['series']['total_interest'], [5.0, 10.0])
+        self.assertEqual(data['stats']['total_interest']['highest'], 10.0)
+
+    def test_a_write_in_another_process_drops_the_columns(self):
+        self.assertEqual(columns.column('income', 'total_interest').values[-1], 6.0)
+        # The other process has a local memory cache of its own
+        with mock.patch('finance.cache.cache', LocMemCache('other-worker', {})):
+            with self.captureOnCommitCallbacks(execute=True):
+                income = MonthInc.objects.get(date=date(2024, 6, 1))
+                income.huntington_interest = Decimal(10)
+                income.save()
+        self.assertEqual(columns.column('income', 'total_interest').values[-1], 10.0)
+
+    def test_records_without_a_summary_are_missing_not_zero(self):
+        with self.captureOnCommitCallbacks(execute=True), summaries_suspended():
+            MonthInc.objects.create(date=date(2024, 7, 1), huntington_interest=Decimal(7))
+        data = self.get(category=['total_interest', 'huntington_interest'],
+                        **{'from': '2024-06'}).json()
+        self.assertEqual(data['series'], {'total_interest': [6.0, None],
+                                          'huntington_interest': [6.0, 7.0]})
+        self.assertEqual(data['stats']['total_interest'],
+                         {'current': 6.0, 'highest': 6.0, 'lowest': 6.0, 'count': 1})
+
+    def test_compare_series_of_both_types(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            MonthBal.objects.create(date=date(2024, 6, 1), huntington_check=Decimal(100))
+            MonthBal.objects.create(date=date(2024, 7, 1), huntington_check=Decimal(200))
+        categories = ['total_interest', 'huntington_interest', 'balance:networth',
+                      'balance:huntington_check']
+
+        # One query per type loads all of its columns
+        with self.assertNumQueries(6):
+            data = self.get(category=categories, **{'from': '2024-05'}).json()
+        self.assertEqual(data['labels'], ['2024-05-01', '2024-06-01', '2024-07-01'])
+        self.assertEqual(data['series'], {'total_interest': [5.0, 6.0, None],
+                                          'huntington_interest': [5.0, 6.0, None],
+                                          'balance:networth': [None, 100.0, 200.0],
+                                          'balance:huntington_check': [None, 100.0, 200.0]})
+
+        with self.assertNumQueries(6):
+            data = self.get(category=categories, bucket='year', analytics=1).json()
+        self.assertEqual(data['series']['total_interest'], [21.0])
+        self.assertEqual(data['series']['balance:networth'], [150.0])
+        self.assertEqual(data['analytics']['balance:networth']['mean'], 150.0)
+
+    def test_unknown_category_is_rejected(self):
+        self.assertEqual(self.get(category='networth').status_code, 400)
+        self.assertEqual(self.get(category='tax:networth').status_code, 400)
+
+    def test_etag_revalidation(self):
+        etag = self.get()['ETag']
+        url = reverse('finance:series')
+        self.assertEqual(self.client.get(url, {'type': 'income'},
+                                         headers={'if-none-match': etag}).status_code, 304)
+        # Other parameters or changed data give a different ETag
+        self.assertEqual(self.client.get(url, headers={'if-none-match': etag}).status_code, 200)
+        MonthInc.objects.filter(date=date(2024, 1, 1)).get().save()
+        self.assertEqual(self.client.get(url, {'type': 'income'},
+                                         headers={'if-none-match': etag}).status_code, 200)
+
+    def test_lttb_keeps_ends_and_peaks(self):
+        ys = [0] * 50 + [100] + [0] * 49
+        picked = lttb(list(range(100)), ys, 10)
+
+        self.assertEqual(len(picked), 10)
+        self.assertEqual((picked[0], picked[-1]), (0, 99))
+        self.assertIn(50, picked)
+
+
+class SeriesStatsTests(TestCase):
+
+    def column(self, values, start_year=2020):
+        dates = [date(start_year + month // 12, month % 12 + 1, 1).toordinal()
+                 for month in range(len(values))]
+        return Column(array('l', dates), array('d', values))
+
+    def test_growth_and_changes(self):
+        # Doubles over two years, with one dip
+        values = [100 + 100 * month / 24 for month in range(25)]
+        values[12] = 120
+        stats = series_stats(self.column(values))
+
+        self.assertEqual(stats['cagr_percent'], 41.42)
+        self.assertEqual(stats['rolling_mean']['3'], round(sum(values[-3:]) / 3, 2))
+        self.assertEqual(stats['month_over_month']['amount'], round(200 - values[-2], 2))
+        self.assertEqual(stats['year_over_year'], {'amount': 80.0, 'percent': 66.67})
+        self.assertEqual(stats['max_drawdown_percent'], round((145.83 - 120) / 145.83 * 100, 2))
+        self.assertAlmostEqual(stats['trend']['per_month'], 4.2, delta=0.2)
+
+    def test_short_and_empty_series(self):
+        stats = series_stats(self.column([50.0]))
+        self.assertEqual(stats['rolling_mean'], {})
+        self.assertIsNone(stats['month_over_month'])
+        self.assertIsNone(stats['cagr_percent'])
+        self.assertIsNone(series_stats(self.column([])))
+
+    def test_missing_values_are_skipped(self):
+        column = self.column([10.0, math.nan, 30.0])
+        self.assertEqual(column.stats(), {'current': 30.0, 'highest': 30.0, 'lowest': 10.0,
+                                          'count': 2})
+        stats = series_stats(column)
+        self.assertEqual(stats['mean'], 20.0)
+        self.assertEqual(stats['month_over_month'], {'amount': 20.0, 'percent': 200.0})
+        self.assertEqual(stats['max_drawdown_percent'], 0.0)
+        self.assertIsNone(series_stats(self.column([math.nan])))
+
+    def test_results_are_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            MonthBal.objects.create(date=date(2024, 1, 1), huntington_check=Decimal(10))
+            MonthBal.objects.create(date=date(2024, 2, 1), huntington_check=Decimal(20))
+
+        self.assertEqual(get_series_stats('balance', 'networth')['mean'], 15.0)
+        with self.assertNumQueries(1):  # The data token
+            get_series_stats('balance', 'networth')
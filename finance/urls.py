@@ -1,21 +1,29 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = 'finance'
 
+# With ASYNC_VIEWS the read views run their independent lookups together
+read_views = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns = [
-    path('', views.home, name='home'),
-    path('balance/', views.balance_list, name='balance_list'),
+    path('', read_views.home, name='home'),
+    path('balance/', read_views.balance_list, name='balance_list'),
     path('balance/add/', views.balance_add, name='balance_add'),
-    path('balance/<int:pk>/', views.balance_detail, name='balance_detail'),
+    path('balance/export/', views.balance_export, name='balance_export'),
+    path('balance/<int:pk>/', read_views.balance_detail, name='balance_detail'),
     path('balance/<int:pk>/edit/', views.balance_edit, name='balance_edit'),
-    path('income/', views.income_list, name='income_list'),
+    path('income/', read_views.income_list, name='income_list'),
     path('income/add/', views.income_add, name='income_add'),
-    path('income/<int:pk>/', views.income_detail, name='income_detail'),
+    path('income/export/', views.income_export, name='income_export'),
+    path('income/<int:pk>/', read_views.income_detail, name='income_detail'),
     path('income/<int:pk>/edit/', views.income_edit, name='income_edit'),
-    path('taxes/', views.tax_list, name='tax_list'),
+    path('taxes/', read_views.tax_list, name='tax_list'),
     path('taxes/add/', views.tax_add, name='tax_add'),
     path('taxes/<int:pk>/edit/', views.tax_edit, name='tax_edit'),
     path('analysis/', views.analysis, name='analysis'),
-    path('reports/', views.reports, name='reports'),
+    path('reports/', read_views.reports, name='reports'),
+    path('api/series/', views.series, name='series'),
+    path('cache/stats/', views.cache_stats, name='cache_stats'),
 ]
@@ -1,66 +1,197 @@
+import hashlib
+from datetime import date, timedelta
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.contrib.auth.decorators import login_required
-from django.db.models import Sum
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.http import JsonResponse
+from django.db.models import Max, Min, Sum
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from decimal import Decimal
-from .models import MonthBal, MonthInc, TaxReturn
+from .models import MonthBal, MonthInc, MonthlySummary, TaxReturn, money_avg, next_month
 from .forms import MonthBalForm, MonthIncForm, TaxReturnForm
+from .reporting import get_quarters_data
+from .cache import dashboard_cache_stats, data_token, get_dashboard_context
+from .exports import export_response
+from .pagination import page_totals, paginate_by_date
+from .registry import BALANCE, CATEGORY_LABELS, INCOME, REGISTRIES
+from .stats import get_series_stats
+from .watermarks import watermark_etag
+from .series import (BUCKETS, SERIES_MAX_POINTS, SERIES_SOURCES, data_version, get_series,
+                     series_categories, split_category)
+
+
+# Summary columns shown in the list tables, averaged or summed per page
+BALANCE_COLUMNS = ['total_check', 'total_save', 'total_invest', 'total_retire', 'total_property',
+                   'total_assets', 'total_liabilities', 'networth']
+INCOME_COLUMNS = ['total_salary', 'total_other_income', 'total_income', 'total_taxes',
+                  'total_housing', 'total_utilities', 'total_allsavings', 'total_expenses',
+                  'total_surplus']
+
+# Summary fields of the latest month shown on the dashboard
+DASHBOARD_BALANCE_FIELDS = ['date', 'total_check', 'total_save', 'total_invest', 'total_retire',
+                            'total_property', 'total_assets', 'total_credit', 'total_loan',
+                            'total_liabilities', 'networth']
+DASHBOARD_INCOME_FIELDS = ['date', 'total_surplus']
+
+
+def get_int_param(value, minimum, maximum):
+    """Parse a query string value as an int in range, or None if it isn't one."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if minimum <= value <= maximum else None
+
+
+def get_month_param(value, end=False):
+    """
+    Parse a query string date, YYYY-MM-DD or just YYYY-MM. A bare month means
+    its first day, or its last day when ``end`` is set. None if it isn't one.
+    """
+    try:
+        day = date.fromisoformat(value if len(value) > 7 else value + '-01')
+    except (TypeError, ValueError):
+        return None
+    if end and len(value) <= 7:
+        return next_month(day) - timedelta(days=1)
+    return day
+
+
+def available_years(model):
+    """Years from the newest record back to the oldest, for the filter dropdowns."""
+    return years_between(model.objects.aggregate(first=Min('date'), last=Max('date')))
+
+
+def years_between(bounds):
+    if bounds['first'] is None:
+        return []
+    return list(range(bounds['last'].year, bounds['first'].year - 1, -1))
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=watermark_etag(MonthBal, MonthInc))
 def home(request):
-    # Get the most recent balance record
-    latest_balance = MonthBal.objects.first()  # Already ordered by -date in model
-
-    # Get the most recent income record
-    latest_income = MonthInc.objects.first()
+    def build_context():
+        # Totals come precomputed from the summary table, read as rows of
+        # just the fields shown
+        return dashboard_context(
+            MonthlySummary.objects.filter(balance__isnull=False)
+            .rows(*DASHBOARD_BALANCE_FIELDS).first(),
+            MonthlySummary.objects.filter(income__isnull=False)
+            .rows(*DASHBOARD_INCOME_FIELDS).first(),
+        )
+
+    # Cached until a balance or income record changes
+    context = get_dashboard_context(request.user, build_context)
 
-    # Get last 12 months of balances for the chart
-    recent_balances = MonthBal.objects.all()[:12]
+    return render(request, 'finance/home.html', context)
 
-    # Prepare chart data (reversed so oldest is first)
-    chart_labels = []
-    chart_networth = []
-    chart_assets = []
-    chart_liabilities = []
 
-    for balance in reversed(list(recent_balances)):
-        chart_labels.append(balance.date.strftime('%b %Y'))
-        chart_networth.append(float(balance.networth()))
-        chart_assets.append(float(balance.total_assets()))
-        chart_liabilities.append(float(balance.total_liabilities()))
+def dashboard_context(latest_balance, latest_income):
+    # The chart fetches the 12 months up to the latest balance from the series API
+    chart_from = None
+    if latest_balance:
+        year, month = divmod(latest_balance.date.year * 12 + latest_balance.date.month - 12, 12)
+        chart_from = date(year, month + 1, 1)
 
-    context = {
+    return {
         'latest_balance': latest_balance,
         'latest_income': latest_income,
-        'chart_labels': chart_labels,
-        'chart_networth': chart_networth,
-        'chart_assets': chart_assets,
-        'chart_liabilities': chart_liabilities,
+        'chart_from': chart_from,
     }
 
-    return render(request, 'finance/home.html', context)
+
+def series_version(request):
+    # Computed once for both the ETag and Last-Modified checks
+    if not hasattr(request, '_series_version'):
+        request._series_version = data_version()
+    return request._series_version
+
+
+def series_etag(request):
+    version = series_version(request)
+    key = f"{version['last_modified']}:{version['count']}:{request.GET.urlencode()}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def series_last_modified(request):
+    return series_version(request)['last_modified']
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=series_etag, last_modified_func=series_last_modified)
+def series(request):
+    """
+    Chart data as JSON: one or more ``category`` series of balance or income
+    ``type`` (series of the other type prefixed with it, e.g.
+    ``income:total_income``), between the optional ``from`` and ``to`` dates, bucketed by
+    month, quarter or year and downsampled to at most ``points`` points.
+    With ``analytics`` set, the monthly analytics of each series are added.
+    """
+    data_type = request.GET.get('type', 'balance')
+    if data_type not in SERIES_SOURCES:
+        return JsonResponse({'error': f'Unknown type {data_type!r}'}, status=400)
+    categories = request.GET.getlist('category') or [
+        'networth' if data_type == 'balance' else 'total_income']
+    unknown = []
+    for category in categories:
+        source, name = split_category(data_type, category)
+        if source not in SERIES_SOURCES or name not in series_categories(source):
+            unknown.append(category)
+    if unknown:
+        return JsonResponse(
+            {'error': f"Unknown {data_type} categories: {', '.join(sorted(unknown))}"},
+            status=400)
+    bucket = request.GET.get('bucket', 'month')
+    if bucket not in BUCKETS:
+        return JsonResponse({'error': f'Unknown bucket {bucket!r}'}, status=400)
+
+    start = get_month_param(request.GET.get('from'))
+    end = get_month_param(request.GET.get('to'), end=True)
+    # Read once for the column store and the stats of every series
+    token = data_token()
+    data = get_series(
+        data_type, categories, start=start, end=end, bucket=bucket,
+        max_points=get_int_param(request.GET.get('points'), 3, SERIES_MAX_POINTS)
+        or SERIES_MAX_POINTS, token=token,
+    )
+    # Monthly analytics (rolling means, CAGR, drawdown, ...) on request
+    if request.GET.get('analytics'):
+        data['analytics'] = {
+            category: get_series_stats(*split_category(data_type, category), start, end,
+                                       token)
+            for category in categories}
+    return JsonResponse(data, json_dumps_params={'separators': (',', ':')})
+
+
+@user_passes_test(lambda user: user.is_staff)
+def cache_stats(request):
+    return JsonResponse({'dashboard': dashboard_cache_stats()})
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=watermark_etag(MonthBal))
 def balance_list(request):
-    balances = MonthBal.objects.all()
+    balances = MonthlySummary.objects.filter(balance__isnull=False)
 
     # Get filter parameters
     year = request.GET.get('year')
     month = request.GET.get('month')
 
-    if year:
-        balances = balances.filter(date__year=year)
-    if month:
-        balances = balances.filter(date__month=month)
-
-    # Get available years and months for filter dropdowns
-    available_years = MonthBal.objects.dates('date', 'year', order='DESC')
+    balances = balances.for_period(get_int_param(year, 1, 9998), get_int_param(month, 1, 12))
+    page = paginate_by_date(balances.rows('date', 'balance_id', *BALANCE_COLUMNS),
+                            request.GET.get('cursor'))
 
     context = {
-        'balances': balances,
-        'available_years': available_years,
+        'balances': page,
+        'page_totals': page_totals(balances, page,
+                                   **{name: money_avg(name) for name in BALANCE_COLUMNS}),
+        'available_years': available_years(MonthBal),
         'selected_year': year,
         'selected_month': month,
     }
@@ -69,24 +200,23 @@ def balance_list(request):
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=watermark_etag(MonthInc))
 def income_list(request):
-    incomes = MonthInc.objects.all()
+    incomes = MonthlySummary.objects.filter(income__isnull=False)
 
     # Get filter parameters
     year = request.GET.get('year')
     month = request.GET.get('month')
 
-    if year:
-        incomes = incomes.filter(date__year=year)
-    if month:
-        incomes = incomes.filter(date__month=month)
-
-    # Get available years for filter dropdown
-    available_years = MonthInc.objects.dates('date', 'year', order='DESC')
+    incomes = incomes.for_period(get_int_param(year, 1, 9998), get_int_param(month, 1, 12))
+    page = paginate_by_date(incomes.rows('date', 'income_id', *INCOME_COLUMNS),
+                            request.GET.get('cursor'))
 
     context = {
-        'incomes': incomes,
-        'available_years': available_years,
+        'incomes': page,
+        'page_totals': page_totals(incomes, page, **{name: Sum(name) for name in INCOME_COLUMNS}),
+        'available_years': available_years(MonthInc),
         'selected_year': year,
         'selected_month': month,
     }
@@ -94,6 +224,20 @@ def income_list(request):
     return render(request, 'finance/income_list.html', context)
 
 
+@login_required
+def balance_export(request):
+    balances = MonthBal.objects.for_period(get_int_param(request.GET.get('year'), 1, 9998),
+                                           get_int_param(request.GET.get('month'), 1, 12))
+    return export_response(balances, 'balances', request.GET.get('format'))
+
+
+@login_required
+def income_export(request):
+    incomes = MonthInc.objects.for_period(get_int_param(request.GET.get('year'), 1, 9998),
+                                          get_int_param(request.GET.get('month'), 1, 12))
+    return export_response(incomes, 'income', request.GET.get('format'))
+
+
 @login_required
 def balance_add(request):
     if request.method == 'POST':
@@ -105,20 +249,8 @@ def balance_add(request):
     else:
         form = MonthBalForm()
 
-    # Group fields for organized display
-    field_groups = {
-        'Checking Accounts': ['huntington_check', 'fifththird_check'],
-        'Savings Accounts': ['huntington_save', 'fifththird_save', 'capone_save', 'amex_save'],
-        'Investments': ['robinhood_invest', 'deacon_invest', 'buckeye_invest'],
-        'Retirement': ['opers_retire', 'four57_retire', 'four01_retire', 'roth_retire'],
-        'Property': ['main_home', 'justin_car', 'kat_car'],
-        'Credit Cards': ['capone_credit', 'amex_credit', 'discover_credit'],
-        'Loans': ['car_loan', 'pubstudent_loan', 'privstudent_loan', 'main_mortgage'],
-    }
-
     context = {
         'form': form,
-        'field_groups': field_groups,
     }
 
     return render(request, 'finance/balance_form.html', context)
@@ -135,26 +267,8 @@ def income_add(request):
     else:
         form = MonthIncForm()
 
-    # Group fields for organized display
-    field_groups = {
-        'Interest Income': ['huntington_interest', 'fifththird_interest', 'capone_interest', 'amex_interest', 'schwab_interest'],
-        'Salary & Dividends': ['supremecourt_salary', 'cdm_salary', 'schwab_dividends'],
-        'Other Income': ['expense_checks', 'miscellaneous_income', 'refund_rebate_repayment', 'gift_income'],
-        'Retirement Contributions': ['opers_retirement', 'four57b_retirement', 'four01k_retirement', 'roth_retirement'],
-        'Investment Contributions': ['robinhood_investments', 'schwab_investments'],
-        'Savings Contributions': ['amex_savings', 'fifththird_savings', 'capone_savings', 'five29_college', 'huntington_savings'],
-        'Taxes': ['federal_tax', 'social_security', 'medicare', 'ohio_tax', 'columbus_tax'],
-        'Benefits': ['health_insurance', 'supplementallife_insurance', 'flex_spending', 'cdm_std', 'cdmsupplemental_ltd', 'parking', 'parking_admin'],
-        'Housing': ['main_mortgage', 'hoa_fees'],
-        'Utilities': ['aep_electric', 'rumpke_trash', 'delaware_sewer', 'delco_water', 'suburban_gas', 'verizon_kat', 'sprint_justin', 'directtv_cable', 'timewarner_internet'],
-        'Loans': ['caponeauto_loan', 'public_loan', 'private_loan'],
-        'Credit Cards': ['capone_creditcard', 'amex_creditcard', 'discover_creditcard', 'kohls_vicsec_macy_eddiebauer_creditcards', 'katwork_creditcard'],
-        'Other Expenses': ['auto_insurance', 'cashorcheck_purchases', 'daycare', 'taxdeductible_giving'],
-    }
-
     context = {
         'form': form,
-        'field_groups': field_groups,
     }
 
     return render(request, 'finance/income_form.html', context)
@@ -173,19 +287,8 @@ def balance_edit(request, pk):
     else:
         form = MonthBalForm(instance=balance)
 
-    field_groups = {
-        'Checking Accounts': ['huntington_check', 'fifththird_check'],
-        'Savings Accounts': ['huntington_save', 'fifththird_save', 'capone_save', 'amex_save'],
-        'Investments': ['robinhood_invest', 'deacon_invest', 'buckeye_invest'],
-        'Retirement': ['opers_retire', 'four57_retire', 'four01_retire', 'roth_retire'],
-        'Property': ['main_home', 'justin_car', 'kat_car'],
-        'Credit Cards': ['capone_credit', 'amex_credit', 'discover_credit'],
-        'Loans': ['car_loan', 'pubstudent_loan', 'privstudent_loan', 'main_mortgage'],
-    }
-
     context = {
         'form': form,
-        'field_groups': field_groups,
         'editing': True,
         'balance': balance,
     }
@@ -206,34 +309,8 @@ def income_edit(request, pk):
     else:
         form = MonthIncForm(instance=income)
 
-    field_groups = {
-        'Interest Income': ['huntington_interest', 'fifththird_interest', 'capone_interest',
-                            'amex_interest', 'schwab_interest'],
-        'Salary & Dividends': ['supremecourt_salary', 'cdm_salary', 'schwab_dividends'],
-        'Other Income': ['expense_checks', 'miscellaneous_income', 'refund_rebate_repayment',
-                         'gift_income'],
-        'Retirement Contributions': ['opers_retirement', 'four57b_retirement', 'four01k_retirement',
-                                     'roth_retirement'],
-        'Investment Contributions': ['robinhood_investments', 'schwab_investments'],
-        'Savings Contributions': ['amex_savings', 'fifththird_savings', 'capone_savings',
-                                  'five29_college', 'huntington_savings'],
-        'Taxes': ['federal_tax', 'social_security', 'medicare', 'ohio_tax', 'columbus_tax'],
-        'Benefits': ['health_insurance', 'supplementallife_insurance', 'flex_spending', 'cdm_std',
-                     'cdmsupplemental_ltd', 'parking', 'parking_admin'],
-        'Housing': ['main_mortgage', 'hoa_fees'],
-        'Utilities': ['aep_electric', 'rumpke_trash', 'delaware_sewer', 'delco_water',
-                      'suburban_gas', 'verizon_kat', 'sprint_justin', 'directtv_cable',
-                      'timewarner_internet'],
-        'Loans': ['caponeauto_loan', 'public_loan', 'private_loan'],
-        'Credit Cards': ['capone_creditcard', 'amex_creditcard', 'discover_creditcard',
-                         'kohls_vicsec_macy_eddiebauer_creditcards', 'katwork_creditcard'],
-        'Other Expenses': ['auto_insurance', 'cashorcheck_purchases', 'daycare',
-                           'taxdeductible_giving'],
-    }
-
     context = {
         'form': form,
-        'field_groups': field_groups,
         'editing': True,
         'income': income,
     }
@@ -242,6 +319,8 @@ def income_edit(request, pk):
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=watermark_etag(TaxReturn))
 def tax_list(request):
     taxes = TaxReturn.objects.all()
 
@@ -294,140 +373,44 @@ def tax_edit(request, pk):
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=watermark_etag(MonthBal, MonthInc))
 def analysis(request):
-    # Summary categories (groups)
-    balance_summary = {
-        'Net Worth': 'networth',
-        'Total Assets': 'total_assets',
-        'Total Liabilities': 'total_liabilities',
-        'Checking': 'total_check',
-        'Savings': 'total_save',
-        'Investments': 'total_invest',
-        'Retirement': 'total_retire',
-        'Property': 'total_property',
-        'Credit Cards': 'total_credit',
-        'Loans': 'total_loan',
-    }
-
-    # Detailed categories (individual accounts)
-    balance_detail = {
-        'Huntington Checking': 'huntington_check',
-        'Fifth Third Checking': 'fifththird_check',
-        'Huntington Savings': 'huntington_save',
-        'Fifth Third Savings': 'fifththird_save',
-        'Capital One Savings': 'capone_save',
-        'Amex Savings': 'amex_save',
-        'Robinhood': 'robinhood_invest',
-        'Deacon': 'deacon_invest',
-        'Buckeye': 'buckeye_invest',
-        'OPERS': 'opers_retire',
-        '457 Retirement': 'four57_retire',
-        '401k': 'four01_retire',
-        'Roth IRA': 'roth_retire',
-        'Main Home': 'main_home',
-        'Justin Car': 'justin_car',
-        'Kat Car': 'kat_car',
-        'Capital One Credit': 'capone_credit',
-        'Amex Credit': 'amex_credit',
-        'Discover Credit': 'discover_credit',
-        'Car Loan': 'car_loan',
-        'Public Student Loan': 'pubstudent_loan',
-        'Private Student Loan': 'privstudent_loan',
-        'Mortgage': 'main_mortgage',
-    }
-
-    income_summary = {
-        'Total Income': 'total_income',
-        'Total Salary': 'total_salary',
-        'Total Expenses': 'total_expenses',
-        'Total Surplus': 'total_surplus',
-        'Total Taxes': 'total_taxes',
-        'Total Savings': 'total_allsavings',
-        'Total Utilities': 'total_utilities',
-        'Total Housing': 'total_housing',
-    }
-
-    income_detail = {
-        'Supreme Court Salary': 'supremecourt_salary',
-        'CDM Salary': 'cdm_salary',
-        'Federal Tax': 'federal_tax',
-        'Social Security': 'social_security',
-        'Medicare': 'medicare',
-        'Ohio Tax': 'ohio_tax',
-        'Columbus Tax': 'columbus_tax',
-        'Health Insurance': 'health_insurance',
-        'Mortgage Payment': 'main_mortgage',
-        'HOA Fees': 'hoa_fees',
-        'Auto Insurance': 'auto_insurance',
-        'AEP Electric': 'aep_electric',
-        'Rumpke Trash': 'rumpke_trash',
-        'Delaware Sewer': 'delaware_sewer',
-        'Delco Water': 'delco_water',
-        'Suburban Gas': 'suburban_gas',
-        'Verizon (Kat)': 'verizon_kat',
-        'Sprint (Justin)': 'sprint_justin',
-        'DirecTV': 'directtv_cable',
-        'Internet': 'timewarner_internet',
-        'Capital One CC': 'capone_creditcard',
-        'Amex CC': 'amex_creditcard',
-        'Discover CC': 'discover_creditcard',
-        'Daycare': 'daycare',
-        'Cash/Check': 'cashorcheck_purchases',
-    }
+    # Categories offered on the chart: the main rollups, and each account
+    balance_summary = BALANCE.summary_choices
+    balance_detail = BALANCE.detail_choices
+    income_summary = INCOME.summary_choices
+    income_detail = INCOME.detail_choices
 
     # Get filter parameters
-    data_type = request.GET.get('type', 'balance')
-    category = request.GET.get('category', 'networth')
+    data_type = 'income' if request.GET.get('type') == 'income' else 'balance'
+    category, *compare = request.GET.getlist('category') or ['networth']
     year = request.GET.get('year', '')
     show_detail = request.GET.get('detail', '') == 'on'
 
-    # Combine summary and detail based on type
-    if data_type == 'income':
-        all_categories = {**income_summary, **income_detail} if show_detail else income_summary
-        if category not in all_categories.values():
-            category = 'total_income'
-    else:
-        all_categories = {**balance_summary, **balance_detail} if show_detail else balance_summary
-        if category not in all_categories.values():
-            category = 'networth'
+    # Fall back to the type's headline total for categories not on offer
+    registry = REGISTRIES[data_type]
+    if category not in registry.summary_choices.values() and not (
+            show_detail and category in registry.fields):
+        category = 'total_income' if data_type == 'income' else 'networth'
 
-    # Get data based on type
     if data_type == 'income':
-        queryset = MonthInc.objects.all().order_by('date')
         available_years = MonthInc.objects.dates('date', 'year', order='DESC')
     else:
-        queryset = MonthBal.objects.all().order_by('date')
         available_years = MonthBal.objects.dates('date', 'year', order='DESC')
 
-    # Filter by year if specified
-    if year:
-        queryset = queryset.filter(date__year=year)
-
-    # Build chart data
-    chart_labels = []
-    chart_data = []
-
-    for record in queryset:
-        chart_labels.append(record.date.strftime('%b %Y'))
-        value = getattr(record, category)
-        if callable(value):
-            value = value()
-        chart_data.append(float(value))
-
-    # Get current category display name
-    all_possible = {**balance_summary, **balance_detail, **income_summary, **income_detail}
-    category_name = [k for k, v in all_possible.items() if v == category][
-        0] if category in all_possible.values() else category
-
-    # Calculate stats
-    if chart_data:
-        current_value = chart_data[-1]
-        highest_value = max(chart_data)
-        lowest_value = min(chart_data)
-    else:
-        current_value = 0
-        highest_value = 0
-        lowest_value = 0
+    # Series to compare with, of either type: 'balance:networth', 'income:total_income', ...
+    compare = [value for value in dict.fromkeys(compare)
+               if value in CATEGORY_LABELS and value != f'{data_type}:{category}']
+    category_name = ' vs '.join([registry.labels[category],
+                                 *(CATEGORY_LABELS[value] for value in compare)])
+
+    # The page loads the chart data from the series API once it renders; all
+    # the compared series come in the same response
+    series_params = {'type': data_type, 'category': [category, *compare]}
+    selected_year = get_int_param(year, 1, 9998)
+    if selected_year:
+        series_params.update({'from': f'{selected_year:04}-01', 'to': f'{selected_year:04}-12'})
 
     context = {
         'data_type': data_type,
@@ -440,138 +423,65 @@ def analysis(request):
         'income_summary': income_summary,
         'income_detail': income_detail,
         'available_years': available_years,
-        'chart_labels': chart_labels,
-        'chart_data': chart_data,
-        'current_value': current_value,
-        'highest_value': highest_value,
-        'lowest_value': lowest_value,
+        'compare': compare,
+        'series_params': series_params,
     }
 
     return render(request, 'finance/analysis.html', context)
 
 
-def get_quarter_data(quarter, year):
-    """Get income and balance data for a specific quarter."""
-    # Define quarter month ranges
-    quarter_months = {
-        1: (1, 2, 3),
-        2: (4, 5, 6),
-        3: (7, 8, 9),
-        4: (10, 11, 12),
-    }
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=watermark_etag(MonthBal, MonthInc))
+def reports(request):
+    available_years = list(MonthInc.objects.dates('date', 'year', order='DESC'))
 
-    months = quarter_months[quarter]
+    # Default to the most recent complete quarter
+    selected_quarter = request.GET.get('quarter')
+    if not selected_quarter and available_years:
+        selected_quarter = previous_quarter(date.today())
 
-    # Get income records for the quarter
-    incomes = MonthInc.objects.filter(
-        date__year=year,
-        date__month__in=months
-    )
+    # Current, last quarter and year ago data, fetched together
+    periods = report_periods(selected_quarter)
+    data = get_quarters_data(periods) if periods else {}
 
-    # Aggregate income data
-    totals = {
-        'income': sum(i.total_income() for i in incomes),
-        'expenses': sum(i.total_expenses() for i in incomes),
-        'savings': sum(i.total_allsavings() for i in incomes),
-        'surplus': sum(i.total_surplus() for i in incomes),
-        'taxes': sum(i.total_taxes() for i in incomes),
-        'utilities': sum(i.total_utilities() for i in incomes),
-        'housing': sum(i.total_housing() for i in incomes),
-        'credit_cards': sum(i.total_personal_creditcards() for i in incomes),
-    }
+    return render(request, 'finance/reports.html',
+                  reports_context(selected_quarter, periods, data, available_years))
 
-    # Get end-of-quarter balance
-    # For Q1-Q3, get the first month of next quarter
-    # For Q4, get January of next year
-    if quarter == 4:
-        balance_month = 1
-        balance_year = year + 1
-    else:
-        balance_month = months[-1] + 1
-        balance_year = year
-
-    balance = MonthBal.objects.filter(
-        date__year=balance_year,
-        date__month=balance_month
-    ).first()
-
-    if balance:
-        totals['networth'] = balance.networth()
-        totals['assets'] = balance.total_assets()
-        totals['liabilities'] = balance.total_liabilities()
-        totals['loan_balance'] = balance.total_loan()
-        totals['savings_balance'] = balance.total_save()
-    else:
-        totals['networth'] = None
-        totals['assets'] = None
-        totals['liabilities'] = None
-        totals['loan_balance'] = None
-        totals['savings_balance'] = None
 
-    return totals
+def previous_quarter(today):
+    """The last quarter finished by ``today``, as 'Q-YYYY'."""
+    quarter = (today.month - 1) // 3 + 1
+    return f'4-{today.year - 1}' if quarter == 1 else f'{quarter - 1}-{today.year}'
 
 
-@login_required
-def reports(request):
-    # Get available years from data
-    available_years = MonthInc.objects.dates('date', 'year', order='DESC')
+def report_periods(selected_quarter):
+    """
+    The (quarter, year) picked as 'Q-YYYY', the quarter before it and the
+    same quarter a year earlier; None if it isn't one.
+    """
+    try:
+        quarter, year = map(int, (selected_quarter or '').split('-'))
+    except ValueError:
+        return None
+    if not (1 <= quarter <= 4 and 2 <= year <= 9998):
+        return None
+    last_quarter = (4, year - 1) if quarter == 1 else (quarter - 1, year)
+    return [(quarter, year), last_quarter, (quarter, year - 1)]
 
-    # Get selected quarter and year from request
-    selected_quarter = request.GET.get('quarter')
 
-    # Default to most recent complete quarter
-    if not selected_quarter and available_years:
-        from datetime import date
-        today = date.today()
-        current_quarter = (today.month - 1) // 3 + 1
-        current_year = today.year
-
-        # Go back one quarter for "most recent complete"
-        if current_quarter == 1:
-            selected_quarter = f"4-{current_year - 1}"
-        else:
-            selected_quarter = f"{current_quarter - 1}-{current_year}"
-
-    # Parse selection
-    quarter_data = None
-    last_quarter_data = None
-    year_ago_data = None
-
-    if selected_quarter:
-        try:
-            q, y = selected_quarter.split('-')
-            quarter = int(q)
-            year = int(y)
-
-            # Current quarter data
-            quarter_data = get_quarter_data(quarter, year)
-            quarter_data['name'] = f"Q{quarter} {year}"
-
-            # Last quarter data
-            if quarter == 1:
-                last_q, last_y = 4, year - 1
-            else:
-                last_q, last_y = quarter - 1, year
-            last_quarter_data = get_quarter_data(last_q, last_y)
-            last_quarter_data['name'] = f"Q{last_q} {last_y}"
-
-            # Year ago data
-            year_ago_data = get_quarter_data(quarter, year - 1)
-            year_ago_data['name'] = f"Q{quarter} {year - 1}"
-
-        except (ValueError, TypeError):
-            pass
+def reports_context(selected_quarter, periods, data, available_years):
+    """Context of the reports page, given the get_quarters_data() of report_periods()."""
+    quarter_data = last_quarter_data = year_ago_data = None
+    if periods:
+        quarter_data, last_quarter_data, year_ago_data = (
+            {**data[(quarter, year)], 'name': f"Q{quarter} {year}"} for quarter, year in periods)
 
     # Build quarter options for dropdown
-    quarter_options = []
-    for year_date in available_years:
-        for q in [4, 3, 2, 1]:
-            quarter_options.append({
-                'value': f"{q}-{year_date.year}",
-                'label': f"Q{q} {year_date.year}"
-            })
+    quarter_options = [{'value': f"{q}-{year_date.year}", 'label': f"Q{q} {year_date.year}"}
+                       for year_date in available_years for q in [4, 3, 2, 1]]
 
-    context = {
+    return {
         'quarter_options': quarter_options,
         'selected_quarter': selected_quarter,
         'quarter_data': quarter_data,
@@ -579,176 +489,32 @@ def reports(request):
         'year_ago_data': year_ago_data,
     }
 
-    return render(request, 'finance/reports.html', context)
-
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=watermark_etag(MonthBal))
 def balance_detail(request, pk):
-    balance = get_object_or_404(MonthBal, pk=pk)
-
-    # Group fields for organized display
-    field_groups = {
-        'Checking Accounts': [
-            ('Huntington Checking', balance.huntington_check),
-            ('Fifth Third Checking', balance.fifththird_check),
-            ('Total Checking', balance.total_check()),
-        ],
-        'Savings Accounts': [
-            ('Huntington Savings', balance.huntington_save),
-            ('Fifth Third Savings', balance.fifththird_save),
-            ('Capital One Savings', balance.capone_save),
-            ('Amex Savings', balance.amex_save),
-            ('Total Savings', balance.total_save()),
-        ],
-        'Investments': [
-            ('Robinhood', balance.robinhood_invest),
-            ('Deacon', balance.deacon_invest),
-            ('Buckeye', balance.buckeye_invest),
-            ('Total Investments', balance.total_invest()),
-        ],
-        'Retirement': [
-            ('OPERS', balance.opers_retire),
-            ('457', balance.four57_retire),
-            ('401k', balance.four01_retire),
-            ('Roth', balance.roth_retire),
-            ('Total Retirement', balance.total_retire()),
-        ],
-        'Property': [
-            ('Main Home', balance.main_home),
-            ('Justin Car', balance.justin_car),
-            ('Kat Car', balance.kat_car),
-            ('Total Property', balance.total_property()),
-        ],
-        'Credit Cards': [
-            ('Capital One', balance.capone_credit),
-            ('Amex', balance.amex_credit),
-            ('Discover', balance.discover_credit),
-            ('Total Credit Cards', balance.total_credit()),
-        ],
-        'Loans': [
-            ('Car Loan', balance.car_loan),
-            ('Public Student Loan', balance.pubstudent_loan),
-            ('Private Student Loan', balance.privstudent_loan),
-            ('Mortgage', balance.main_mortgage),
-            ('Total Loans', balance.total_loan()),
-        ],
-    }
+    # The group totals come from the database with the record
+    balance = get_object_or_404(MonthBal.objects.with_totals(), pk=pk)
 
     context = {
         'balance': balance,
-        'field_groups': field_groups,
+        'field_groups': BALANCE.detail_groups(balance),
     }
 
     return render(request, 'finance/balance_detail.html', context)
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=watermark_etag(MonthInc))
 def income_detail(request, pk):
-    income = get_object_or_404(MonthInc, pk=pk)
-
-    # Group fields for organized display
-    field_groups = {
-        'Interest Income': [
-            ('Huntington Interest', income.huntington_interest),
-            ('Fifth Third Interest', income.fifththird_interest),
-            ('Capital One Interest', income.capone_interest),
-            ('Amex Interest', income.amex_interest),
-            ('Schwab Interest', income.schwab_interest),
-            ('Total Interest', income.total_interest()),
-        ],
-        'Salary & Dividends': [
-            ('Supreme Court Salary', income.supremecourt_salary),
-            ('CDM Salary', income.cdm_salary),
-            ('Schwab Dividends', income.schwab_dividends),
-            ('Total Salary', income.total_salary()),
-        ],
-        'Other Income': [
-            ('Expense Checks', income.expense_checks),
-            ('Miscellaneous', income.miscellaneous_income),
-            ('Refunds/Rebates', income.refund_rebate_repayment),
-            ('Gifts', income.gift_income),
-            ('Total Other Income', income.total_other_income()),
-        ],
-        'Retirement Contributions': [
-            ('OPERS', income.opers_retirement),
-            ('457b', income.four57b_retirement),
-            ('401k', income.four01k_retirement),
-            ('Roth', income.roth_retirement),
-            ('Total Retirement', income.total_retirement_contributions()),
-        ],
-        'Investment Contributions': [
-            ('Robinhood', income.robinhood_investments),
-            ('Schwab', income.schwab_investments),
-            ('Total Investments', income.total_investment_contributions()),
-        ],
-        'Savings Contributions': [
-            ('Amex Savings', income.amex_savings),
-            ('Fifth Third Savings', income.fifththird_savings),
-            ('Capital One Savings', income.capone_savings),
-            ('529 College', income.five29_college),
-            ('Huntington Savings', income.huntington_savings),
-            ('Total Savings', income.total_savings_contributions()),
-        ],
-        'Taxes': [
-            ('Federal Tax', income.federal_tax),
-            ('Social Security', income.social_security),
-            ('Medicare', income.medicare),
-            ('Ohio Tax', income.ohio_tax),
-            ('Columbus Tax', income.columbus_tax),
-            ('Total Taxes', income.total_taxes()),
-        ],
-        'Benefits': [
-            ('Health Insurance', income.health_insurance),
-            ('Supplemental Life', income.supplementallife_insurance),
-            ('Flex Spending', income.flex_spending),
-            ('CDM STD', income.cdm_std),
-            ('CDM Supplemental LTD', income.cdmsupplemental_ltd),
-            ('Parking', income.parking),
-            ('Parking Admin', income.parking_admin),
-            ('Total Benefits', income.total_benefits()),
-        ],
-        'Housing': [
-            ('Mortgage', income.main_mortgage),
-            ('HOA Fees', income.hoa_fees),
-            ('Total Housing', income.total_housing()),
-        ],
-        'Utilities': [
-            ('AEP Electric', income.aep_electric),
-            ('Rumpke Trash', income.rumpke_trash),
-            ('Delaware Sewer', income.delaware_sewer),
-            ('Delco Water', income.delco_water),
-            ('Suburban Gas', income.suburban_gas),
-            ('Verizon (Kat)', income.verizon_kat),
-            ('Sprint (Justin)', income.sprint_justin),
-            ('DirecTV', income.directtv_cable),
-            ('Internet', income.timewarner_internet),
-            ('Total Utilities', income.total_utilities()),
-        ],
-        'Loan Payments': [
-            ('Auto Loan', income.caponeauto_loan),
-            ('Public Student Loan', income.public_loan),
-            ('Private Student Loan', income.private_loan),
-            ('Total Loans', income.total_loans()),
-        ],
-        'Credit Card Payments': [
-            ('Capital One', income.capone_creditcard),
-            ('Amex', income.amex_creditcard),
-            ('Discover', income.discover_creditcard),
-            ('Kohls/VS/Macy/EB', income.kohls_vicsec_macy_eddiebauer_creditcards),
-            ('Kat Work Card', income.katwork_creditcard),
-            ('Total Credit Cards', income.total_personal_creditcards()),
-        ],
-        'Other Expenses': [
-            ('Auto Insurance', income.auto_insurance),
-            ('Cash/Check Purchases', income.cashorcheck_purchases),
-            ('Daycare', income.daycare),
-            ('Tax Deductible Giving', income.taxdeductible_giving),
-        ],
-    }
+    # The group totals come from the database with the record
+    income = get_object_or_404(MonthInc.objects.with_totals(), pk=pk)
 
     context = {
         'income': income,
-        'field_groups': field_groups,
+        'field_groups': INCOME.detail_groups(income),
     }
 
     return render(request, 'finance/income_detail.html', context)
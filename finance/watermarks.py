@@ -0,0 +1,80 @@
+"""
+Per-model "last changed" watermarks for conditional GETs. The signals in
+finance.signals touch a model's watermark whenever its records are saved or
+deleted; read views pass watermark_etag(...) to the ``condition`` decorator,
+so a browser revalidating an unchanged page gets a 304 after one query.
+"""
+import hashlib
+from datetime import date
+from functools import wraps
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from .models import Watermark, upsert
+
+# Files whose changes alter the rendered pages, so a deploy changes the ETags
+CODE_PATTERNS = (('templates', '*.html'), ('finance', '*.py'), ('finance', '*.html'))
+_code_version = None
+
+
+def touch_watermarks(*models):
+    """Record that the data of ``models`` changed now."""
+    now = timezone.now()
+    upsert(Watermark,
+           [Watermark(model=model._meta.label_lower, changed_at=now) for model in models],
+           unique_fields=['model'], update_fields=['changed_at'])
+
+
+def get_watermarks(*models):
+    """{model label: when it last changed}, without the models never changed."""
+    labels = [model._meta.label_lower for model in models]
+    return dict(Watermark.objects.filter(model__in=labels).values_list('model', 'changed_at'))
+
+
+def code_version():
+    """Newest modification time of the templates and app code, read once per process."""
+    global _code_version
+    if _code_version is None:
+        base = Path(settings.BASE_DIR)
+        _code_version = max((path.stat().st_mtime_ns for directory, pattern in CODE_PATTERNS
+                             for path in (base / directory).rglob(pattern)), default=0)
+    return _code_version
+
+
+def watermark_etag(*models):
+    """
+    ETag function for a view whose page depends only on the data of
+    ``models``, the query string and the user. Pages showing a flash message
+    get no ETag, so the message is never hidden behind a 304. The date is
+    part of it for views defaulting to the current period.
+    """
+    def etag(request, *args, **kwargs):
+        user_id = request.user.pk
+        if len(get_messages(request)):
+            return None
+        marks = get_watermarks(*models)
+        key = repr((code_version(), date.today(), user_id, request.get_full_path(),
+                    sorted((label, changed.isoformat()) for label, changed in marks.items())))
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+    return etag
+
+
+def async_condition(etag_func):
+    """
+    ``condition(etag_func=...)`` for async views. Django's decorator calls
+    ``etag_func`` directly, so here it runs in a thread first instead. That
+    also loads the user and session the (synchronous) templates read.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag = await sync_to_async(etag_func)(request, *args, **kwargs)
+            conditional = condition(etag_func=lambda *args, **kwargs: etag)(view)
+            return await conditional(request, *args, **kwargs)
+        return inner
+    return decorator
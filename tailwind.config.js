@@ -0,0 +1,22 @@
+/** Only the classes used in these files end up in static/css/site.css */
+module.exports = {
+  content: [
+    './templates/**/*.html',
+    // Input classes set in Python, e.g. finance.forms.INPUT_CLASSES
+    './finance/**/*.py',
+    './config/**/*.py',
+  ],
+  theme: {
+    extend: {
+      colors: {
+        brand: {
+          50: '#f0f9ff',
+          100: '#e0f2fe',
+          600: '#0284c7',
+          700: '#0369a1',
+          800: '#075985',
+        },
+      },
+    },
+  },
+};